@@ -0,0 +1,91 @@
+################################################################################
+# Copyright (C) 2019 Advanced Micro Devices, Inc. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell cop-
+# ies of the Software, and to permit persons to whom the Software is furnished
+# to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IM-
+# PLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNE-
+# CTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+################################################################################
+
+from .Common import globalParameters, printWarning
+
+import csv
+import itertools
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+def available():
+    return numpy is not None
+
+def readBlocks(dataFile, fileName, numColumns, blockRows=None):
+    """
+    Reads the rows following the header of the benchmark CSV dataFile in
+    blocks of up to blockRows rows, yielding each block as a float64 array
+    [rows, numColumns] of the first numColumns columns.
+
+    Like the row-by-row readers, a row with fewer than numColumns columns
+    ends the data, with a warning.  Requires NumPy.
+    """
+    if blockRows is None:
+        blockRows = globalParameters["CSVBlockRows"]
+
+    rowIdx = 1
+    next(dataFile, None) # header
+    while True:
+        lines = list(itertools.islice(dataFile, blockRows))
+        if len(lines) == 0:
+            return
+        try:
+            block = numpy.loadtxt(lines, delimiter=",", usecols=range(0, numColumns), \
+                    dtype=numpy.float64, ndmin=2)
+        except ValueError:
+            block = None
+
+        if block is not None and len(block) == len(lines):
+            rowIdx += len(lines)
+            yield block
+            continue
+
+        # a short (or blank) row: parse the block one row at a time up to it
+        rows = []
+        for row in csv.reader(lines):
+            rowIdx += 1
+            if len(row) < numColumns:
+                printWarning("CSV File %s row %u doesn't have %u elements; ignoring remainer of file." \
+                        % (fileName, rowIdx, numColumns))
+                break
+            rows.append([float(value) for value in row[:numColumns]])
+        if len(rows) > 0:
+            yield numpy.array(rows, dtype=numpy.float64).reshape(len(rows), numColumns)
+        return
+
+def readColumns(dataFile, fileName, firstColumn, numColumns):
+    """
+    Reads columns [firstColumn, numColumns) of all rows following the header
+    of dataFile into a Fortran-ordered float64 array [rows, columns], so
+    that each column is contiguous.  Requires NumPy.
+    """
+    blocks = [numpy.array(block[:, firstColumn:numColumns]) \
+            for block in readBlocks(dataFile, fileName, numColumns)]
+    columns = numpy.empty((sum([len(block) for block in blocks]), numColumns - firstColumn), order="F")
+    rowIdx = 0
+    while len(blocks) > 0:
+        block = blocks.pop(0)
+        columns[rowIdx:rowIdx+len(block)] = block
+        rowIdx += len(block)
+    return columns
@@ -0,0 +1,214 @@
+################################################################################
+# Copyright (C) 2019 Advanced Micro Devices, Inc. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell cop-
+# ies of the Software, and to permit persons to whom the Software is furnished
+# to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IM-
+# PLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNE-
+# CTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+################################################################################
+
+"""
+Checkpoints of benchmark steps, so that a benchmark which was interrupted
+resumes where it stopped rather than at the start of the step.
+
+Each step keeps Data/<step>.checkpoint.yaml.  Its key identifies the step
+and everything before it: the benchmark parameters of the step, its
+problem sizes and the key and winners of the previous step.  A checkpoint
+whose key doesn't match is ignored.  Once the benchmark files of the step
+are written, its stage is Written and it holds the names of the enumerated
+solutions and of the solutions the files were written for; once its results
+are read, its stage is Done and it holds the winners of the step.
+
+The benchmark client flushes each result to the CSV file as it is
+measured.  A Written step resumes at the first (problem, solution) cell of
+the CSV without a result, which scanResults finds, passing
+--problem-start-idx and --resume-solution-idx to the client.
+"""
+
+from .Common import print1, printWarning
+from . import Utils
+from . import YAMLIO
+
+import os
+import subprocess
+
+Version = 1
+
+Written = "Written"
+Done = "Done"
+
+def checkpointFileName(resultsFileBase):
+    return resultsFileBase + ".checkpoint.yaml"
+
+def stepKey(previousKey, previousWinners, stepName, benchmarkStep):
+    return Utils.fingerprint(Version, previousKey, previousWinners, stepName, \
+            benchmarkStep.hardcodedParameters, benchmarkStep.benchmarkParameters, \
+            benchmarkStep.initialSolutionParameters, benchmarkStep.problemSizes.sizes)
+
+def solutionsKey(solutions):
+    return Utils.fingerprint([str(solution) for solution in solutions])
+
+class StepCheckpoint:
+    def __init__(self, fileName, key, state=None):
+        self.fileName = fileName
+        self.key = key
+        self.state = state if state is not None else {}
+
+    @property
+    def stage(self):
+        return self.state.get("Stage")
+
+    @classmethod
+    def read(cls, fileName, key):
+        """
+        The checkpoint in fileName, or an empty one if it doesn't exist, can't
+        be read or is of a different step.
+        """
+        try:
+            with open(fileName, "r") as f:
+                state = YAMLIO.load(f)
+        except (IOError, OSError):
+            return cls(fileName, key)
+        except Exception as e:
+            printWarning("Ignoring unreadable benchmark checkpoint %s: %s" % (fileName, e))
+            return cls(fileName, key)
+
+        if not isinstance(state, dict) or state.get("Version") != Version or state.get("Key") != key:
+            return cls(fileName, key)
+        return cls(fileName, key, state)
+
+    def write(self, **state):
+        """
+        Updates the checkpoint with state and writes it.
+        """
+        self.state.update(Utils.state(state))
+        self.state["Version"] = Version
+        self.state["Key"] = self.key
+        tmpFileName = self.fileName + ".tmp"
+        try:
+            YAMLIO.write(tmpFileName, self.state)
+            os.replace(tmpFileName, self.fileName)
+        except (IOError, OSError) as e:
+            printWarning("Could not write benchmark checkpoint %s: %s" % (self.fileName, e))
+
+    def writtenSolutions(self, solutions):
+        """
+        The solutions the benchmark files of the step were written for if they
+        were written for these enumerated solutions, otherwise None.
+        """
+        if self.stage not in [Written, Done] or self.state.get("Enumerated") != solutionsKey(solutions):
+            return None
+        written = set(self.state["Solutions"])
+        return [solution for solution in solutions if str(solution) in written]
+
+def resultsPrefixColumns(problemType):
+    """
+    Number of columns of a benchmark CSV row before the results of its
+    solutions, as the client writes them: the problem index, sizes, leading
+    dimensions and flops.
+    """
+    return problemType["TotalIndices"] + problemType["NumIndicesLD"] + 2
+
+def scanResults(resultsFileName, prefixColumns, numSolutions):
+    """
+    (problemIdx, solutionIdx, offset) of the first cell of resultsFileName
+    without a result, offset being the size in bytes of the results before
+    it; None if the file doesn't exist or has no complete header.  Doesn't
+    change the file.
+
+    The last cell of a row without a newline may have been cut off, so it
+    is benchmarked again.
+    """
+    try:
+        with open(resultsFileName, "rb") as f:
+            data = f.read()
+    except (IOError, OSError):
+        return None
+
+    rowLength = prefixColumns + numSolutions
+    # lines keep any "\r" of the client's line ends, so offsets are exact
+    lines = data.split(b"\n")
+    # the header of non-GEMM results has the GEMM columns as well
+    if len(lines) < 2 or len(lines[0].split(b",")) < rowLength:
+        return None
+
+    offset = len(lines[0]) + 1
+    problemIdx = 0
+    solutionIdx = 0
+    for (lineIdx, line) in enumerate(lines[1:]):
+        cells = line.split(b",")
+        complete = lineIdx < len(lines) - 2
+        try:
+            isProblem = int(cells[0]) == problemIdx
+        except ValueError:
+            isProblem = False
+        if complete and len(cells) == rowLength and isProblem:
+            offset += len(line) + 1
+            problemIdx += 1
+            continue
+        if not complete and isProblem and len(cells) > prefixColumns + 1:
+            solutionIdx = min(len(cells) - 1, rowLength) - prefixColumns
+            offset += len(b",".join(cells[:prefixColumns + solutionIdx]))
+        break
+    return (problemIdx, solutionIdx, offset)
+
+def resultsComplete(resultsFileName, prefixColumns, numSolutions, numProblems):
+    """Whether resultsFileName has a complete row for each of numProblems."""
+    scan = scanResults(resultsFileName, prefixColumns, numSolutions)
+    return scan is not None and scan[0] >= numProblems
+
+def resumeResults(resultsFileName, prefixColumns, numSolutions):
+    """
+    (problemIdx, solutionIdx) where the benchmark writing resultsFileName
+    resumes, truncating the file to the results before it; None if it
+    starts over.
+    """
+    scan = scanResults(resultsFileName, prefixColumns, numSolutions)
+    if scan is None:
+        return None
+    (problemIdx, solutionIdx, offset) = scan
+    if offset < os.path.getsize(resultsFileName):
+        with open(resultsFileName, "r+b") as f:
+            f.truncate(offset)
+    return (problemIdx, solutionIdx)
+
+def runBenchmarkClient(command, cwd, resultsFileName, numProblems, prefixColumns, numSolutions, resume, \
+        numBenchmarks=1):
+    """
+    Runs the benchmark script or client command, returning its exit code.
+    With resume, the problems and the solutions of a row which
+    resultsFileName already holds results for are skipped.  A benchmark of
+    more than one pass (numBenchmarks) can't be resumed and starts over
+    unless it finished.
+    """
+    args = []
+    if resume:
+        resumePoint = resumeResults(resultsFileName, prefixColumns, numSolutions)
+        if resumePoint is not None:
+            (problemIdx, solutionIdx) = resumePoint
+            if problemIdx >= numProblems:
+                print1("# Already benchmarked; skipping.")
+                return 0
+            if numBenchmarks > 1:
+                # each pass rewrites the results, so they are of the last pass
+                # only when it finished
+                printWarning("Can't resume a benchmark of %u passes; starting it over" % numBenchmarks)
+            elif problemIdx > 0 or solutionIdx > 0:
+                print1("# Resuming benchmark at problem %u / %u, solution %u / %u" \
+                        % (problemIdx, numProblems, solutionIdx, numSolutions))
+                args = ["--problem-start-idx", str(problemIdx), "--resume-solution-idx", str(solutionIdx)]
+    process = subprocess.Popen([command] + args, cwd=cwd)
+    process.communicate()
+    return process.returncode
@@ -24,22 +24,23 @@ import filecmp
 import itertools
 import os
 import shutil
-import subprocess
 import sys
 import time
 
 from copy import deepcopy
 
+from . import BenchmarkCheckpoint
+from . import BenchmarkCSV
 from . import ClientExecutable
 from . import SolutionLibrary
 from . import YAMLIO
-from . import Utils
 from .BenchmarkStructs import BenchmarkProcess
 from .ClientWriter import writeRunScript, writeClientParameters, writeClientConfig
-from .Common import globalParameters, HR, pushWorkingPath, popWorkingPath, print1, print2, printExit, printWarning, ensurePath, startTime, ProgressBar
+from .Common import globalParameters, HR, pushWorkingPath, popWorkingPath, print1, print2, printExit, printWarning, ensurePath, startTime, ProgressBar, CPUThreadCount, ParallelMap
 from .KernelWriterAssembly import KernelWriterAssembly
 from .KernelWriterSource import KernelWriterSource
-from .SolutionStructs import Solution, ProblemType
+from .SolutionPrecheck import SolutionPrecheck
+from .SolutionStructs import Solution, ProblemType, SolutionSet
 from .SolutionWriter import SolutionWriter
 from .TensileCreateLibrary import writeSolutionsAndKernels, writeCMake
 
@@ -69,6 +70,9 @@ def benchmarkProblemType( problemTypeConfig, problemSizeGroupConfig, \
   totalBenchmarkSteps = len(benchmarkProcess)
   resultsFileBaseFinal = None
   winners = WinningParameterDict()
+  checkpoints = globalParameters["BenchmarkCheckpoints"] \
+      and not globalParameters["ForceRedoBenchmarkProblems"]
+  stepKey = None
   print1("# NumBenchmarkSteps: %u" % totalBenchmarkSteps)
   print1("")
   print1(HR)
@@ -81,6 +85,24 @@ def benchmarkProblemType( problemTypeConfig, problemSizeGroupConfig, \
   for benchmarkStepIdx in range(0, totalBenchmarkSteps):
 
     benchmarkStep = benchmarkProcess[benchmarkStepIdx]
+
+    # a step whose checkpoint holds its winners isn't repeated
+    checkpoint = None
+    stepKey = BenchmarkCheckpoint.stepKey(stepKey, winners.state(), \
+        str(benchmarkStep), benchmarkStep)
+    if checkpoints:
+      checkpointFileBase = os.path.join(globalParameters["WorkingPath"], "Data", \
+          benchmarkStep.abbreviation())
+      checkpoint = BenchmarkCheckpoint.StepCheckpoint.read( \
+          BenchmarkCheckpoint.checkpointFileName(checkpointFileBase), stepKey)
+      if checkpoint.stage == BenchmarkCheckpoint.Done:
+        print1("# BenchmarkStep: %s - %s already benchmarked; restoring winners from checkpoint" \
+            % (problemSizeGroupName, str(benchmarkStep)))
+        winners = WinningParameterDict.FromState(checkpoint.state["Winners"])
+        if benchmarkStep.isFinal():
+          resultsFileBaseFinal = os.path.normpath(checkpointFileBase)
+        continue
+
     if winners.winners == {}:
       # perf optimization to skip the initial winners creation
       # this helps a little here but really helps below with avoiding the super-expensive
@@ -195,39 +217,19 @@ def benchmarkProblemType( problemTypeConfig, problemSizeGroupConfig, \
     # Enumerate Solutions = Hardcoded * Benchmark
     ############################################################################
     print1("# Enumerating Solutions")
-    if globalParameters["PrintLevel"] >= 1:
-      progressBar = ProgressBar(maxPossibleSolutions)
-    solutionSet = set() # avoid duplicates for nlca=-1, 1
-    for hardcodedIdx in range(0, numHardcoded):
-      solutions.append([])
-      hardcodedParamDict = benchmarkStep.hardcodedParameters[hardcodedIdx]
-      for benchmarkIdx, benchmarkPermutation in enumerate(benchmarkPermutations):
-        solution = {"ProblemType": deepcopy(benchmarkProcess.problemType.state)}
-        solution.update(benchmarkPermutation)
-        solution.update(hardcodedParamDict)
-        if benchmarkStepIdx > 0:
-          winningParameters = winners[hardcodedParamDict]
-          if winningParameters == None:
-            # this is a joined parameter that didn't have a winner, that's okay
-            continue
-          solution.update(winningParameters)
-
-        # append default parameters where necessary
-        for initialSolutionParameterName in benchmarkStep.initialSolutionParameters:
-          if initialSolutionParameterName not in solution:
-            solution[initialSolutionParameterName] = \
-                benchmarkStep.initialSolutionParameters[initialSolutionParameterName]
-        # TODO check if solution matches problem size for exact tile kernels
-        solutionObject = Solution(solution)
-        if solutionObject["Valid"]:
-          if solutionObject not in solutionSet:
-            solutionSet.add(solutionObject)
-            solutions[hardcodedIdx].append(solutionObject)
-        else:
-          if globalParameters["PrintSolutionRejectionReason"]:
-            print1("rejecting solution %s" % str(solutionObject))
-        if globalParameters["PrintLevel"] >= 1:
-          progressBar.increment()
+    winningParameters = []
+    for hardcodedParamDict in benchmarkStep.hardcodedParameters:
+      if benchmarkStepIdx > 0:
+        # the first lookup of a joined parameter may assign the derived
+        # parameters of its winner, which later lookups see
+        first = winners[hardcodedParamDict]
+        winningParameters.append([first, winners[hardcodedParamDict] \
+            if len(benchmarkPermutations) > 1 else first])
+      else:
+        winningParameters.append([{}, {}])
+    solutions = enumerateSolutions(benchmarkProcess.problemType.state, \
+        benchmarkStep.hardcodedParameters, winningParameters, benchmarkPermutations, \
+        benchmarkStep.initialSolutionParameters)
 
     # remove hardcoded that don't have any valid benchmarks
     removeHardcoded = []
@@ -251,7 +253,7 @@ def benchmarkProblemType( problemTypeConfig, problemSizeGroupConfig, \
     elif winners.winners=={}:
       print1("# Populating initial winners (%u solutions)\n" % len(benchmarkStep.hardcodedParameters))
       for hcParm in benchmarkStep.hardcodedParameters:
-        winners.winners[FrozenDictionary(hcParm)] = [{},-1]
+        winners.addHardcoded(hcParm)
 
     print1("# Actual Solutions: %u / %u\n" % ( len(solutions), \
         maxPossibleSolutions ))
@@ -274,9 +276,21 @@ def benchmarkProblemType( problemTypeConfig, problemSizeGroupConfig, \
               Solution.getNameFull(solution) ))
       print2(HR)
 
-    # write benchmarkFiles
-    writeBenchmarkFiles(stepBaseDir, solutionList, benchmarkStep.problemSizes, \
-        shortName, filesToCopy, benchmarkProcess.solutionSummationSizes)
+    # write benchmarkFiles, unless an interrupted run wrote them for the
+    # same solutions
+    writtenSolutions = None
+    if checkpoint is not None:
+      writtenSolutions = checkpoint.writtenSolutions(solutionList)
+    if writtenSolutions is not None:
+      print1("# Benchmark files already written; resuming from checkpoint")
+      solutionList[:] = writtenSolutions
+    else:
+      enumeratedKey = BenchmarkCheckpoint.solutionsKey(solutionList)
+      writeBenchmarkFiles(stepBaseDir, solutionList, benchmarkStep.problemSizes, \
+          shortName, filesToCopy, benchmarkProcess.solutionSummationSizes)
+      if checkpoint is not None:
+        checkpoint.write(Stage=BenchmarkCheckpoint.Written, Enumerated=enumeratedKey, \
+            Solutions=[str(solution) for solution in solutionList])
 
     removeSolutions = []
     for i in range(0, len(solutions)):
@@ -337,7 +351,10 @@ def benchmarkProblemType( problemTypeConfig, problemSizeGroupConfig, \
     resultsFileName = resultsFileBase + ".csv"
     newResultsFileName = resultsFileBase + "-new.csv"
     solutionsFileName = resultsFileBase + ".yaml"
-    if not os.path.exists(resultsFileName) or \
+    numProblems = benchmarkStep.problemSizes.totalProblemSizes
+    prefixColumns = BenchmarkCheckpoint.resultsPrefixColumns(solutionList[0]["ProblemType"])
+    resume = writtenSolutions is not None
+    if not os.path.exists(resultsFileName) or resume or \
         globalParameters["ForceRedoBenchmarkProblems"]:
       pushWorkingPath("build")
 
@@ -348,11 +365,12 @@ def benchmarkProblemType( problemTypeConfig, problemSizeGroupConfig, \
       runScriptName = writeRunScript(path, libraryLogicPath, forBenchmark, enableTileSelection)
 
       # run runScript
-      process = subprocess.Popen(runScriptName, cwd=globalParameters["WorkingPath"])
-      process.communicate()
-      if process.returncode:
+      returncode = BenchmarkCheckpoint.runBenchmarkClient(runScriptName, \
+          globalParameters["WorkingPath"], resultsFileName, numProblems, prefixColumns, \
+          len(solutionList), resume, globalParameters["NumBenchmarks"])
+      if returncode:
         benchmarkTestFails += 1
-        printWarning("BenchmarkProblems: Benchmark Process exited with code %u" % process.returncode)
+        printWarning("BenchmarkProblems: Benchmark Process exited with code %u" % returncode)
       popWorkingPath() # build
     else:
       print1("# Already benchmarked; skipping.")
@@ -372,6 +390,11 @@ def benchmarkProblemType( problemTypeConfig, problemSizeGroupConfig, \
     YAMLIO.writeSolutions(solutionsFileName, benchmarkStep.problemSizes, \
         solutions )
 
+    # an interrupted benchmark resumes this step at its first missing result
+    if checkpoint is not None and BenchmarkCheckpoint.resultsComplete(resultsFileName, \
+        prefixColumns, len(solutionList), numProblems):
+      checkpoint.write(Stage=BenchmarkCheckpoint.Done, Winners=winners.state())
+
     # End Iteration
     popWorkingPath() # stepName
     currentTime = time.time()
@@ -411,6 +434,9 @@ def compareResults(old, new, name):
 # Read GFlop/s from file
 ################################################################################
 def getResults(resultsFileName, solutions, enableTileSelection, newResultsFileName=None):
+  if newResultsFileName is None and BenchmarkCSV.available():
+    return getResultColumns(resultsFileName, solutions, enableTileSelection)
+
   try:
     resultsFile = open(resultsFileName, "r")
   except IOError:
@@ -478,6 +504,45 @@ def getResults(resultsFileName, solutions, enableTileSelection, newResultsFileNa
   return results
 
 
+################################################################################
+# Get Result Columns
+# getResults, reading the CSV in blocks of typed columns; results[i][j] is a
+# NumPy array of the gflops of solutions[i][j] for each problem
+################################################################################
+def getResultColumns(resultsFileName, solutions, enableTileSelection):
+  try:
+    resultsFile = open(resultsFileName, "r")
+  except IOError:
+    printExit("Can't open \"%s\" to get results" % resultsFileName )
+
+  numSolutions = 0
+  for solutionsForHardcoded in solutions:
+    for solution in solutionsForHardcoded:
+      # GEMM csv files contain "LDD" "LDC" "LDA" "LDB" columns
+      if solution["ProblemType"]["OperationType"] == "GEMM":
+        problemSizeIdx = solution["ProblemType"]["TotalIndices"] + 5
+      else:
+        problemSizeIdx = solution["ProblemType"]["TotalIndices"] + 1
+      numSolutions += 1
+  startIdx = problemSizeIdx + 1
+  rowLength = startIdx + numSolutions
+
+  with resultsFile:
+    gflops = BenchmarkCSV.readColumns(resultsFile, resultsFileName, startIdx, rowLength)
+  if len(gflops) == 0 and not enableTileSelection:
+    printExit("CSV File %s only has %u row(s); prior benchmark must not have run long enough to produce data." \
+        % (resultsFileName, 1) )
+
+  results = []
+  idx = 0
+  for solutionsForHardcoded in solutions:
+    results.append([])
+    for solution in solutionsForHardcoded:
+      results[-1].append(gflops[:, idx])
+      idx += 1
+  return results
+
+
 ################################################################################
 # Write Benchmark Files
 ################################################################################
@@ -489,17 +554,13 @@ def writeBenchmarkFiles(stepBaseDir, solutions, problemSizes, stepName, filesToC
   ##############################################################################
   # Min Naming
   ##############################################################################
-  kernels = []
-  kernelsBetaOnly = []
+  kernels = SolutionSet()
+  kernelsBetaOnly = SolutionSet()
   for solution in solutions:
-    solutionKernels = solution.getKernels()
-    for kernel in solutionKernels:
-      if kernel not in kernels:
-        kernels.append(kernel)
-    solutionKernelsBetaOnly = solution.getKernelsBetaOnly()
-    for kernel in solutionKernelsBetaOnly:
-      if kernel not in kernelsBetaOnly:
-        kernelsBetaOnly.append(kernel)
+    kernels.update(solution.getKernels())
+    kernelsBetaOnly.update(solution.getKernelsBetaOnly())
+  kernels = list(kernels)
+  kernelsBetaOnly = list(kernelsBetaOnly)
 
   solutionSerialNaming = Solution.getSerialNaming(solutions)
   kernelSerialNaming = Solution.getSerialNaming(kernels)
@@ -523,7 +584,7 @@ def writeBenchmarkFiles(stepBaseDir, solutions, problemSizes, stepName, filesToC
   newLibraryFile = os.path.join(newLibraryDir, "TensileLibrary.yaml")
   newLibrary = SolutionLibrary.MasterSolutionLibrary.BenchmarkingLibrary(solutions)
   newLibrary.applyNaming(kernelMinNaming)
-  YAMLIO.write(newLibraryFile, Utils.state(newLibrary))
+  YAMLIO.writeState(newLibraryFile, newLibrary, globalParameters["LibraryFormat"])
 
   codeObjectFiles = [os.path.relpath(f, globalParameters["WorkingPath"]) for f in codeObjectFiles]
 
@@ -544,6 +605,96 @@ def writeBenchmarkFiles(stepBaseDir, solutions, problemSizes, stepName, filesToC
       filesToCopy, stepBaseDir, solutionSummationSizes, solutionWriter)
 
 
+################################################################################
+# Enumerate Solutions
+# the valid, distinct solutions of each hardcoded parameter set and benchmark
+# permutation of a step, in order, as a list of lists of solutions per
+# hardcoded parameter set.  winningParameters[hardcodedIdx] holds the winning
+# parameters of its first benchmark permutation and of the others; None for
+# joined parameters without a winner, which get no solutions.
+#
+# Validating a solution is expensive, so the candidates are split into shards
+# validated in CpuThreads processes, which return only their valid solutions
+# and drop duplicates within the shard; duplicates across shards are dropped
+# here, in the same order as serially.
+################################################################################
+def enumerateSolutions(problemTypeState, hardcodedParameters, winningParameters, \
+    benchmarkPermutations, initialSolutionParameters):
+  numPermutations = len(benchmarkPermutations)
+  numCandidates = len(hardcodedParameters) * numPermutations
+  enable = globalParameters["ParallelSolutionEnumeration"] \
+      and not globalParameters["PrintSolutionRejectionReason"]
+  threadCount = CPUThreadCount(enable)
+  numShards = min(numCandidates, 8*max(threadCount, 8))
+
+  shards = []
+  for shardIdx in range(0, numShards):
+    first = numCandidates * shardIdx // numShards
+    last = numCandidates * (shardIdx+1) // numShards
+    candidates = [divmod(c, numPermutations) for c in range(first, last)]
+    usedHardcoded = sorted(set([h for (h, b) in candidates]))
+    usedPermutations = sorted(set([b for (h, b) in candidates]))
+    shards.append((problemTypeState, \
+        dict([(h, (hardcodedParameters[h], winningParameters[h])) for h in usedHardcoded]), \
+        dict([(b, benchmarkPermutations[b]) for b in usedPermutations]), \
+        initialSolutionParameters, candidates))
+
+  solutions = [[] for hardcodedIdx in range(0, len(hardcodedParameters))]
+  solutionSet = set() # avoid duplicates for nlca=-1, 1
+  precheck = None
+  for (shardSolutions, shardPrecheck) in ParallelMap(enumerateShard, shards, "Enumerating solutions", \
+      enable=enable, method=lambda x: x.starmap):
+    for (hardcodedIdx, solutionObject) in shardSolutions:
+      if solutionObject not in solutionSet:
+        solutionSet.add(solutionObject)
+        solutions[hardcodedIdx].append(solutionObject)
+    if shardPrecheck is not None:
+      if precheck is None:
+        precheck = shardPrecheck
+      else:
+        precheck.merge(shardPrecheck)
+  if precheck is not None:
+    precheck.printStats()
+  return solutions
+
+def enumerateShard(problemTypeState, hardcodedParameters, benchmarkPermutations, \
+    initialSolutionParameters, candidates):
+  shardSolutions = []
+  shardSet = set()
+  # rejection reasons are only printed for solutions which are built
+  precheck = SolutionPrecheck(problemTypeState) if globalParameters["SolutionPrecheck"] \
+      and not globalParameters["PrintSolutionRejectionReason"] else None
+  for (hardcodedIdx, benchmarkIdx) in candidates:
+    (hardcodedParamDict, winningParameters) = hardcodedParameters[hardcodedIdx]
+    winningParameters = winningParameters[0 if benchmarkIdx == 0 else 1]
+    if winningParameters == None:
+      # this is a joined parameter that didn't have a winner, that's okay
+      continue
+    # Solution copies its config, so the problem type isn't copied here
+    solution = {"ProblemType": problemTypeState}
+    solution.update(benchmarkPermutations[benchmarkIdx])
+    solution.update(hardcodedParamDict)
+    solution.update(winningParameters)
+
+    # append default parameters where necessary
+    for initialSolutionParameterName in initialSolutionParameters:
+      if initialSolutionParameterName not in solution:
+        solution[initialSolutionParameterName] = \
+            initialSolutionParameters[initialSolutionParameterName]
+    if precheck is not None and precheck.check(solution) is not None:
+      continue
+    # TODO check if solution matches problem size for exact tile kernels
+    solutionObject = Solution(solution)
+    if solutionObject["Valid"]:
+      if solutionObject not in shardSet:
+        shardSet.add(solutionObject)
+        shardSolutions.append((hardcodedIdx, solutionObject))
+    else:
+      if globalParameters["PrintSolutionRejectionReason"]:
+        print1("rejecting solution %s" % str(solutionObject))
+  return (shardSolutions, precheck)
+
+
 ################################################################################
 # FrozenDictionary
 ################################################################################
@@ -570,6 +721,154 @@ class FrozenDictionary:
     return self.__str__();
 
 
+################################################################################
+# Index of Hardcoded Parameters
+# Inverted index of the hardcoded parameters of a winners dict, from each
+# parameter name and value to the winners holding it, so that the winners a
+# lookup matches are found without comparing it against every winner.  The
+# index gives a superset of the matches (values which can't be hashed are
+# indexed as matching anything), which are then checked as get does.
+################################################################################
+class HardcodedParameterIndex:
+  Unhashable = object()
+
+  @staticmethod
+  def hashableValue(value):
+    if isinstance(value, (list, tuple)):
+      values = tuple([HardcodedParameterIndex.hashableValue(v) for v in value])
+      return HardcodedParameterIndex.Unhashable \
+          if HardcodedParameterIndex.Unhashable in values else values
+    if isinstance(value, dict):
+      try:
+        items = tuple(sorted([(k, HardcodedParameterIndex.hashableValue(v)) for (k, v) in value.items()]))
+      except TypeError:
+        return HardcodedParameterIndex.Unhashable
+      return HardcodedParameterIndex.Unhashable \
+          if HardcodedParameterIndex.Unhashable in [v for (k, v) in items] else items
+    try:
+      hash(value)
+    except TypeError:
+      return HardcodedParameterIndex.Unhashable
+    return value
+
+  def __init__(self, winners):
+    self.winners = winners
+    self.frozens = []     # winner id -> FrozenDictionary, in winners order
+    self.ids = {}         # id(FrozenDictionary) -> winner id
+    self.postings = {}    # (paramName, hashable value) -> winner ids
+    self.withParam = {}   # paramName -> winner ids holding it
+    self.unhashable = {}  # paramName -> winner ids whose value isn't hashable
+    self.postedKeys = []  # winner id -> keys of postings holding it
+    self.macroTiles = {}  # winner id -> MacroTile0/1 of its parameters and winning parameters
+    for hardcodedFrozen in winners:
+      self.add(hardcodedFrozen)
+
+  def add(self, hardcodedFrozen):
+    winnerId = len(self.frozens)
+    self.frozens.append(hardcodedFrozen)
+    self.ids[id(hardcodedFrozen)] = winnerId
+    self.postedKeys.append([])
+    self.post(winnerId)
+
+  def post(self, winnerId):
+    for (paramName, valueKey) in self.postedKeys[winnerId]:
+      self.withParam[paramName].discard(winnerId)
+      self.unhashable[paramName].discard(winnerId)
+      if valueKey is not HardcodedParameterIndex.Unhashable:
+        self.postings[(paramName, valueKey)].discard(winnerId)
+    postedKeys = []
+    for (paramName, value) in self.frozens[winnerId].parameters.items():
+      valueKey = HardcodedParameterIndex.hashableValue(value)
+      self.withParam.setdefault(paramName, set()).add(winnerId)
+      self.unhashable.setdefault(paramName, set())
+      if valueKey is HardcodedParameterIndex.Unhashable:
+        self.unhashable[paramName].add(winnerId)
+      else:
+        self.postings.setdefault((paramName, valueKey), set()).add(winnerId)
+      postedKeys.append((paramName, valueKey))
+    self.postedKeys[winnerId] = postedKeys
+
+  def isCurrent(self, winners):
+    return winners is self.winners and len(winners) == len(self.frozens)
+
+  ##########################################################
+  # Winners whose hardcoded parameters don't differ from the lookup
+  def candidates(self, lookupHardcodedParameters):
+    numWinners = len(self.frozens)
+    allowed = []
+    for (paramName, value) in lookupHardcodedParameters.items():
+      withParam = self.withParam.get(paramName)
+      if not withParam:
+        continue
+      valueKey = HardcodedParameterIndex.hashableValue(value)
+      if valueKey is HardcodedParameterIndex.Unhashable:
+        continue
+      posting = self.postings.get((paramName, valueKey), set())
+      if len(self.unhashable[paramName]) > 0 or len(withParam) < numWinners:
+        posting = posting | self.unhashable[paramName] | (set(range(0, numWinners)) - withParam)
+      allowed.append(posting)
+    if len(allowed) == 0:
+      return range(0, numWinners)
+    # intersect the most selective first
+    allowed.sort(key=len)
+    candidates = allowed[0]
+    for posting in allowed[1:]:
+      if len(candidates) == 0:
+        break
+      candidates = candidates & posting
+    return sorted(candidates)
+
+  ##########################################################
+  # MacroTile of the hardcoded and winning parameters of a winner, as get
+  # derives it; deriving it also assigns the derived parameters of the
+  # hardcoded parameters, so those are indexed again
+  def macroTile(self, winnerId):
+    if winnerId in self.macroTiles:
+      return self.macroTiles[winnerId]
+    hardcodedFrozen = self.frozens[winnerId]
+    winningParameters = self.winners[hardcodedFrozen][0]
+    matchUnion = {}
+    matchUnion.update(hardcodedFrozen.parameters)
+    matchUnion.update(winningParameters)
+    Solution.assignProblemIndependentDerivedParameters(matchUnion)
+    Solution.assignProblemIndependentDerivedParameters(hardcodedFrozen.parameters)
+    self.post(winnerId)
+    # the hardcoded parameters now hold their derived parameters, which
+    # later lookups take the MacroTile of
+    laterUnion = {}
+    laterUnion.update(hardcodedFrozen.parameters)
+    laterUnion.update(winningParameters)
+    self.macroTiles[winnerId] = (laterUnion["MacroTile0"], laterUnion["MacroTile1"])
+    return (matchUnion["MacroTile0"], matchUnion["MacroTile1"])
+
+  ##########################################################
+  # Same matches, in the same order, as WinningParameterDict.get
+  def get(self, lookupHardcodedParameters):
+    winners = self.winners
+    if len(winners) == 1:
+      return WinningParameterDict.get(lookupHardcodedParameters, winners)
+
+    matches = []
+    for winnerId in self.candidates(lookupHardcodedParameters):
+      hardcodedFrozen = self.frozens[winnerId]
+      frozenMatch = True
+      for paramName in hardcodedFrozen:
+        if paramName in lookupHardcodedParameters:
+          if lookupHardcodedParameters[paramName] != \
+              hardcodedFrozen[paramName]:
+            frozenMatch = False
+            break
+      if not frozenMatch:
+        continue
+      if "MacroTile0" in lookupHardcodedParameters:
+        macroTile = self.macroTile(winnerId)
+        if macroTile[0] != lookupHardcodedParameters["MacroTile0"] \
+            or macroTile[1] != lookupHardcodedParameters["MacroTile1"]:
+          continue
+      matches.append([hardcodedFrozen, winners[hardcodedFrozen][0], winners[hardcodedFrozen][1]])
+    return matches
+
+
 ################################################################################
 # Winning Parameters For Hardcoded Parameters
 ###############################################################################
@@ -583,6 +882,41 @@ class WinningParameterDict:
     #  [0] = winningParamters
     #  [1] = winningScore
     self.winners = {}
+    self.index = None
+
+
+  ##########################################################
+  # State, as [hardcodedParameters, winningParameters, score] in winner order
+  def state(self):
+    return [[hardcodedFrozen.parameters, self.winners[hardcodedFrozen][0], \
+        self.winners[hardcodedFrozen][1]] for hardcodedFrozen in self.winners]
+
+  @classmethod
+  def FromState(cls, state):
+    winners = cls()
+    for (hardcodedParameters, winningParameters, score) in state:
+      winners.winners[FrozenDictionary(hardcodedParameters)] = \
+          [deepcopy(winningParameters), score]
+    return winners
+
+
+  ##########################################################
+  # Add Hardcoded Parameters Without Winning Parameters
+  def addHardcoded(self, hardcodedParameters):
+    hardcodedFrozen = FrozenDictionary(hardcodedParameters)
+    self.winners[hardcodedFrozen] = [{},-1]
+    if self.index is not None and self.index.isCurrent(self.winners):
+      self.index.add(hardcodedFrozen)
+    return hardcodedFrozen
+
+
+  ##########################################################
+  # Matches of hardcoded parameters, through the index of the winners
+  def matches(self, hardcodedParameters):
+    # winners may have been replaced or added to directly
+    if self.index is None or not self.index.isCurrent(self.winners):
+      self.index = HardcodedParameterIndex(self.winners)
+    return self.index.get(hardcodedParameters)
 
 
   ##########################################################
@@ -600,9 +934,10 @@ class WinningParameterDict:
       winningScore = -9999 # -1 is score of invalid so use -9999 here
       # find fastest benchmark parameters for this hardcoded
       for benchmarkIdx,benchmarkResult in enumerate(hardcodedResults):
-        if not benchmarkResult: continue
+        if len(benchmarkResult) == 0: continue
         
-        benchmarkScore = max(benchmarkResult) # take fastest regardless of size
+        # take fastest regardless of size; getResultColumns gives arrays
+        benchmarkScore = float(benchmarkResult.max()) if hasattr(benchmarkResult, "max") else max(benchmarkResult)
         if benchmarkScore > winningScore:
           winningScore = benchmarkScore
           winningIdx = benchmarkIdx
@@ -612,7 +947,7 @@ class WinningParameterDict:
         winningParameters[paramName] = winningSolution[paramName]
       #print2("HCP[%u] Winner: idx=%u, gflops=%f, param=%s" \
       #    % ( hardcodedIdx, winningIdx, winningScore, winningParameters))
-      matches = WinningParameterDict.get(hardcodedParameters, self.winners)
+      matches = self.matches(hardcodedParameters)
       if len(matches) != 1:
         printExit("Didn't find exactly 1 match")
       hardcodedParametersKey = matches[0][0]
@@ -622,13 +957,15 @@ class WinningParameterDict:
       self.winners[hardcodedParametersKey][1] = winningScore
       if globalParameters["PrintLevel"] >= 1:
         progressBar.increment()
+    # winning parameters changed, and with them the derived MacroTiles
+    self.index = None
 
 
   ##########################################################
   # Get Winning Parameters For Hardcoded Parameters
   def __getitem__( self, hardcodedParameters ):
     #(hardcodedParametersKey, winningParameters, score) = \
-    matches = WinningParameterDict.get(hardcodedParameters, self.winners)
+    matches = self.matches(hardcodedParameters)
     if len(matches) == 1:
       return matches[0][1]
     elif len(matches) == 0:
@@ -643,7 +980,10 @@ class WinningParameterDict:
   def wpdUpdate(self, newHardcodedParameterList ):
     # TODO when new list is joining, we need to choose the fastest
     oldWinners = self.winners
+    oldIndex = self.index if self.index is not None and self.index.isCurrent(oldWinners) \
+        else HardcodedParameterIndex(oldWinners)
     self.winners = {}
+    self.index = None
 
     # if this is first time, populate with dummies and early exit
     if len(oldWinners) == 0:
@@ -655,7 +995,7 @@ class WinningParameterDict:
         progressBar = ProgressBar(len(newHardcodedParameterList))
       for newHardcodedParameters in newHardcodedParameterList:
         #(oldHardcodedParameters, winningParameters, score) = \
-        matches = WinningParameterDict.get(newHardcodedParameters, oldWinners)
+        matches = oldIndex.get(newHardcodedParameters)
         if len(matches) == 1: # plain update
           hardcodedFrozen = matches[0][0]
           winningParameters = matches[0][1]
@@ -693,6 +1033,9 @@ class WinningParameterDict:
   ##########################################################
   # Get Winning Parameters For Hardcoded Parameters
   # For "Updating Solution Database"
+  # Compares the lookup against every winner; WinningParameterDict looks up
+  # its own winners through a HardcodedParameterIndex, which gives the same
+  # matches
   #  - winners is a hash of all the solutions.  Points to 2D(?) list
   #       0 : parameters
   #       1 : score
@@ -0,0 +1,175 @@
+################################################################################
+# Copyright (C) 2019 Advanced Micro Devices, Inc. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell cop-
+# ies of the Software, and to permit persons to whom the Software is furnished
+# to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IM-
+# PLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNE-
+# CTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+################################################################################
+
+from .Common import printWarning
+from . import Utils
+
+import csv
+import json
+import os
+import struct
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+def available():
+    return numpy is not None
+
+def storeFileName(benchmarkDataPath, problemType):
+    return os.path.join(benchmarkDataPath, "%s.tbr" % problemType)
+
+def storeKey(dataFileNames, solutionFingerprints, problemIndexToSize, exactProblemSizes):
+    """
+    Identifies the benchmark results a LogicAnalyzer reads: its data files,
+    solutions and problem sizes.  Data files are identified by their size
+    and modification time, so that checking the key doesn't read them.
+    """
+    sources = []
+    for dataFileName in dataFileNames:
+        st = os.stat(dataFileName)
+        sources.append((os.path.basename(dataFileName), st.st_size, st.st_mtime_ns))
+    return Utils.fingerprint(BenchmarkResultStore.Version, sources, solutionFingerprints, \
+            problemIndexToSize, sorted(exactProblemSizes))
+
+class BenchmarkResultStore:
+    """
+    The benchmark results of one problem type, as read by LogicAnalyzer from
+    the CSV files of all of its benchmark steps, in a file which is memory
+    mapped when read back, so that analyzing the same results again doesn't
+    parse the CSV files.
+
+    The file holds Magic, the length of a JSON header, the header and, at an
+    offset aligned to Alignment, the gflops of each problem and solution as
+    a dense little-endian float32 array [problem][solution] in LogicAnalyzer
+    serial order.  The header holds the key of the results (see storeKey),
+    the fingerprint of each solution, the sizes along each problem index and
+    the winners of the exact problem sizes.
+    """
+
+    Magic = b"TNSLBRS\0"
+    Version = 1
+    Alignment = 64
+
+    def __init__(self, header, data):
+        self.header = header
+        self.data = data
+
+    @property
+    def key(self):
+        return self.header["Key"]
+
+    @property
+    def solutionFingerprints(self):
+        return self.header["Solutions"]
+
+    @property
+    def problemIndexToSize(self):
+        return self.header["ProblemSizes"]
+
+    def exactWinners(self):
+        return dict([(tuple(size), [winnerIdx, gflops]) for (size, winnerIdx, gflops) in self.header["ExactWinners"]])
+
+    @classmethod
+    def read(cls, fileName, key=None):
+        """
+        Maps fileName, returning None if it doesn't exist, can't be read or
+        doesn't hold the results identified by key.
+        """
+        try:
+            with open(fileName, "rb") as f:
+                (magic, headerSize) = struct.unpack("<8sQ", f.read(16))
+                if magic != cls.Magic:
+                    return None
+                header = json.loads(f.read(headerSize).decode())
+        except (IOError, OSError, struct.error, ValueError):
+            return None
+
+        if header.get("Version") != cls.Version or (key is not None and header.get("Key") != key):
+            return None
+
+        shape = tuple(header["Shape"])
+        if shape[0] * shape[1] == 0:
+            return cls(header, numpy.zeros(shape, dtype="<f4"))
+        try:
+            data = numpy.memmap(fileName, dtype="<f4", mode="c", offset=header["Offset"], shape=shape)
+        except (IOError, OSError, ValueError) as e:
+            printWarning("Ignoring unreadable benchmark result store %s: %s" % (fileName, e))
+            return None
+        return cls(header, data)
+
+    @classmethod
+    def write(cls, fileName, key, solutionFingerprints, problemIndexToSize, exactWinners, data, flopsPerMac):
+        data = numpy.asarray(data, dtype="<f4").reshape(-1, len(solutionFingerprints))
+        header = {"Version": cls.Version,
+                  "Key": key,
+                  "Solutions": solutionFingerprints,
+                  "ProblemSizes": problemIndexToSize,
+                  "ExactWinners": [[list(size), winner[0], winner[1]] for (size, winner) in sorted(exactWinners.items())],
+                  "FlopsPerMac": flopsPerMac,
+                  "Shape": list(data.shape),
+                  "Offset": 0}
+
+        # the offset is part of the header, so size the header with the
+        # widest offset it could need
+        header["Offset"] = 2**63
+        headerSize = len(json.dumps(header).encode())
+        header["Offset"] = (16 + headerSize + cls.Alignment - 1) // cls.Alignment * cls.Alignment
+        headerBytes = json.dumps(header).encode()
+
+        tmpFileName = fileName + ".tmp"
+        try:
+            with open(tmpFileName, "wb") as f:
+                f.write(struct.pack("<8sQ", cls.Magic, len(headerBytes)))
+                f.write(headerBytes)
+                f.write(b"\0" * (header["Offset"] - 16 - len(headerBytes)))
+                f.write(numpy.ascontiguousarray(data).tobytes())
+            os.replace(tmpFileName, fileName)
+        except (IOError, OSError) as e:
+            printWarning("Could not write benchmark result store %s: %s" % (fileName, e))
+
+    def exportCSV(self, csvFileName):
+        """
+        Writes the benchmarked range problems as a CSV in the format
+        LogicAnalyzer reads, with one column per solution of the store.
+        Exact problem sizes are only stored as their winners and aren't
+        exported.
+        """
+        problemIndexToSize = self.problemIndexToSize
+        numIndices = len(problemIndexToSize)
+        numProblemSizes = [len(sizes) for sizes in problemIndexToSize]
+        with open(csvFileName, "w") as f:
+            writer = csv.writer(f)
+            writer.writerow(["Problem"] + ["Size%u" % i for i in range(0, numIndices)] + ["TotalFlops"] \
+                    + ["Solution%u" % i for i in range(0, len(self.solutionFingerprints))])
+            for problemIdx in range(0, len(self.data)):
+                if (self.data[problemIdx] == -2).all():
+                    continue # not benchmarked
+                size = []
+                serial = problemIdx
+                for i in range(0, numIndices):
+                    size.append(problemIndexToSize[i][serial % numProblemSizes[i]])
+                    serial //= numProblemSizes[i]
+                totalFlops = self.header["FlopsPerMac"]
+                for s in size:
+                    totalFlops *= s
+                writer.writerow([problemIdx] + size + [totalFlops] + [repr(float(g)) for g in self.data[problemIdx]])
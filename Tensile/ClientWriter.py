@@ -22,6 +22,7 @@
 from .Common import globalParameters, HR, pushWorkingPath, popWorkingPath, print1, CHeader, printWarning, listToInitializer
 from . import ClientExecutable
 from . import YAMLIO
+from .SolutionStructs import SolutionSet
 
 import os
 from subprocess import Popen
@@ -232,6 +233,8 @@ def writeRunScript(path, libraryLogicPath, forBenchmark, enableTileSelection):
       clientParams = globalParameters["ClientArgs"]
       if clientParams:
         clp += " " + globalParameters["ClientArgs"]
+    # arguments of the script, such as where to resume, go to the client
+    clp += " %*" if os.name == "nt" else " \"$@\""
     runScriptFile.write(clp)
     runScriptFile.write("\n")
     runScriptFile.write("ERR1=$?\n")
@@ -409,12 +412,10 @@ def writeClientParameters(forBenchmark, solutions, problemSizes, stepName, \
   # Min Naming
   ##############################################################################
   if forBenchmark:
-    kernels = []
+    kernels = SolutionSet()
     for solution in solutions:
-      solutionKernels = solution.getKernels()
-      for kernel in solutionKernels:
-        if kernel not in kernels:
-          kernels.append(kernel)
+      kernels.update(solution.getKernels())
+    kernels = list(kernels)
 
     """
     solutionSerialNaming = Solution.getSerialNaming(solutions)
@@ -24,6 +24,29 @@ from .Common import globalParameters, printExit
 # Global to print module names around strings
 printModuleNames = 0
 
+"""
+Format an instruction and its operands as "op a, b, c"
+"""
+def formatInst(params):
+  if len(params) == 1:
+    return str(params[0])
+  return "%s %s" % (params[0], ", ".join(map(str, params[1:])))
+
+"""
+Render a list of Items and strings into a single string, with separator
+between consecutive entries, without building the string of each Item.
+"""
+def render(items, separator=""):
+  out = []
+  for (i, item) in enumerate(items):
+    if i > 0:
+      out.append(separator)
+    if isinstance(item, Item):
+      item.render(out)
+    else:
+      out.append(str(item))
+  return "".join(out)
+
 """
 Base class for Modules, Instructions, etc
 Item is a atomic collection of or more instructions and commentsA
@@ -34,6 +57,13 @@ class Item:
   def toStr(self):
     return str(self)
 
+  """
+  Append the text of this item to out, a list of strings, so that a tree
+  of modules is joined once instead of once per module.
+  """
+  def render(self, out):
+    out.append(str(self))
+
   def countType(self,ttype):
     return int(isinstance(self, ttype))
 
@@ -52,13 +82,17 @@ class Module(Item):
     self.itemList = []
 
   def __str__(self):
-    s = ""
+    out = []
+    self.render(out)
+    return "".join(out)
+
+  def render(self, out):
     if printModuleNames:
-      s += "// %s { \n" % self.name
-    s += "".join([str(x) for x in self.itemList])
+      out.append("// %s { \n" % self.name)
+    for x in self.itemList:
+      x.render(out)
     if printModuleNames:
-      s += "// } %s\n" % self.name
-    return s
+      out.append("// } %s\n" % self.name)
 
   """
   Add specified item to the list of items in the module.
@@ -199,6 +233,9 @@ class TextBlock(Item):
   def __str__(self):
     return self.text
 
+  def render(self, out):
+    out.append(self.text)
+
 
 """
 Inst is a single instruction and is base class for other instructions.
@@ -209,13 +246,7 @@ class Inst(Item):
     params = args[0:len(args)-1]
     comment = args[len(args)-1]
     assert(isinstance(comment, str))
-    formatting = "%s"
-    if len(params) > 1:
-      formatting += " %s"
-    for i in range(0, len(params)-2):
-      formatting += ", %s"
-    instStr = formatting % (params)
-    self.text = self.formatWithComment(instStr, comment)
+    self.text = self.formatWithComment(formatInst(params), comment)
 
   def formatWithComment(self, instStr, comment):
     return "%-50s // %s\n" % (instStr, comment)
@@ -68,13 +68,36 @@ globalParameters["ForceRedoBenchmarkProblems"] = True # if False and benchmarkin
 globalParameters["ForceRedoLibraryLogic"] = True      # if False and library logic already analyzed, then library logic will be skipped when tensile is re-run
 globalParameters["ForceRedoLibraryClient"] = True     # if False and library client already built, then building library client will be skipped when tensile is re-run
 globalParameters["ShowProgressBar"] = True     # if False and library client already built, then building library client will be skipped when tensile is re-run
-globalParameters["SolutionSelectionAlg"] = 0          # algorithm to detetermine which solutions to keep. 0=removeLeastImportantSolutions, 1=keepWinnerSolutions (faster)
+globalParameters["SolutionSelectionAlg"] = 0          # algorithm to detetermine which solutions to keep. 0=removeLeastImportantSolutions, 1=keepWinnerSolutions (faster), 2=greedy set cover / marginal gain, 3=top K under MaxSolutions budget (2 and 3 require NumPy)
+globalParameters["SolutionSelectionReport"] = False    # print the predicted time vs number of kernels of each solution selection algorithm
+globalParameters["NumPyLogicAnalysis"] = True    # analyze benchmark data with NumPy array reductions when NumPy is installed, rather than pure-Python loops
+globalParameters["ParallelRangeLogic"] = True    # build the range logic of the outer problem indices in CpuThreads processes; the logic is identical to building it serially
+globalParameters["SolutionPrecheck"] = True        # skip building solutions whose config breaks a MacroTile, NumThreads, VectorWidth or LDS constraint which would reject them
+globalParameters["BenchmarkCheckpoints"] = True    # keep the state of each benchmark step in Data/<step>.checkpoint.yaml, so that an interrupted benchmark skips finished steps and resumes the benchmark at the first missing result
+globalParameters["ParallelSolutionEnumeration"] = True  # build and validate the solutions of each benchmark step in CpuThreads processes; the solutions and their order are identical to enumerating them serially
+globalParameters["CSVBlockRows"] = 1024          # rows of benchmark result CSVs parsed at a time into NumPy arrays when NumPy is installed
+globalParameters["BenchmarkResultStore"] = True  # keep the benchmark results of each problem type in a memory-mapped <ProblemType>.tbr in BenchmarkDataPath when NumPy is installed, so analyzing them again doesn't parse the CSVs
 globalParameters["ExpandRanges"] = True          # expand ranges into exact configs before writing logic file.  False ignores ranges.
 globalParameters["ExitAfterKernelGen"] = False     # Exit after generating kernels
 globalParameters["ShowProgressBar"] = True     # if False and library client already built, then building library client will be skipped when tensile is re-run
 globalParameters["WavefrontWidth"] = 64     # if False and library client already built, then building library client will be skipped when tensile is re-run
 globalParameters["ExitOnFails"] = 1     # Exit if failures detected.
 globalParameters["CpuThreads"] = -1  # How many CPU threads to use for kernel generation.  0=no threading, -1 == nproc, N=min(nproc,N).  TODO - 0 sometimes fails with a kernel name error?  0 does not check error codes correctly
+globalParameters["LibraryFormat"] = "yaml"         # format of TensileLibrary.yaml: "yaml", or "json" which is faster to write and is still readable as YAML
+globalParameters["LibraryRangeLogic"] = False         # write the exact and range logic of logic files with range logic to TensileLibrary.yaml as RangeLogic libraries (interval arrays searched by bisection) instead of Matching libraries of their exact sizes; the C++ library doesn't read them yet
+globalParameters["LibraryExactIndex"] = False         # write an open-addressing hash index (FNV-1a-64, linear probing) of the exact sizes of each Matching library to TensileLibrary.yaml, next to its distance table; the C++ library doesn't read it yet
+globalParameters["LibraryNearestIndex"] = False       # write a KD-tree of the sizes of each Matching library with a Euclidean distance to TensileLibrary.yaml, for nearest size lookup without a full table scan; the C++ library doesn't read it yet
+globalParameters["LogicFileCache"] = True       # keep parsed logic and solution files as JSON in LogicFileCachePath to speed up re-reading them
+globalParameters["LogicFileCachePath"] = None   # directory for the logic file cache; None uses $XDG_CACHE_HOME/tensile/logic (~/.cache/tensile/logic)
+globalParameters["KernelCachePath"] = None     # directory for the content-addressed kernel build cache; None disables caching of generated kernels
+globalParameters["KernelCacheMaxSize"] = 4096  # MiB; least recently used kernel cache entries are evicted above this size
+globalParameters["AssemblerBatchSize"] = 0     # assemble up to this many assembly kernels for the same ISA per assembler invocation; 0 runs the assembler once per kernel
+globalParameters["AsmCapsCache"] = True       # keep the probed assembler capabilities on disk and reuse them while the assembler and SupportedISA are unchanged
+globalParameters["AsmCapsCachePath"] = None    # directory for the assembler capabilities cache; None uses $XDG_CACHE_HOME/tensile (~/.cache/tensile)
+globalParameters["ForceReprobeAsmCaps"] = False # probe the assembler capabilities even if they are cached
+globalParameters["SolutionCache"] = True          # reuse the derived parameters of solutions built from the same config earlier in the process
+globalParameters["SolutionCachePath"] = None      # directory where the derived parameters of solutions are kept between runs; None keeps them in memory only
+globalParameters["SolutionCacheMaxEntries"] = 20000  # solutions whose derived parameters are kept, about 4 KB each; least recently used ones are dropped
 # FROM MERGE
 #globalParameters["CpuThreads"] = -4         # How many CPU threads to use for kernel generation.  0=no threading, <0 == nproc*abs(CpuThreads), N=min(nproc,N)
 
@@ -863,6 +886,9 @@ defaultAnalysisParameters = {
     "DeviceNames":  "fallback",
     "ArchitectureName": "gfx000",
     "SolutionImportanceMin":      0.01, # = 0.01=1% total time saved by keeping this solution
+    "MaxSolutions":               0,    # kernel budget of SolutionSelectionAlg 2 and 3, 0=no budget
+    "SizeWeightsFile":            None, # production trace of how often each problem size is used, to weight solution importance, range scores and predicted times: YAML list of [size, calls] or a rocBLAS log of rocblas-bench commands
+    "UntracedSizeWeight":         0.01, # weight, relative to one call, of range problems no size of SizeWeightsFile maps to
     }
 
 
@@ -975,6 +1001,128 @@ def tryAssembler(isaVersion, options, asmString):
 
   return 1 # syntax works
 
+# Instruction sequences tried by probeAsmCaps: (capability, assembler options, asmString)
+asmCapsProbes = [
+  ("SupportedISA",    "", ""),
+  ("HasExplicitCO",   "", "v_add_co_u32 v0,vcc,v0,1"),
+  ("HasDirectToLds",  "", "buffer_load_dword v40, v36, s[24:27], s28 offen offset:0 lds"),
+  ("HasAddLshl",      "", "v_add_lshl_u32 v47, v36, v34, 0x2"),
+  ("HasSMulHi",       "", "s_mul_hi_u32 s47, s36, s34"),
+  ("HasCodeObjectV3", "-mno-code-object-v3", ""),
+  ("Vmcnt63",         "", "s_waitcnt vmcnt(63)"),
+  ("Vmcnt15",         "", "s_waitcnt vmcnt(15)"),
+  ]
+
+def isaName(v):
+  return "gfx" + "".join(map(str,v))
+
+def tryAssemblerProbe(probe):
+  (v, cap, options, asmString) = probe
+  return tryAssembler(isaName(v), options, asmString)
+
+def probeAsmCaps(isaList):
+  """
+  Runs every probe in asmCapsProbes for each ISA in isaList and returns
+  {isa: asmCaps}.  The probes are independent assembler invocations, so they
+  run concurrently.
+  """
+  import multiprocessing
+  import multiprocessing.dummy
+
+  probes = [(v, cap, options, asmString) for v in isaList for (cap, options, asmString) in asmCapsProbes]
+  # threads only wait on the assembler processes
+  pool = multiprocessing.dummy.Pool(min(len(probes), 4*multiprocessing.cpu_count()))
+  results = pool.map(tryAssemblerProbe, probes)
+  pool.close()
+
+  probed = {}
+  for ((v, cap, _, _), result) in zip(probes, results):
+    probed.setdefault(v, {})[cap] = result
+
+  asmCaps = {}
+  for v in isaList:
+    caps = {}
+    for (cap, _, _) in asmCapsProbes:
+      if not cap.startswith("Vmcnt"):
+        caps[cap] = probed[v][cap]
+    if probed[v]["Vmcnt63"]:
+      caps["MaxVmcnt"] = 63
+    elif probed[v]["Vmcnt15"]:
+      caps["MaxVmcnt"] = 15
+    else:
+      caps["MaxVmcnt"] = 0
+    asmCaps[v] = caps
+  return asmCaps
+
+def defaultCachePath():
+  """
+  Directory of the caches Tensile keeps between runs unless given another:
+  $XDG_CACHE_HOME/tensile, or ~/.cache/tensile.
+  """
+  return os.path.join(os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")), "tensile")
+
+def asmCapsCacheFile(cachePath, isaList):
+  """
+  Cache file for the capabilities of the current assembler: the name is
+  keyed on the assembler path, size and mtime, the ISAs and the probes.
+  """
+  import hashlib
+
+  assembler = globalParameters["AssemblerPath"]
+  try:
+    st = os.stat(assembler)
+    assembler = (assembler, os.path.realpath(assembler), st.st_size, st.st_mtime_ns)
+  except (OSError, TypeError):
+    pass
+
+  key = repr((__version__, assembler, sorted(isaList), asmCapsProbes))
+  return os.path.join(cachePath, "asmcaps-%s.json" % hashlib.sha1(key.encode()).hexdigest())
+
+def readAsmCapsCache(cacheFile, isaList):
+  import json
+  try:
+    with open(cacheFile) as f:
+      data = json.load(f)
+    asmCaps = dict([(tuple(v), dict(caps)) for (v, caps) in data])
+  except (IOError, OSError, ValueError, TypeError):
+    return None
+  if sorted(asmCaps.keys()) != sorted(isaList):
+    return None
+  return asmCaps
+
+def writeAsmCapsCache(cacheFile, asmCaps):
+  import json
+  try:
+    ensurePath(os.path.dirname(cacheFile))
+    tmpFile = "%s.%u.tmp" % (cacheFile, os.getpid())
+    with open(tmpFile, "w") as f:
+      json.dump([[list(v), caps] for (v, caps) in asmCaps.items()], f)
+    os.replace(tmpFile, cacheFile)
+  except (IOError, OSError) as e:
+    print1("# Could not write assembler capabilities cache %s: %s" % (cacheFile, e))
+
+def getAsmCaps(isaList, useCache=True, cachePath=None, forceReprobe=False):
+  """
+  Returns {isa: asmCaps} for the current assembler, reusing the result of a
+  previous probe with the same assembler and ISAs when useCache is set.
+  """
+  if not useCache:
+    return probeAsmCaps(isaList)
+
+  if cachePath is None:
+    cachePath = defaultCachePath()
+  cacheFile = asmCapsCacheFile(cachePath, isaList)
+
+  if not forceReprobe:
+    asmCaps = readAsmCapsCache(cacheFile, isaList)
+    if asmCaps is not None:
+      print2("# Read assembler capabilities from %s" % cacheFile)
+      return asmCaps
+
+  asmCaps = probeAsmCaps(isaList)
+  writeAsmCapsCache(cacheFile, asmCaps)
+  return asmCaps
+
 
 ################################################################################
 # Assign Global Parameters
@@ -1036,24 +1184,15 @@ def assignGlobalParameters( config ):
       printWarning("%s exited with code %u" % (globalParameters["ROCmAgentEnumeratorPath"], process.returncode))
 
   # Determine assembler capabilities by testing short instructions sequences:
-  globalParameters["AsmCaps"] = {}
+  # these settings are needed before the rest of config is applied below
+  asmCapsParams = dict([(key, config.get(key, globalParameters[key])) \
+      for key in ["AsmCapsCache", "AsmCapsCachePath", "ForceReprobeAsmCaps"]])
+  globalParameters["AsmCaps"] = getAsmCaps(globalParameters["SupportedISA"] + [(0,0,0)], \
+      asmCapsParams["AsmCapsCache"], asmCapsParams["AsmCapsCachePath"], asmCapsParams["ForceReprobeAsmCaps"])
   globalParameters["ArchCaps"] = {}
   for (v) in globalParameters["SupportedISA"] + [(0,0,0)]:
-    globalParameters["AsmCaps"][v] = {}
     globalParameters["ArchCaps"][v] = {}
-    isaVersion = "gfx" + "".join(map(str,v))
-    globalParameters["AsmCaps"][v]["SupportedISA"] = tryAssembler(isaVersion, "", "")
-    globalParameters["AsmCaps"][v]["HasExplicitCO"] = tryAssembler(isaVersion, "", "v_add_co_u32 v0,vcc,v0,1")
-    globalParameters["AsmCaps"][v]["HasDirectToLds"] = tryAssembler(isaVersion, "", "buffer_load_dword v40, v36, s[24:27], s28 offen offset:0 lds")
-    globalParameters["AsmCaps"][v]["HasAddLshl"] = tryAssembler(isaVersion, "", "v_add_lshl_u32 v47, v36, v34, 0x2")
-    globalParameters["AsmCaps"][v]["HasSMulHi"] = tryAssembler(isaVersion, "", "s_mul_hi_u32 s47, s36, s34")
-    globalParameters["AsmCaps"][v]["HasCodeObjectV3"] = tryAssembler(isaVersion, "-mno-code-object-v3", "")
-    if tryAssembler(isaVersion, "", "s_waitcnt vmcnt(63)"):
-      globalParameters["AsmCaps"][v]["MaxVmcnt"] = 63
-    elif tryAssembler(isaVersion, "", "s_waitcnt vmcnt(15)"):
-      globalParameters["AsmCaps"][v]["MaxVmcnt"] = 15
-    else:
-      globalParameters["AsmCaps"][v]["MaxVmcnt"] = 0
+    isaVersion = isaName(v)
 
     caps = ""
     for k in globalParameters["AsmCaps"][v]:
@@ -1175,7 +1314,8 @@ def ParallelMap(function, objects, message="", enable=True, method=None):
       # operation.
       try:
         mapFunc = method(itertools)
-      except NameError:
+      except (NameError, AttributeError):
+        # e.g. imap_unordered, which itertools has no equivalent of
         mapFunc = None
 
     if mapFunc is not None:
@@ -0,0 +1,195 @@
+################################################################################
+# Copyright (C) 2019 Advanced Micro Devices, Inc. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell cop-
+# ies of the Software, and to permit persons to whom the Software is furnished
+# to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IM-
+# PLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNE-
+# CTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+################################################################################
+
+from . import __version__
+from .Common import globalParameters, ensurePath, print1, print2, printWarning
+from . import Utils
+
+import hashlib
+import os
+import shutil
+import tempfile
+
+class KernelBuildCache:
+    """
+    Content-addressed store of generated kernels, shared between runs of
+    TensileCreateLibrary.
+
+    Each entry is keyed on the full kernel parameter state, the kernel name,
+    the target ISA and assembler capabilities, the assembler identity and the
+    code object version.  An entry holds the source and header strings
+    returned by processKernelSource and, for assembly kernels, the .s, .o and
+    .co files, so that a hit skips both kernel generation and assembly.
+
+    Entries live in <path>/<key[:2]>/<key>/.  The entry directory's mtime is
+    refreshed on every hit and entries are evicted oldest first once the
+    cache grows beyond maxSize bytes.
+    """
+
+    SourceFileName = 'source.txt'
+    HeaderFileName = 'header.txt'
+    AssemblyExtensions = ['.s', '.o', '.co']
+
+    @classmethod
+    def FromGlobalParameters(cls):
+        if globalParameters["KernelCachePath"] is None:
+            return None
+        return cls(globalParameters["KernelCachePath"], globalParameters["KernelCacheMaxSize"] * 1024 * 1024)
+
+    def __init__(self, path, maxSize):
+        self.path = ensurePath(os.path.abspath(path))
+        self.maxSize = maxSize
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.toolchain = self.toolchainIdentity()
+
+    @staticmethod
+    def toolchainIdentity():
+        """
+        Everything outside of the kernel parameters which affects the generated artifacts.
+        """
+        assembler = globalParameters["AssemblerPath"]
+        try:
+            st = os.stat(assembler)
+            assembler = (assembler, st.st_size, int(st.st_mtime))
+        except (OSError, TypeError):
+            pass
+
+        return (__version__,
+                assembler,
+                globalParameters["HccVersion"],
+                globalParameters["CodeObjectVersion"],
+                globalParameters["RuntimeLanguage"],
+                globalParameters["MergeFiles"],
+                globalParameters["CodeFromFiles"])
+
+    def key(self, kernel, kernelWriter):
+        kernelName = kernelWriter.getKernelName(kernel)
+
+        isa = tuple(kernel["ISA"])
+        asmCaps = globalParameters["AsmCaps"].get(isa) if "AsmCaps" in globalParameters else None
+
+        replacement = None
+        if kernel["KernelLanguage"] == "Assembly":
+            replacementPath = kernelWriter.getReplacementKernelPath(kernel)
+            if replacementPath is not None:
+                with open(replacementPath, 'rb') as f:
+                    replacement = hashlib.sha1(f.read()).hexdigest()
+
+        return Utils.fingerprint(self.toolchain, kernelName, isa, asmCaps, replacement, kernel)
+
+    def entryPath(self, key):
+        return os.path.join(self.path, key[:2], key)
+
+    def fetch(self, key, kernel, kernelWriter):
+        """
+        Returns the cached (err, src, header, kernelName) for kernel, restoring
+        its assembly artifacts into the assembly directory, or None on a miss.
+        """
+        entry = self.entryPath(key)
+        kernelName = kernelWriter.getKernelName(kernel)
+        try:
+            with open(os.path.join(entry, self.SourceFileName)) as f:
+                src = f.read()
+            with open(os.path.join(entry, self.HeaderFileName)) as f:
+                header = f.read()
+
+            if kernel["KernelLanguage"] == "Assembly":
+                kernelWriter.writeByteArrayScript()
+                asmPath = kernelWriter.getAssemblyDirectory()
+                for ext in self.AssemblyExtensions:
+                    shutil.copyfile(os.path.join(entry, kernelName + ext),
+                                    os.path.join(asmPath, kernelName + ext))
+
+            os.utime(entry, None)
+        except (IOError, OSError):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        print2("# Kernel cache hit: %s" % kernelName)
+        return (0, src, header, kernelName)
+
+    def store(self, key, kernel, kernelWriter, result):
+        (err, src, header, kernelName) = result
+        if err:
+            return
+
+        entry = self.entryPath(key)
+        if os.path.isdir(entry):
+            return
+
+        tmpDir = tempfile.mkdtemp(prefix='tmp', dir=ensurePath(os.path.dirname(entry)))
+        try:
+            with open(os.path.join(tmpDir, self.SourceFileName), 'w') as f:
+                f.write(src)
+            with open(os.path.join(tmpDir, self.HeaderFileName), 'w') as f:
+                f.write(header)
+
+            if kernel["KernelLanguage"] == "Assembly":
+                asmPath = kernelWriter.getAssemblyDirectory()
+                for ext in self.AssemblyExtensions:
+                    shutil.copyfile(os.path.join(asmPath, kernelName + ext),
+                                    os.path.join(tmpDir, kernelName + ext))
+
+            # Publish the entry atomically so that concurrent builds never see partial entries.
+            os.rename(tmpDir, entry)
+            self.stores += 1
+        except (IOError, OSError) as e:
+            printWarning("Could not store kernel %s in cache: %s" % (kernelName, e))
+        finally:
+            shutil.rmtree(tmpDir, True)
+
+    def entries(self):
+        for prefix in os.listdir(self.path):
+            prefixPath = os.path.join(self.path, prefix)
+            if not os.path.isdir(prefixPath):
+                continue
+            for key in os.listdir(prefixPath):
+                if key.startswith('tmp'):
+                    continue
+                entry = os.path.join(prefixPath, key)
+                size = sum([os.path.getsize(os.path.join(entry, f)) for f in os.listdir(entry)])
+                yield (os.stat(entry).st_mtime, size, entry)
+
+    def size(self):
+        return sum([size for (_, size, _) in self.entries()])
+
+    def evict(self):
+        """
+        Removes least recently used entries until the cache fits in maxSize.
+        """
+        entries = sorted(self.entries())
+        total = sum([size for (_, size, _) in entries])
+        for (_, size, entry) in entries:
+            if total <= self.maxSize:
+                break
+            shutil.rmtree(entry, True)
+            total -= size
+            self.evictions += 1
+
+    def printStats(self):
+        lookups = self.hits + self.misses
+        hitRate = 100.0 * self.hits / lookups if lookups else 0.0
+        print1("# Kernel cache %s: %u hits, %u misses (%.1f%% hit rate), %u stored, %u evicted" \
+            % (self.path, self.hits, self.misses, hitRate, self.stores, self.evictions))
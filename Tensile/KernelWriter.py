@@ -508,8 +508,8 @@ class KernelWriter(metaclass=abc.ABCMeta):
       kl.append(self.comment("prefetch: global -> local"))
       kl.append(self.openSumAtLeastUnroll(kernel, prefetch=True, isPap=isPap, isOptNLL=False))
       if self.enable["GlobalRead"]:
-        kl.append(str(self.globalReadDo(kernel, 0, tensorParametersA)))
-        kl.append(str(self.globalReadDo(kernel, 0, tensorParametersB)))
+        kl.append(self.globalReadDo(kernel, 0, tensorParametersA))
+        kl.append(self.globalReadDo(kernel, 0, tensorParametersB))
       if self.enable["GlobalReadInc"]:
         kl.append(self.globalReadIncrement(kernel, self.unrollIdx, tensorParametersA, pfi))
         kl.append(self.globalReadIncrement(kernel, self.unrollIdx, tensorParametersB, pfi))
@@ -586,7 +586,7 @@ class KernelWriter(metaclass=abc.ABCMeta):
     kl.append(self.comment3("Begin Kernel"))
     kl.append(self.functionSignaturePrefix(kernel))
 
-    beforeFunctionSignature = '\n'.join([str(x) for x in kl])
+    beforeFunctionSignature = Code.render(kl, '\n')
     kl = []
 
     kl.append(self.functionSignatureSuffix(kernel))
@@ -729,7 +729,7 @@ class KernelWriter(metaclass=abc.ABCMeta):
 
       # Schedule the global read, global read inc, and writes:
       self.makeSchedule(kernel, tensorParametersA, tensorParametersB, localWriteEndIter)
-      kl.append(str(self.unrollLoopHeaderCode))
+      kl.append(self.unrollLoopHeaderCode)
 
       if kernel["PrefetchGlobalRead"] and not kernel["PrefetchLocalRead"]:
         if self.enable["Wait"]:
@@ -1308,7 +1308,7 @@ class KernelWriter(metaclass=abc.ABCMeta):
     kl.append(self.functionSuffix(kernel))
 
     kl.append(self.closeString(kernel))
-    kStr = '\n'.join([str(x) for x in kl])
+    kStr = Code.render(kl, '\n')
     afterFunctionSignature = kStr
 
     error = self.overflowedResources
@@ -2589,6 +2589,12 @@ for codeObjectFileName in codeObjectFileNames:
       if kernel["KernelLanguage"] == "Assembly":
         self.writeByteArrayScript()
 
+        if globalParameters["AssemblerBatchSize"] > 0:
+          # assembled later, along with other kernels for the same ISA,
+          # by TensileCreateLibrary.assembleKernelBatches
+          self.getKernelObjectAssemblyFile(kernel)
+          return (0, "")
+
         asmPath = self.getAssemblyDirectory()
         coFile = self.getSingleCodeObjectFile(kernel)
         kernelName = self.getKernelName(kernel)
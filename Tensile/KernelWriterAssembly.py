@@ -462,7 +462,16 @@ class KernelWriterAssembly(KernelWriter):
     for i in range(129,256+1): self.vgprOccupancy[i] = 1
 
   def getCompileArgs(self, sourceFileName, objectFileName, *moreArgs):
-    isa = self.version
+    return self.getIsaCompileArgs(self.version, *moreArgs) + ['-c', '-o', objectFileName, sourceFileName]
+
+  def getBatchCompileArgs(self, isa, sourceFileNames, *moreArgs):
+    """
+    Assembles all of sourceFileNames, which must target the same isa, in a
+    single invocation.  Each X.s is assembled to X.o in the working directory.
+    """
+    return self.getIsaCompileArgs(isa, *moreArgs) + ['-c'] + list(sourceFileNames)
+
+  def getIsaCompileArgs(self, isa, *moreArgs):
     archHasV3 = globalParameters["AsmCaps"][isa]["HasCodeObjectV3"]
 
     rv = [globalParameters['AssemblerPath'],
@@ -476,8 +485,6 @@ class KernelWriterAssembly(KernelWriter):
 
     rv += moreArgs
 
-    rv += ['-c', '-o', objectFileName, sourceFileName]
-
     return rv
 
   def getLinkCodeObjectArgs(self, objectFileNames, coFileName, *moreArgs):
@@ -9091,13 +9098,7 @@ class KernelWriterAssembly(KernelWriter):
 def inst(*args):
   params = args[0:len(args)-1]
   comment = args[len(args)-1]
-  formatting = "%s"
-  if len(params) > 1:
-    formatting += " %s"
-  for i in range(0, len(params)-2):
-    formatting += ", %s"
-  instStr = formatting % (params)
-  line = "%-50s // %s\n" % (instStr, comment)
+  line = "%-50s // %s\n" % (Code.formatInst(params), comment)
   return line
 
 ########################################
@@ -19,10 +19,14 @@
 # CTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 ################################################################################
 
-from .Common import print1, print2, HR, printExit, defaultAnalysisParameters, globalParameters, pushWorkingPath, popWorkingPath, assignParameterWithDefault, startTime, ProgressBar, printWarning
+from .Common import print1, print2, HR, printExit, defaultAnalysisParameters, globalParameters, pushWorkingPath, popWorkingPath, assignParameterWithDefault, startTime, ProgressBar, printWarning, CPUThreadCount, ParallelMap
 from .SolutionStructs import Solution
 from . import YAMLIO
+from . import SolutionSelection
 from . import SolutionSelectionLibrary
+from . import BenchmarkCSV
+from . import BenchmarkStore
+from . import Utils
 
 from copy import deepcopy
 from sys import stdout
@@ -31,6 +35,11 @@ import csv
 import os
 import time
 
+try:
+  import numpy
+except ImportError:
+  numpy = None
+
 ################################################################################
 # Analyze Problem Type
 ################################################################################
@@ -69,21 +78,29 @@ def analyzeProblemType( problemType, problemSizeGroups, inputParameters ):
 
   ######################################
   # Create Logic Analyzer
-  logicAnalyzer = LogicAnalyzer( problemType, problemSizesList, solutionsList, \
-      dataFileNameList, inputParameters)
+  if numpy is not None and globalParameters["NumPyLogicAnalysis"]:
+    analyzerClass = NumPyLogicAnalyzer
+  else:
+    analyzerClass = LogicAnalyzer
+  resultStoreFileName = None
+  if BenchmarkStore.available() and globalParameters["BenchmarkResultStore"]:
+    resultStoreFileName = BenchmarkStore.storeFileName(os.path.dirname(dataFileNameList[0]), problemType)
+  logicAnalyzer = analyzerClass( problemType, problemSizesList, solutionsList, \
+      dataFileNameList, inputParameters, resultStoreFileName)
 
   ######################################
   # Remove invalid solutions
   logicAnalyzer.removeInvalidSolutions()
 
   ######################################
-  # Remove least important solutions
-  if globalParameters["SolutionSelectionAlg"] == 0:
-    logicAnalyzer.removeLeastImportantSolutions()
-  elif globalParameters["SolutionSelectionAlg"] == 1:
-    logicAnalyzer.keepWinnerSolutions()
-  else:
-    printExit("Bad KeepLogic=%u"%globalParameters["KeepLogic"])
+  # Select the solutions to keep
+  if inputParameters.get("SizeWeightsFile") is not None:
+    logicAnalyzer.weightProblems(SolutionSelection.readSizeWeights(inputParameters["SizeWeightsFile"]))
+  selector = SolutionSelection.getSelector(globalParameters["SolutionSelectionAlg"], logicAnalyzer)
+  if globalParameters["SolutionSelectionReport"]:
+    SolutionSelection.report(logicAnalyzer)
+  selector.apply()
+  logicAnalyzer.printTimeSaved()
 
   # print raw data
   if globalParameters["PrintLevel"] >= 2:
@@ -181,7 +198,7 @@ def analyzeProblemType( problemType, problemSizeGroups, inputParameters ):
 
   ######################################
   # Range Logic
-  rangeLogic = logicAnalyzer.enRule(0, logicAnalyzer.globalIndexRange)
+  rangeLogic = logicAnalyzer.parallelEnRule(logicAnalyzer.globalIndexRange)
   print2("# Final Range Logic:")
   print2(rangeLogic)
   logicComplexity = [0]*logicAnalyzer.numIndices
@@ -221,7 +238,7 @@ class LogicAnalyzer:
   # ENTRY: Init
   ##############################################################################
   def __init__(self, problemType, problemSizesList, solutionsList, \
-      dataFileNameList, inputParameters):
+      dataFileNameList, inputParameters, resultStoreFileName=None):
 
     # parameters
     self.parameters = inputParameters
@@ -342,11 +359,17 @@ class LogicAnalyzer:
     print2("TotalSize: %u" % self.totalSize)
     # data is a 2D array [problemIdx][solutionIdx] which stores perf data in gflops for
     # the specified solution
-    self.data = array.array('f', [-2]*self.totalSize)
+    self.data = self.newData(self.totalSize, -2)
+    self.resetActiveSolutions()
 
     # Each entry in exactWinners is a 2D array [solutionIdx, perf]
     self.exactWinners = {}
 
+    # how often each range problem (in serial order) and exact size is used,
+    # set by weightProblems; None weighs every problem equally
+    self.problemWeights = None
+    self.exactWeights = None
+
     """
     # map problem sizes -> index
     self.problemSizeToIndex = []
@@ -384,13 +407,17 @@ class LogicAnalyzer:
     self.problemIndicesForGlobalRange \
         = self.problemIndicesForRange(self.globalIndexRange)
     self.tab = [""]*self.numIndices
+    # rules built ahead of enRule by parallelEnRule, keyed by enRuleKey
+    self.enRuleCache = {}
 
     ######################################
-    # Read Data From CSV
-    for fileIdx in range(0, len(dataFileNameList)):
-      dataFileName = dataFileNameList[fileIdx]
-      self.addFromCSV(dataFileName, self.numSolutionsPerGroup[fileIdx], \
-          self.solutionGroupMap[fileIdx])
+    # Read Data From the result store, or from CSV
+    if not self.readResultStore(resultStoreFileName, dataFileNameList):
+      for fileIdx in range(0, len(dataFileNameList)):
+        dataFileName = dataFileNameList[fileIdx]
+        self.addFromCSV(dataFileName, self.numSolutionsPerGroup[fileIdx], \
+            self.solutionGroupMap[fileIdx])
+      self.writeResultStore(resultStoreFileName, dataFileNameList)
 
 
 
@@ -399,6 +426,38 @@ class LogicAnalyzer:
     print1("# ExactWinners: %s" % self.exactWinners)
 
 
+  ##############################################################################
+  # Result Store: the data and exact winners read from the CSVs, kept in a
+  # memory-mapped BenchmarkStore file
+  ##############################################################################
+  def resultStoreKey(self, dataFileNameList):
+    if getattr(self, "solutionFingerprints", None) is None:
+      self.solutionFingerprints = [Utils.fingerprint(s) for s in self.solutions]
+    return BenchmarkStore.storeKey(dataFileNameList, self.solutionFingerprints, \
+        self.problemIndexToSize, self.exactProblemSizes)
+
+  def readResultStore(self, resultStoreFileName, dataFileNameList):
+    if resultStoreFileName is None:
+      return False
+    store = BenchmarkStore.BenchmarkResultStore.read(resultStoreFileName, \
+        self.resultStoreKey(dataFileNameList))
+    if store is None:
+      return False
+    print1("# Read benchmark results from %s" % resultStoreFileName)
+    self.data = self.storedData(store.data)
+    self.exactWinners = store.exactWinners()
+    return True
+
+  def writeResultStore(self, resultStoreFileName, dataFileNameList):
+    if resultStoreFileName is None:
+      return
+    BenchmarkStore.BenchmarkResultStore.write(resultStoreFileName, self.resultStoreKey(dataFileNameList), \
+        self.solutionFingerprints, self.problemIndexToSize, self.exactWinners, self.data, self.flopsPerMac)
+
+  def storedData(self, data):
+    return array.array('f', data.astype("<f4").tobytes())
+
+
   ##############################################################################
   # ENTRY: Add From CSV
   ##############################################################################
@@ -481,23 +540,33 @@ class LogicAnalyzer:
   # ENTRY: Remove Invalid Solutions
   ##############################################################################
   def removeInvalidSolutions(self):
-    #problemIndices = [0]*self.numIndices
     allSolutionValid = False
     while not allSolutionValid:
-      invalidIdx = -1
-      for problemIndices in self.problemIndicesForGlobalRange:
-        problemSerial = self.indicesToSerial(0, problemIndices)
-        for solutionIdx in range(0, self.numSolutions):
-          gflops = self.data[problemSerial+solutionIdx]
-          if gflops == 0:
-            invalidIdx = solutionIdx
-            break
+      invalidIdx = self.invalidSolution()
       if invalidIdx >= 0:
         print1("# Removing Invalid Solution: %u %s" \
-            % (invalidIdx, self.solutionNames[invalidIdx]) )
-        self.removeSolution(invalidIdx)
+            % (self.activeIndex(invalidIdx), self.solutionNames[invalidIdx]) )
+        self.deactivateSolution(invalidIdx)
       else:
         allSolutionValid = True
+    self.compactSolutions()
+
+
+  ##############################################################################
+  # Invalid Solution: a solution which failed (0 gflops) for the last problem
+  # with any failure, -1 if there is none
+  ##############################################################################
+  def invalidSolution(self):
+    invalidIdx = -1
+    activeSolutions = self.activeSolutionIndices()
+    for problemIndices in self.problemIndicesForGlobalRange:
+      problemSerial = self.indicesToSerial(0, problemIndices)
+      for solutionIdx in activeSolutions:
+        gflops = self.data[problemSerial+solutionIdx]
+        if gflops == 0:
+          invalidIdx = solutionIdx
+          break
+    return invalidIdx
 
 
   ##############################################################################
@@ -510,8 +579,19 @@ class LogicAnalyzer:
   def removeLeastImportantSolutions(self):
     # Remove least important solutions
     start = time.time()
-    while len(self.solutions) > 1:
-      lisTuple = self.leastImportantSolution()
+    self.deactivateLeastImportantSolutions()
+    self.compactSolutions()
+    stop = time.time()
+    print("removeLeastImportantSolutions elapsed time = %.1f secs" % (stop - start))
+
+  ##############################################################################
+  # Deactivate Least Important Solutions: the removals of
+  # removeLeastImportantSolutions, leaving the solutions it keeps active
+  ##############################################################################
+  def deactivateLeastImportantSolutions(self):
+    self.rankProblems()
+    while self.numActiveSolutions > 1:
+      lisTuple = self.leastImportantActiveSolution()
       if lisTuple != None:
         lisIdx = lisTuple[0]
         lisPercSaved = lisTuple[1]
@@ -519,15 +599,13 @@ class LogicAnalyzer:
         lisPercTime = lisTuple[3]
         if lisPercSaved < self.parameters["SolutionImportanceMin"] or lisPercWins == 0:
           print1("# Removing Unimportant Solution %u/%u: %s ( %f%% wins, %f%% ms time, %f%% ms saved" \
-              % (lisIdx, self.numSolutions, self.solutionNames[lisIdx], 100*lisPercWins, 100*lisPercTime, 100*lisPercSaved) )
-          self.removeSolution(lisIdx)
+              % (self.activeIndex(lisIdx), self.numActiveSolutions, self.solutionNames[lisIdx], 100*lisPercWins, 100*lisPercTime, 100*lisPercSaved) )
+          self.deactivateSolution(lisIdx)
           continue
         else:
           break
       else: # no more lis, remainders are exact winner
         break
-    stop = time.time()
-    print("removeLeastImportantSolutions elapsed time = %.1f secs" % (stop - start))
 
 
   ##############################################################################
@@ -537,20 +615,23 @@ class LogicAnalyzer:
   def keepWinnerSolutions(self):
 
     # solution indexes for the winners:
-    winners = set()
-
-    solutionImportance = []
-    for i in range(0, self.numSolutions):
-      solutionImportance.append([i, 0, 0, 0, False])
-    problemSizes = [0]*self.numIndices
     print("problemIndicesForGlobalRange", self.problemIndicesForGlobalRange)
-    for problemIndices in self.problemIndicesForGlobalRange:
-      for i in range(0, self.numIndices):
-        problemSizes[i] = self.problemIndexToSize[i][problemIndices[i]]
-      totalFlops = self.flopsPerMac
-      for size in problemSizes:
-        totalFlops *= size
+    winners = self.rangeWinners()
 
+    # Always keep the exact sizes:
+    winners |= self.requiredExactWinners()
+
+    print("Winners", winners)
+    self.pruneSolutions(winners)
+
+
+
+  ##############################################################################
+  # Range Winners: set of solutions which are fastest for any range problem
+  ##############################################################################
+  def rangeWinners(self):
+    winners = set()
+    for problemIndices in self.problemIndicesForGlobalRange:
       problemSerial = self.indicesToSerial(0, problemIndices)
       winnerIdx = -1
       winnerGFlops = -1e6
@@ -562,16 +643,7 @@ class LogicAnalyzer:
           winnerGFlops = solutionGFlops
 
       winners.add(winnerIdx)
-
-    # Always keep the exact sizes:
-    for exactProblem in self.exactWinners:
-      winnerIdx = self.exactWinners[exactProblem][0]
-      #print "keepWinnerSolution adding exact", exactProblem, winnerIdx
-      winners.add(winnerIdx)
-
-    print("Winners", winners)
-    self.pruneSolutions(winners)
-
+    return winners
 
 
   ##############################################################################
@@ -597,6 +669,9 @@ class LogicAnalyzer:
   #
   ##############################################################################
   def enRule(self, currentIndexIndex, currentIndexRange):
+    ruleKey = self.enRuleKey(currentIndexIndex, currentIndexRange)
+    if ruleKey in self.enRuleCache:
+      return deepcopy(self.enRuleCache[ruleKey])
     cii = currentIndexIndex
     if currentIndexIndex == 0:
       self.tab[cii] = "[] "
@@ -819,6 +894,61 @@ class LogicAnalyzer:
 
 
 
+  ##############################################################################
+  # Parallel EnRule
+  # enRule(0, currentIndexRange), where the rules for the values of the outer
+  # indices are built in CpuThreads processes first.  Each of those rules only
+  # depends on the data and its sub-range, so the logic is identical to
+  # building it serially.
+  ##############################################################################
+  def parallelEnRule(self, currentIndexRange):
+    threadCount = CPUThreadCount(globalParameters["ParallelRangeLogic"])
+    (indexIndex, subRanges) = self.enRuleSubRanges(currentIndexRange, 4*threadCount)
+    if threadCount <= 1 or len(subRanges) <= 1:
+      return self.enRule(0, currentIndexRange)
+
+    print1("# Building range logic for %u sub-ranges in %u processes" % (len(subRanges), threadCount))
+    chunks = [(indexIndex, subRanges[i::threadCount]) for i in range(0, threadCount)]
+    self.enRuleCache = {}
+    try:
+      for rules in ParallelMap(self.enRuleForSubRanges, chunks, "Building range logic"):
+        self.enRuleCache.update(rules)
+      return self.enRule(0, currentIndexRange)
+    finally:
+      self.enRuleCache = {}
+
+  def enRuleKey(self, currentIndexIndex, currentIndexRange):
+    return (currentIndexIndex, tuple([tuple(r) for r in currentIndexRange]))
+
+  ##############################################################################
+  # EnRule Sub-Ranges
+  # split currentIndexRange into the ranges enRule recurses into, one outer
+  # index at a time, until there are at least minCount of them or only the
+  # last index is left
+  ##############################################################################
+  def enRuleSubRanges(self, currentIndexRange, minCount):
+    indexIndex = 0
+    subRanges = [deepcopy(currentIndexRange)]
+    while len(subRanges) < minCount and indexIndex < self.numIndices-1:
+      index = self.indexOrder[indexIndex]
+      nextSubRanges = []
+      for subRange in subRanges:
+        for problemIndex in range(subRange[index][0], subRange[index][1]):
+          nextSubRange = deepcopy(subRange)
+          nextSubRange[index] = [problemIndex, problemIndex+1]
+          nextSubRanges.append(nextSubRange)
+      subRanges = nextSubRanges
+      indexIndex += 1
+    return (indexIndex, subRanges)
+
+  def enRuleForSubRanges(self, chunk):
+    (indexIndex, subRanges) = chunk
+    rules = {}
+    for subRange in subRanges:
+      rules[self.enRuleKey(indexIndex, subRange)] = self.enRule(indexIndex, subRange)
+    return rules
+
+
   ##############################################################################
   ##############################################################################
   ###
@@ -953,21 +1083,65 @@ class LogicAnalyzer:
   # Least Important Solution
   ##############################################################################
   def leastImportantSolution(self):
+    return self.leastImportant(*self.solutionImportance())
+
+  def leastImportantActiveSolution(self):
+    return self.leastImportant(*self.activeSolutionImportance())
+
+  def leastImportant(self, solutionImportance, totalSavedMs, totalExecMs, totalWins):
+    # print data before sorting
+    for i in range(0, len(solutionImportance)):
+      print2("[%2u] %s: %e saved, %u wins, %u time, %s" \
+          % (solutionImportance[i][0], \
+          self.solutionNames[solutionImportance[i][0]], \
+          solutionImportance[i][1], \
+          solutionImportance[i][2], \
+          solutionImportance[i][3], \
+          "singular" if solutionImportance[i][4] else "" ) )
+
+    totalSavedMs = max(1, totalSavedMs)
+    solutionImportance.sort(key=lambda x: x[1])
+    requiredExactWinners = self.requiredExactWinners()
+    for i in range(0, len(solutionImportance)):
+      solutionIdx = solutionImportance[i][0]
+      canRemove = not solutionImportance[i][4] # don't remove if is only win for any size
+      if solutionIdx in requiredExactWinners: # exact winners are important
+        canRemove = False
+      if canRemove:
+        idx = solutionImportance[i][0]
+        if totalSavedMs > 0:
+          percSaved = 1.0 * solutionImportance[i][1] / totalSavedMs
+        else:
+          percSaved = 0
+        if totalWins > 0:
+          percWins = 1.0 * solutionImportance[i][2] / totalWins
+        else:
+          percWins = 0
+        if totalExecMs > 0:
+          percTime = 1.0 * solutionImportance[i][3] / totalExecMs
+        else:
+          percTime = 0
+        return ( idx, percSaved, percWins, percTime )
+    return None
+
+
+  ##############################################################################
+  # Solution Importance
+  # [solutionIdx, ms saved over the second fastest, wins, ms, only valid
+  # solution for some problem] for each solution, and the totals over all
+  # range problems
+  ##############################################################################
+  def solutionImportance(self):
     solutionImportance = []
     for i in range(0, self.numSolutions):
       solutionImportance.append([i, 0, 0, 0, False])
-    problemSizes = [0]*self.numIndices
+    problemFlops = self.problemFlops()
     totalSavedMs = 0
     totalExecMs = 0
     totalWins = 0
     for problemIndices in self.problemIndicesForGlobalRange:
-      for i in range(0, self.numIndices):
-        problemSizes[i] = self.problemIndexToSize[i][problemIndices[i]]
-      totalFlops = self.flopsPerMac
-      for size in problemSizes:
-        totalFlops *= size
-
       problemSerial = self.indicesToSerial(0, problemIndices)
+      totalFlops = problemFlops[problemSerial // self.numSolutions]
       winnerIdx = -1
       winnerGFlops = -1e6
       secondGFlops = -1e9
@@ -994,43 +1168,218 @@ class LogicAnalyzer:
         if secondGFlops <= 0:
           solutionImportance[winnerIdx][4] = True # this is only valid solution for this problem size, keep it
 
+    return (solutionImportance, totalSavedMs, totalExecMs, totalWins)
 
-    # print data before sorting
-    for i in range(0, self.numSolutions):
-      print2("[%2u] %s: %e saved, %u wins, %u time, %s" \
-          % (solutionImportance[i][0], \
-          self.solutionNames[solutionImportance[i][0]], \
-          solutionImportance[i][1], \
-          solutionImportance[i][2], \
-          solutionImportance[i][3], \
-          "singular" if solutionImportance[i][4] else "" ) )
 
-    totalSavedMs = max(1, totalSavedMs)
-    solutionImportance.sort(key=lambda x: x[1])
-    for i in range(0, self.numSolutions):
-      solutionIdx = solutionImportance[i][0]
-      canRemove = not solutionImportance[i][4] # don't remove if is only win for any size
-      for exactProblem in self.exactWinners:
-        winnerIdx = self.exactWinners[exactProblem][0]
-        if solutionIdx == winnerIdx: # exact winners are important
-          canRemove = False
-          break
-      if canRemove:
-        idx = solutionImportance[i][0]
-        if totalSavedMs > 0:
-          percSaved = 1.0 * solutionImportance[i][1] / totalSavedMs
-        else:
-          percSaved = 0
-        if totalWins > 0:
-          percWins = 1.0 * solutionImportance[i][2] / totalWins
-        else:
-          percWins = 0
-        if totalExecMs > 0:
-          percTime = 1.0 * solutionImportance[i][3] / totalExecMs
-        else:
-          percTime = 0
-        return ( idx, percSaved, percWins, percTime )
-    return None
+  ##############################################################################
+  # Active Solutions
+  # Removals only mark solutions inactive, leaving the data in place, and
+  # compactSolutions drops all of them at once.  While removing unimportant
+  # solutions, the fastest and second fastest active solution of each problem
+  # are kept in problemWinners/problemSeconds, so a removal only re-ranks the
+  # problems it won or came second in.
+  ##############################################################################
+  def resetActiveSolutions(self):
+    self.solutionActive = [True]*self.numSolutions
+    self.numActiveSolutions = self.numSolutions
+    self.problemWinners = None
+
+  def activeSolutionIndices(self):
+    return [i for i in range(0, self.numSolutions) if self.solutionActive[i]]
+
+  def activeIndex(self, solutionIdx):
+    # index of solutionIdx once inactive solutions are compacted away
+    return sum(self.solutionActive[:solutionIdx])
+
+  def deactivateSolution(self, solutionIdx):
+    self.solutionActive[solutionIdx] = False
+    self.numActiveSolutions -= 1
+
+    # exact winners which were removed fall back to the preceding solution,
+    # as they would with removeSolution, unless the exact size isn't used
+    if self.exactWeights is not None:
+      self.dropExactWinners(set([solutionIdx]))
+    predecessorIdx = solutionIdx - 1
+    while predecessorIdx >= 0 and not self.solutionActive[predecessorIdx]:
+      predecessorIdx -= 1
+    for problemSize in self.exactWinners:
+      if self.exactWinners[problemSize][0] == solutionIdx:
+        self.exactWinners[problemSize][0] = predecessorIdx
+
+    if self.problemWinners is not None:
+      self.rankProblems(self.problemsRankedBy(solutionIdx))
+
+  def compactSolutions(self):
+    if self.numActiveSolutions < self.numSolutions:
+      self.pruneSolutions(set(self.activeSolutionIndices()))
+    self.resetActiveSolutions()
+
+
+  ##############################################################################
+  # Rank Problems: find the winner and second of each of problems (all if
+  # None) among the active solutions, as solutionImportance does
+  ##############################################################################
+  def rankProblems(self, problems=None):
+    if problems is None or self.problemWinners is None:
+      problems = range(0, self.totalProblems)
+      self.problemWinners = [-1]*self.totalProblems
+      self.problemWinnerGFlops = [-1e6]*self.totalProblems
+      self.problemSeconds = [-1]*self.totalProblems
+      self.problemSecondGFlops = [-1e9]*self.totalProblems
+
+    activeSolutions = self.activeSolutionIndices()
+    for problemIdx in problems:
+      problemSerial = problemIdx * self.numSolutions
+      winnerIdx = -1
+      winnerGFlops = -1e6
+      secondIdx = -1
+      secondGFlops = -1e9
+      for solutionIdx in activeSolutions:
+        solutionGFlops = self.data[problemSerial + solutionIdx]
+        if solutionGFlops > winnerGFlops:
+          secondIdx = winnerIdx
+          secondGFlops = winnerGFlops
+          winnerIdx = solutionIdx
+          winnerGFlops = solutionGFlops
+        elif solutionGFlops > secondGFlops:
+          secondIdx = solutionIdx
+          secondGFlops = solutionGFlops
+      self.problemWinners[problemIdx] = winnerIdx
+      self.problemWinnerGFlops[problemIdx] = winnerGFlops
+      self.problemSeconds[problemIdx] = secondIdx
+      self.problemSecondGFlops[problemIdx] = secondGFlops
+
+  def problemsRankedBy(self, solutionIdx):
+    return [problemIdx for problemIdx in range(0, self.totalProblems) \
+        if self.problemWinners[problemIdx] == solutionIdx or self.problemSeconds[problemIdx] == solutionIdx]
+
+
+  ##############################################################################
+  # Active Solution Importance: solutionImportance over the active solutions,
+  # from the ranked problems
+  ##############################################################################
+  def activeSolutionImportance(self):
+    if self.problemWinners is None:
+      self.rankProblems()
+
+    solutionImportance = []
+    importanceIdx = {}
+    for solutionIdx in self.activeSolutionIndices():
+      importanceIdx[solutionIdx] = len(solutionImportance)
+      solutionImportance.append([solutionIdx, 0, 0, 0, False])
+    problemFlops = self.problemFlops()
+    totalSavedMs = 0
+    totalExecMs = 0
+    totalWins = 0
+    for problemIdx in range(0, self.totalProblems):
+      totalFlops = problemFlops[problemIdx]
+      winnerGFlops = self.problemWinnerGFlops[problemIdx]
+      secondGFlops = self.problemSecondGFlops[problemIdx]
+      winnerTimeMs = totalFlops / winnerGFlops / 1000000.0
+      secondTimeMs = totalFlops / secondGFlops / 1000000.0
+      importance = solutionImportance[importanceIdx[self.problemWinners[problemIdx]]] \
+          if winnerGFlops > 0 else None
+      if winnerGFlops > 0 and secondGFlops > 0:
+        importance[1] += (secondTimeMs - winnerTimeMs)
+        totalSavedMs += secondTimeMs - winnerTimeMs
+      if winnerGFlops > 0:
+        importance[2] += 1
+        importance[3] += winnerTimeMs
+        totalExecMs += winnerTimeMs
+        totalWins += 1
+        if secondGFlops <= 0:
+          importance[4] = True # this is only valid solution for this problem size, keep it
+
+    return (solutionImportance, totalSavedMs, totalExecMs, totalWins)
+
+
+  ##############################################################################
+  # Problem Flops: total flops of each problem, in serial order
+  ##############################################################################
+  def problemFlops(self):
+    if getattr(self, "problemFlopsList", None) is None:
+      flops = [self.flopsPerMac]
+      for i in range(0, self.numIndices):
+        flops = [f * size for size in self.problemIndexToSize[i] for f in flops]
+      if self.problemWeights is not None:
+        flops = [f * w for (f, w) in zip(flops, self.problemWeights)]
+      self.problemFlopsList = flops
+    return self.problemFlopsList
+
+
+  ##############################################################################
+  # Weight Problems: weigh the time of each problem by how often its size is
+  # used, from a dict of size tuple -> calls (see SolutionSelection.
+  # readSizeWeights), so that solution importance and range scores are in
+  # production time.  A used size counts for the exact size it matches or,
+  # if it's shorter (e.g. without leading dimensions), is spread evenly over
+  # the exact sizes it begins, and otherwise for the range problem with the
+  # nearest size along each index; range problems no used size maps to keep
+  # UntracedSizeWeight, so that range logic still picks the fastest solution
+  # for them.  Exact sizes which aren't used don't keep their winner.
+  ##############################################################################
+  def weightProblems(self, sizeWeights):
+    untracedWeight = self.parameters.get("UntracedSizeWeight", 0)
+    weights = [0]*self.totalProblems
+    exactWeights = dict([(size, 0) for size in self.exactProblemSizes])
+    for size in sorted(sizeWeights):
+      if tuple(size) in exactWeights:
+        exactWeights[tuple(size)] += sizeWeights[size]
+        continue
+      exactSizes = [exact for exact in exactWeights if exact[:len(size)] == tuple(size)]
+      if len(exactSizes) > 0:
+        for exact in exactSizes:
+          exactWeights[exact] += sizeWeights[size] / float(len(exactSizes))
+        continue
+      problemIndices = []
+      for i in range(0, self.numIndices):
+        problemIndices.append(SolutionSelection.nearestIndex(self.problemIndexToSize[i], size[i]) \
+            if i < len(size) else 0)
+      weights[self.indicesToSerial(0, problemIndices) // self.numSolutions] += sizeWeights[size]
+    self.problemWeights = [w if w > 0 else untracedWeight for w in weights]
+    self.exactWeights = exactWeights
+    self.problemFlopsList = None
+    self.problemFlopsCube = None
+    print1("# Weighted %u range problems and %u exact sizes by %u used sizes" \
+        % (len([w for w in weights if w > 0]), len([w for w in exactWeights.values() if w > 0]), \
+        len(sizeWeights)))
+
+  ##############################################################################
+  # Print Time Saved: time each solution saves over the next fastest kept
+  # solution on the range problems it wins, in production time (ms over all
+  # calls of the used sizes) when the problems are weighted
+  ##############################################################################
+  def printTimeSaved(self):
+    (solutionImportance, totalSavedMs, totalExecMs, totalWins) = self.solutionImportance()
+    print1("# %s time saved per kept solution:" % ("Production" if self.problemWeights is not None else "Benchmark"))
+    print1("# %4s %6s %14s %8s %14s  %s" % ("", "wins", "saved ms", "saved %", "exec ms", "solution"))
+    for (solutionIdx, savedMs, wins, execMs, singular) in solutionImportance:
+      print1("# %4u %6u %14.3f %7.2f%% %14.3f  %s%s" % (solutionIdx, wins, savedMs, \
+          100.0 * savedMs / totalSavedMs if totalSavedMs > 0 else 0, execMs, \
+          self.solutionNames[solutionIdx], " (only valid solution)" if singular else ""))
+    print1("# %4s %6u %14.3f %8s %14.3f" % ("all", totalWins, totalSavedMs, "", totalExecMs))
+
+  ##############################################################################
+  # Required Exact Winners: solutions which must be kept because they win an
+  # exact size which is used
+  ##############################################################################
+  def requiredExactWinners(self):
+    required = set()
+    for exactProblem in self.exactWinners:
+      if self.exactWeights is None or self.exactWeights.get(exactProblem, 0) > 0:
+        required.add(self.exactWinners[exactProblem][0])
+    return required
+
+  ##############################################################################
+  # Drop Exact Winners: leave the exact sizes won by solutions which are
+  # removed to the range logic.  Only unused exact sizes lose their winner.
+  ##############################################################################
+  def dropExactWinners(self, solutionIndices):
+    for exactProblem in sorted(self.exactWinners):
+      if self.exactWinners[exactProblem][0] in solutionIndices \
+          and self.exactWeights.get(exactProblem, 0) == 0:
+        print1("# Leaving unused exact size %s to the range logic" % (list(exactProblem),))
+        del self.exactWinners[exactProblem]
 
 
   ##############################################################################
@@ -1041,12 +1390,14 @@ class LogicAnalyzer:
     # temporarily move current to old
     oldSolutions = deepcopy(self.solutions)
     oldNumSolutions = self.numSolutions
-    oldData = deepcopy(self.data)
+    oldData = self.data
 
     # update solutions
     self.solutions = []
+    solutionMapNewToOld = []
     for i in range(0, oldNumSolutions):
       if i != removeSolutionIdx:
+        solutionMapNewToOld.append(i)
         self.solutions.append(oldSolutions[i])
     self.solutionMinNaming = Solution.getMinNaming(self.solutions)
     self.solutionNames = []
@@ -1060,14 +1411,8 @@ class LogicAnalyzer:
 
     # update data
     self.totalSize = self.totalProblems * self.numSolutions
-    self.data = array.array('f', [0]*self.totalSize)
-    for problemIndex in range(0, self.totalProblems):
-      newSolutionIdx = 0
-      for oldSolutionIdx in range(0, oldNumSolutions):
-        if oldSolutionIdx != removeSolutionIdx:
-          self.data[problemIndex*self.numSolutions+newSolutionIdx] \
-              = oldData[problemIndex*oldNumSolutions+oldSolutionIdx]
-          newSolutionIdx += 1
+    self.data = self.selectData(oldData, oldNumSolutions, solutionMapNewToOld)
+    self.resetActiveSolutions()
 
     # update exact Winners
     for problemSize in self.exactWinners:
@@ -1084,11 +1429,13 @@ class LogicAnalyzer:
     removeSolutionIdxList = []
     solutionMapNewToOld = [] # dense mapping
     solutionMapOldToNew = [-1] * self.numSolutions
+    if self.exactWeights is not None:
+      self.dropExactWinners(set(range(0, self.numSolutions)) - set(keepSolutions))
 
     # temporarily move current to old
     oldSolutions = deepcopy(self.solutions)
     oldNumSolutions = self.numSolutions
-    oldData = deepcopy(self.data)
+    oldData = self.data
     # update solutions
     self.solutions = []
     for i in range(0, oldNumSolutions):
@@ -1111,26 +1458,45 @@ class LogicAnalyzer:
 
     # update data
     self.totalSize = self.totalProblems * self.numSolutions
-    self.data = array.array('f', [0]*self.totalSize)
-    for problemIndex in range(0, self.totalProblems):
-      for newSolutionIdx in range(0, self.numSolutions):
-        oldSolutionIdx = solutionMapNewToOld[newSolutionIdx]
-        self.data[problemIndex*self.numSolutions+newSolutionIdx] \
-            = oldData[problemIndex*oldNumSolutions+oldSolutionIdx]
+    self.data = self.selectData(oldData, oldNumSolutions, solutionMapNewToOld)
+    self.resetActiveSolutions()
 
     # update exact Winners
     for problemSize in self.exactWinners:
       #print "prune updating exacWinner", problemSize, \
       #        "from ", self.exactWinners[problemSize][0], \
       #        "to ", solutionMapOldToNew[self.exactWinners[problemSize][0]]
-      self.exactWinners[problemSize][0] = \
-          solutionMapOldToNew[self.exactWinners[problemSize][0]]
+      if self.exactWinners[problemSize][0] >= 0:
+        self.exactWinners[problemSize][0] = \
+            solutionMapOldToNew[self.exactWinners[problemSize][0]]
       if self.exactWinners[problemSize][0] == -1:
         print(("warning: exactWinner[", problemSize, "] == -1"))
       if self.exactWinners[problemSize][0] >= self.numSolutions:
         print(("warning: exactWinner[", problemSize, "] "))
 
 
+  ##############################################################################
+  # New Data: array of size gflops entries, all set to value
+  ##############################################################################
+  def newData(self, size, value):
+    return array.array('f', [value]*size)
+
+
+  ##############################################################################
+  # Select Data: the columns of oldData for the solutions in
+  # solutionMapNewToOld, in that order
+  ##############################################################################
+  def selectData(self, oldData, oldNumSolutions, solutionMapNewToOld):
+    numSolutions = len(solutionMapNewToOld)
+    data = self.newData(self.totalProblems * numSolutions, 0)
+    for problemIndex in range(0, self.totalProblems):
+      for newSolutionIdx in range(0, numSolutions):
+        oldSolutionIdx = solutionMapNewToOld[newSolutionIdx]
+        data[problemIndex*numSolutions+newSolutionIdx] \
+            = oldData[problemIndex*oldNumSolutions+oldSolutionIdx]
+    return data
+
+
   ##############################################################################
   # Score Range For Logic
   ##############################################################################
@@ -1284,6 +1650,8 @@ class LogicAnalyzer:
     totalFlops = self.flopsPerMac
     for i in range(0, self.numIndices):
       totalFlops *= self.problemIndexToSize[i][problemIndices[i]]
+    if self.problemWeights is not None:
+      totalFlops *= self.problemWeights[self.indicesToSerial(0, problemIndices) // self.numSolutions]
     return totalFlops
 
 
@@ -1379,6 +1747,311 @@ class LogicAnalyzer:
 
 
 
+################################################################################
+# NumPy LogicAnalyzer
+# Keeps the data in a NumPy array with the same serial layout as
+# LogicAnalyzer, so it can be viewed as a data cube
+# [solutionIdx, index0, index1, ...] or a matrix [problemSerial, solutionIdx],
+# and replaces the per-problem loops with array reductions.  Sums are taken
+# in problem order, so scores and importance match LogicAnalyzer exactly.
+################################################################################
+class NumPyLogicAnalyzer(LogicAnalyzer):
+
+  ##############################################################################
+  # Data
+  def newData(self, size, value):
+    return numpy.full(size, value, dtype=numpy.float32)
+
+  def selectData(self, oldData, oldNumSolutions, solutionMapNewToOld):
+    oldMatrix = oldData.reshape(self.totalProblems, oldNumSolutions)
+    return numpy.ascontiguousarray(oldMatrix[:, solutionMapNewToOld]).reshape(-1)
+
+  def matrix(self):
+    return self.data.reshape(self.totalProblems, self.numSolutions)
+
+  def cube(self):
+    return self.data.reshape([self.numSolutions] + self.numProblemSizes, order="F")
+
+  def storedData(self, data):
+    # the mapped store itself; removing solutions copies it
+    return data.reshape(-1)
+
+
+  ##############################################################################
+  # Add From CSV: as LogicAnalyzer.addFromCSV, reading the file in blocks of
+  # typed columns
+  def addFromCSV(self, dataFileName, numSolutions, solutionMap):
+    print("reading datafile", dataFileName)
+    try:
+      dataFile = open(dataFileName, "r")
+    except IOError:
+      printExit("Can't open \"%s\" to get data" % dataFileName )
+
+    problemSizeStartIdx = 1
+    totalSizeIdx = problemSizeStartIdx + self.numIndices
+    solutionStartIdx = totalSizeIdx + 1
+    rowLength = solutionStartIdx + numSolutions
+    solutionColumns = numpy.array([solutionMap[i] for i in range(0, numSolutions)], dtype=numpy.intp)
+
+    with dataFile:
+      for block in BenchmarkCSV.readBlocks(dataFile, dataFileName, rowLength):
+        problemSizes = [tuple(size) for size in block[:, problemSizeStartIdx:totalSizeIdx].astype(numpy.int64).tolist()]
+        gflops = block[:, solutionStartIdx:rowLength]
+
+        rangeRows = []
+        rangeSerials = []
+        for (rowIdx, problemSize) in enumerate(problemSizes):
+          # Exact Problem Size
+          if problemSize in self.exactProblemSizes:
+            winnerIdx = int(numpy.argmax(gflops[rowIdx])) if numSolutions > 0 else -1
+            if winnerIdx != -1 and gflops[rowIdx, winnerIdx] > -1:
+              winnerGFlops = float(gflops[rowIdx, winnerIdx])
+              if problemSize not in self.exactWinners or winnerGFlops > self.exactWinners[problemSize][1]:
+                self.exactWinners[problemSize] = [solutionMap[winnerIdx], winnerGFlops]
+
+          # Range Problem Size
+          elif problemSize in self.rangeProblemSizes:
+            problemIndices = [self.problemSizeToIndex[i][problemSize[i]] for i in range(0, self.numIndices)]
+            rangeRows.append(rowIdx)
+            rangeSerials.append(self.indicesToSerial(0, problemIndices))
+
+          # Unknown Problem Size
+          else:
+            printExit("Huh? %s has ProblemSize %s which isn't in its yaml" \
+                % ( dataFileName, list(problemSize)) )
+
+        if len(rangeRows) > 0:
+          serials = numpy.array(rangeSerials, dtype=numpy.intp)
+          self.data[serials[:, None] + solutionColumns[None, :]] = gflops[rangeRows]
+
+
+  ##############################################################################
+  # Flops of each problem, as a cube [index0, index1, ...]
+  def flopsCube(self):
+    if getattr(self, "problemFlopsCube", None) is None:
+      # exact integer products, rounded once like totalFlopsForProblemIndices
+      self.problemFlopsCube = numpy.array([float(f) for f in self.problemFlops()], dtype=numpy.float64) \
+          .reshape(self.numProblemSizes, order="F")
+    return self.problemFlopsCube
+
+
+  ##############################################################################
+  # Range helpers
+  def rangeSlices(self, indexRange):
+    return tuple([slice(indexRange[i][0], indexRange[i][1]) for i in range(0, self.numIndices)])
+
+  def rangeIsEmpty(self, indexRange):
+    return any([indexRange[i][0] == indexRange[i][1] for i in range(0, self.numIndices)])
+
+  @staticmethod
+  def sequentialSum(values, axis=-1):
+    # cumsum adds in order, matching the loops of LogicAnalyzer bit for bit
+    if values.shape[axis] == 0:
+      return numpy.zeros(numpy.delete(values.shape, axis))
+    return numpy.take(numpy.cumsum(values, axis=axis), -1, axis=axis)
+
+
+  ##############################################################################
+  # Problem Indices For Range
+  def problemIndicesForRange(self, indexRange):
+    if self.rangeIsEmpty(indexRange):
+      return []
+    shape = [indexRange[i][1] - indexRange[i][0] for i in range(0, self.numIndices)]
+    lows = numpy.array([indexRange[i][0] for i in range(0, self.numIndices)])
+    return (numpy.indices(shape).reshape(self.numIndices, -1, order="F").T + lows).tolist()
+
+
+  ##############################################################################
+  # Invalid Solution
+  def invalidSolution(self):
+    invalid = (self.matrix() == 0) & self.solutionActive
+    invalidProblems = numpy.flatnonzero(invalid.any(axis=1))
+    if len(invalidProblems) == 0:
+      return -1
+    return int(numpy.argmax(invalid[invalidProblems[-1]]))
+
+
+  ##############################################################################
+  # Range Winners
+  def rangeWinners(self):
+    if self.totalProblems == 0 or self.numSolutions == 0:
+      return set()
+    return set(numpy.argmax(self.matrix(), axis=1).tolist())
+
+
+  ##############################################################################
+  # Solution Importance
+  def solutionImportance(self):
+    data = self.matrix()
+    problems = numpy.arange(self.totalProblems)
+    if self.numSolutions > 0:
+      winners = numpy.argmax(data, axis=1)
+      winnerGFlops = data[problems, winners].astype(numpy.float64)
+    else:
+      winners = numpy.zeros(self.totalProblems, dtype=numpy.intp)
+      winnerGFlops = numpy.full(self.totalProblems, -1e6)
+    if self.numSolutions > 1:
+      others = data.copy()
+      others[problems, winners] = -numpy.inf
+      secondGFlops = others.max(axis=1).astype(numpy.float64)
+    else:
+      secondGFlops = numpy.full(self.totalProblems, -1e6)
+    return self.importanceFromRanks(winners, winnerGFlops, secondGFlops, range(0, self.numSolutions))
+
+  def activeSolutionImportance(self):
+    if self.problemWinners is None:
+      self.rankProblems()
+    return self.importanceFromRanks(self.problemWinners, self.problemWinnerGFlops, \
+        self.problemSecondGFlops, self.activeSolutionIndices())
+
+  def importanceFromRanks(self, winners, winnerGFlops, secondGFlops, solutionIndices):
+    flops = self.flopsCube().reshape(-1, order="F")
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+      winnerTimeMs = flops / winnerGFlops / 1000000.0
+      secondTimeMs = flops / secondGFlops / 1000000.0
+    won = winnerGFlops > 0
+    saved = won & (secondGFlops > 0)
+    savedMs = secondTimeMs[saved] - winnerTimeMs[saved]
+
+    numSolutions = self.numSolutions
+    solutionSavedMs = numpy.bincount(winners[saved], weights=savedMs, minlength=numSolutions)
+    solutionWins = numpy.bincount(winners[won], minlength=numSolutions)
+    solutionExecMs = numpy.bincount(winners[won], weights=winnerTimeMs[won], minlength=numSolutions)
+    solutionSingular = numpy.bincount(winners[won & (secondGFlops <= 0)], minlength=numSolutions) > 0
+
+    solutionImportance = []
+    for i in solutionIndices:
+      solutionImportance.append([i, float(solutionSavedMs[i]), int(solutionWins[i]), \
+          float(solutionExecMs[i]), bool(solutionSingular[i])])
+    totalSavedMs = float(self.sequentialSum(savedMs)) if len(savedMs) else 0
+    totalExecMs = float(self.sequentialSum(winnerTimeMs[won])) if won.any() else 0
+    totalWins = int(won.sum())
+    return (solutionImportance, totalSavedMs, totalExecMs, totalWins)
+
+
+  ##############################################################################
+  # Active Solutions
+  def resetActiveSolutions(self):
+    self.solutionActive = numpy.ones(self.numSolutions, dtype=bool)
+    self.numActiveSolutions = self.numSolutions
+    self.problemWinners = None
+
+  def activeSolutionIndices(self):
+    return numpy.flatnonzero(self.solutionActive).tolist()
+
+  def activeIndex(self, solutionIdx):
+    return int(self.solutionActive[:solutionIdx].sum())
+
+  def rankProblems(self, problems=None):
+    if problems is None or self.problemWinners is None:
+      problems = numpy.arange(self.totalProblems)
+      self.problemWinners = numpy.full(self.totalProblems, -1, dtype=numpy.intp)
+      self.problemWinnerGFlops = numpy.full(self.totalProblems, -1e6)
+      self.problemSeconds = numpy.full(self.totalProblems, -1, dtype=numpy.intp)
+      self.problemSecondGFlops = numpy.full(self.totalProblems, -1e9)
+    if len(problems) == 0:
+      return
+
+    # the first of equally fast solutions wins, as in LogicAnalyzer.rankProblems
+    rows = self.matrix()[problems].astype(numpy.float64)
+    rows[:, ~self.solutionActive] = -numpy.inf
+    rowIndices = numpy.arange(len(problems))
+    winners = numpy.argmax(rows, axis=1)
+    winnerGFlops = rows[rowIndices, winners]
+    rows[rowIndices, winners] = -numpy.inf
+    seconds = numpy.argmax(rows, axis=1)
+    secondGFlops = rows[rowIndices, seconds]
+
+    noWinner = winnerGFlops == -numpy.inf
+    winners[noWinner] = -1
+    winnerGFlops[noWinner] = -1e6
+    noSecond = secondGFlops == -numpy.inf
+    seconds[noSecond] = -1
+    secondGFlops[noSecond] = -1e6
+    seconds[noWinner] = -1
+    secondGFlops[noWinner] = -1e9
+
+    self.problemWinners[problems] = winners
+    self.problemWinnerGFlops[problems] = winnerGFlops
+    self.problemSeconds[problems] = seconds
+    self.problemSecondGFlops[problems] = secondGFlops
+
+  def problemsRankedBy(self, solutionIdx):
+    return numpy.flatnonzero((self.problemWinners == solutionIdx) | (self.problemSeconds == solutionIdx))
+
+
+  ##############################################################################
+  # Score (microseconds) Range For Solutions
+  def scoreRangeForSolutions(self, indexRange):
+    if self.rangeIsEmpty(indexRange):
+      return [0]*self.numSolutions
+    slices = self.rangeSlices(indexRange)
+    gflops = self.cube()[(slice(None),) + slices].reshape(self.numSolutions, -1, order="F") \
+        .astype(numpy.float64)
+    flops = self.flopsCube()[slices].reshape(1, -1, order="F")
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+      # solutions not benchmarked for a size score +inf so they are disqualified
+      timeUs = numpy.where(gflops > 0, flops / gflops / 1000, numpy.inf)
+    return self.sequentialSum(timeUs, axis=1).tolist()
+
+
+  ##############################################################################
+  # Score Range For Full Logic
+  def scoreRangeForFullLogic(self, depth, indexRange, logic):
+    if self.rangeIsEmpty(indexRange):
+      return 0
+    shape = [indexRange[i][1] - indexRange[i][0] for i in range(0, self.numIndices)]
+    solutionIndices = numpy.empty(shape, dtype=numpy.intp)
+    if not self.assignLogic(solutionIndices, [[0, n] for n in shape], indexRange, 0, logic):
+      # logic which doesn't cover the range; score it problem by problem
+      return LogicAnalyzer.scoreRangeForFullLogic(self, depth, indexRange, logic)
+
+    grid = numpy.ix_(*[numpy.arange(indexRange[i][0], indexRange[i][1]) for i in range(0, self.numIndices)])
+    gflops = numpy.maximum(self.cube()[(solutionIndices,) + grid].astype(numpy.float64), 1E-9)
+    timeUs = self.flopsCube()[self.rangeSlices(indexRange)] / gflops / 1000
+    return float(self.sequentialSum(timeUs.reshape(-1, order="F")))
+
+  ##############################################################################
+  # Assign Logic: fill solutionIndices (over indexRange) with the solution
+  # getSolutionForProblemIndicesUsingLogic picks for each problem, one level
+  # of logic (in index order) at a time.  False if the logic doesn't pick a
+  # solution for every problem.
+  def assignLogic(self, solutionIndices, subRange, indexRange, level, logic):
+    if level == self.numIndices:
+      if not isinstance(logic, int):
+        return False
+      solutionIndices[tuple([slice(r[0], r[1]) for r in subRange])] = logic
+      return True
+    if not isinstance(logic, list):
+      return False
+
+    index = self.indexOrder[level]
+    offset = indexRange[index][0]
+    (begin, end) = subRange[index]
+    for rule in logic:
+      # the first rule whose size index is not less than the problem's
+      ruleEnd = end if rule[0] < 0 else min(end, rule[0] + 1 - offset)
+      if ruleEnd > begin:
+        ruleRange = deepcopy(subRange)
+        ruleRange[index] = [begin, ruleEnd]
+        if not self.assignLogic(solutionIndices, ruleRange, indexRange, level+1, rule[1]):
+          return False
+        begin = ruleEnd
+      if begin >= end:
+        break
+    return begin >= end
+
+
+  ##############################################################################
+  # Get Winner For Problem
+  def getWinnerForProblem(self, problemIndices):
+    problemSerial = self.indicesToSerial(0, problemIndices) // max(self.numSolutions, 1)
+    gflops = numpy.maximum(self.matrix()[problemSerial].astype(numpy.float64), 1E-9)
+    winnerIdx = int(numpy.argmax(gflops))
+    return (winnerIdx, float(gflops[winnerIdx]))
+
+
+
 ################################################################################
 ################################################################################
 ###
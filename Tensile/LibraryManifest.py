@@ -0,0 +1,195 @@
+################################################################################
+# Copyright (C) 2019 Advanced Micro Devices, Inc. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell cop-
+# ies of the Software, and to permit persons to whom the Software is furnished
+# to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IM-
+# PLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNE-
+# CTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+################################################################################
+
+from . import Common
+from .Common import ensurePath, print1, print2, printWarning
+from . import Utils
+from . import YAMLIO
+
+import hashlib
+import os
+import pickle
+
+def fileHash(filename):
+    h = hashlib.sha1()
+    with open(filename, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+def _indexedCall(item):
+    (function, idx, arg) = item
+    return (idx, function(arg))
+
+class LibraryManifest:
+    """
+    Records, in the output directory, the hash of every logic file which went
+    into a library along with the artifacts produced from it, so that
+    incremental runs of TensileCreateLibrary only re-parse logic files which
+    changed.
+
+    Parsed logic files are kept as pickles in <outputPath>/incremental/logic
+    and are only trusted when the manifest was written with the same
+    parameters (command line arguments, Tensile version and toolchain).
+    Logic files are recorded by their path relative to logicPath.
+    """
+
+    FileName = 'TensileManifest.yaml'
+    Version = 1
+
+    def __init__(self, outputPath, logicPath, parameters):
+        self.outputPath = outputPath
+        self.logicPath = logicPath
+        self.filename = os.path.join(outputPath, self.FileName)
+        self.cachePath = os.path.join(outputPath, 'incremental')
+        self.parameters = Utils.fingerprint(parameters)
+
+        self.logicFiles = {}
+        self.artifacts = []
+        self.changedLogicFiles = []
+
+        self.previous = self.load()
+
+    def load(self):
+        empty = {'LogicFiles': {}, 'Artifacts': []}
+        if not os.path.isfile(self.filename):
+            return empty
+
+        try:
+            with open(self.filename) as f:
+                data = YAMLIO.load(f)
+        except (IOError, YAMLIO.yaml.YAMLError) as e:
+            printWarning("Ignoring unreadable manifest %s: %s" % (self.filename, e))
+            return empty
+
+        if not isinstance(data, dict) or data.get('Version') != self.Version:
+            return empty
+
+        if data.get('Parameters') != self.parameters:
+            print1("# Library parameters changed since the last build; rebuilding all logic files")
+            return empty
+
+        return data
+
+    def logicFileKey(self, logicFile):
+        return os.path.relpath(logicFile, self.logicPath).replace(os.sep, '/')
+
+    def logicCacheFile(self, logicHash):
+        return os.path.join(self.cachePath, 'logic', logicHash + '.pickle')
+
+    def scanLogicFiles(self, logicFiles):
+        """
+        Hashes logicFiles and determines which of them must be read again.
+        """
+        self.logicFiles = {}
+        self.changedLogicFiles = []
+        for logicFile in logicFiles:
+            key = self.logicFileKey(logicFile)
+            logicHash = fileHash(logicFile)
+            self.logicFiles[key] = logicHash
+
+            if self.previous['LogicFiles'].get(key) != logicHash \
+                    or not os.path.isfile(self.logicCacheFile(logicHash)):
+                self.changedLogicFiles.append(logicFile)
+
+        print1("# %u of %u logic files changed since the last build" \
+            % (len(self.changedLogicFiles), len(logicFiles)))
+
+    def readLogicFiles(self, logicFiles, readFunction):
+        """
+        Equivalent to ParallelMap(readFunction, logicFiles), except that logic
+        files which are unchanged since the last build are loaded from their
+        cached parse instead of being read again.
+        """
+        results = [None] * len(logicFiles)
+        for (idx, result) in self.iterLogicFiles(logicFiles, readFunction):
+            results[idx] = result
+        return results
+
+    def iterLogicFiles(self, logicFiles, readFunction):
+        """
+        Like readLogicFiles, but yields (index into logicFiles, result) as
+        each result becomes available, in no particular order.
+        """
+        if any([self.logicFileKey(f) not in self.logicFiles for f in logicFiles]):
+            self.scanLogicFiles(logicFiles)
+
+        toRead = []
+
+        for (idx, logicFile) in enumerate(logicFiles):
+            if logicFile not in self.changedLogicFiles:
+                logicHash = self.logicFiles[self.logicFileKey(logicFile)]
+                try:
+                    with open(self.logicCacheFile(logicHash), 'rb') as f:
+                        result = pickle.load(f)
+                    print2("# Reusing parsed logic file %s" % logicFile)
+                    yield (idx, result)
+                    continue
+                except (IOError, OSError, pickle.UnpicklingError, EOFError):
+                    self.changedLogicFiles.append(logicFile)
+            toRead.append(idx)
+
+        if len(toRead) == 0:
+            return
+
+        ensurePath(os.path.join(self.cachePath, 'logic'))
+        newResults = Common.ParallelMap(_indexedCall, [(readFunction, idx, logicFiles[idx]) for idx in toRead],
+                                        "Reading logic files", method=lambda x: x.imap_unordered)
+        for (idx, result) in newResults:
+            logicHash = self.logicFiles[self.logicFileKey(logicFiles[idx])]
+            with open(self.logicCacheFile(logicHash), 'wb') as f:
+                pickle.dump(result, f, pickle.HIGHEST_PROTOCOL)
+            yield (idx, result)
+
+    def removedLogicFiles(self):
+        return sorted(set(self.previous['LogicFiles']) - set(self.logicFiles))
+
+    def upToDate(self):
+        """
+        True if no logic file was added, removed or changed since the last build
+        and all of its artifacts are still present.
+        """
+        if len(self.changedLogicFiles) > 0 or len(self.removedLogicFiles()) > 0:
+            return False
+        if len(self.previous['Artifacts']) == 0:
+            return False
+        return all([os.path.exists(a) for a in self.previous['Artifacts']])
+
+    def write(self, artifacts):
+        self.artifacts = sorted(set(artifacts))
+
+        # drop cached parses of logic files which are no longer part of the library
+        liveCacheFiles = set([os.path.basename(self.logicCacheFile(h)) for h in self.logicFiles.values()])
+        logicCachePath = os.path.join(self.cachePath, 'logic')
+        if os.path.isdir(logicCachePath):
+            for f in os.listdir(logicCachePath):
+                if f not in liveCacheFiles:
+                    os.remove(os.path.join(logicCachePath, f))
+
+        data = {'Version': self.Version,
+                'Parameters': self.parameters,
+                'LogicFiles': self.logicFiles,
+                'Artifacts': self.artifacts}
+
+        tmpFilename = self.filename + '.tmp'
+        with open(tmpFilename, 'w') as f:
+            YAMLIO.dump(data, f, default_flow_style=False)
+        os.replace(tmpFilename, self.filename)
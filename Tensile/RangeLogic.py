@@ -0,0 +1,195 @@
+################################################################################
+# Copyright (C) 2019 Advanced Micro Devices, Inc. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell cop-
+# ies of the Software, and to permit persons to whom the Software is furnished
+# to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IM-
+# PLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNE-
+# CTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+################################################################################
+
+"""
+Compiles the exact and range logic of a logic file into sorted interval
+arrays which are searched with bisection.
+
+Range logic, as written by LibraryLogic, is a nested list with one level per
+index of the index order.  Each level is a list of [threshold, next] rules:
+the first rule with size <= threshold (or with threshold -1) applies, and
+next is the logic of the following index or, at the last index, the
+solution index.  Walking it compares a size against the thresholds of a
+level one at a time.
+
+CompiledLogic turns each level into a node holding the thresholds in
+ascending order and the node each interval leads to, merges neighbouring
+intervals which lead to the same node and shares identical subtrees, so a
+lookup is one binary search per index.  Exact sizes are looked up first, in
+a dict.
+"""
+
+import bisect
+
+NoSolution = -1
+
+def logicDepth(rangeLogic):
+    depth = 0
+    while isinstance(rangeLogic, list) and len(rangeLogic) > 0:
+        depth += 1
+        rangeLogic = rangeLogic[0][1]
+    return depth
+
+def walkRangeLogic(indexOrder, rangeLogic, size):
+    """
+    The solution index the nested range logic picks for size (in problem
+    index order), comparing thresholds one at a time; None if no rule
+    applies.
+    """
+    level = len(indexOrder) - logicDepth(rangeLogic)
+    logic = rangeLogic
+    while isinstance(logic, list):
+        sizeOfIndex = size[indexOrder[level]]
+        for rule in logic:
+            if rule[0] < 0 or sizeOfIndex <= rule[0]:
+                logic = rule[1]
+                break
+        else:
+            return None
+        level += 1
+    return logic
+
+def exactLogicDict(exactLogic):
+    """
+    Exact logic as a dict of size tuple -> solution index, from either the
+    dict LibraryLogic builds or the [[size, [solutionIdx, gflops]], ...] of
+    logic files.
+    """
+    if exactLogic is None:
+        return {}
+    items = exactLogic.items() if isinstance(exactLogic, dict) else exactLogic
+    return dict([(tuple(size), winner[0]) for (size, winner) in items])
+
+
+class CompiledLogic:
+    """
+    Exact and range logic compiled for lookup.  Nodes are held as parallel
+    lists: the problem index each node compares (-1 for a leaf), its
+    thresholds, ascending, and its children, the nodes of the intervals
+    (-inf, t0], (t0, t1], ..., (tn, inf).  A leaf has no thresholds and its
+    only child is the solution index, or NoSolution.
+    """
+
+    def __init__(self, indexOrder, exactLogic, rangeLogic):
+        self.indexOrder = list(indexOrder)
+        self.exact = exactLogicDict(exactLogic)
+        self.indices = []
+        self.thresholds = []
+        self.children = []
+        self.nodeIds = {}
+        if rangeLogic is None or rangeLogic == []:
+            self.root = None
+        else:
+            self.root = self.compileLevel(rangeLogic, len(self.indexOrder) - logicDepth(rangeLogic))
+        del self.nodeIds
+
+    def addNode(self, index, thresholds, children):
+        key = (index, tuple(thresholds), tuple(children))
+        if key not in self.nodeIds:
+            self.nodeIds[key] = len(self.indices)
+            self.indices.append(index)
+            self.thresholds.append(list(thresholds))
+            self.children.append(list(children))
+        return self.nodeIds[key]
+
+    def compileLevel(self, logic, level):
+        if not isinstance(logic, list):
+            return self.addNode(-1, [], [NoSolution if logic is None else logic])
+
+        thresholds = []
+        children = []
+        for rule in logic:
+            child = self.compileLevel(rule[1], level + 1)
+            if len(children) > 0 and children[-1] == child:
+                # neighbouring intervals leading to the same node are one interval
+                thresholds.pop()
+            else:
+                children.append(child)
+            if rule[0] < 0:
+                break
+            thresholds.append(rule[0])
+        else:
+            # sizes beyond the last threshold match no rule
+            noSolution = self.addNode(-1, [], [NoSolution])
+            if children[-1] == noSolution:
+                thresholds.pop()
+            else:
+                children.append(noSolution)
+
+        if len(children) == 1:
+            return children[0]
+        return self.addNode(self.indexOrder[level], thresholds, children)
+
+    @property
+    def numNodes(self):
+        return len(self.indices)
+
+    def rangeSolution(self, size):
+        if self.root is None:
+            return None
+        indices = self.indices
+        thresholds = self.thresholds
+        children = self.children
+        node = self.root
+        index = indices[node]
+        while index >= 0:
+            node = children[node][bisect.bisect_left(thresholds[node], size[index])]
+            index = indices[node]
+        solution = children[node][0]
+        return None if solution == NoSolution else solution
+
+    def solution(self, size):
+        """
+        The solution index for size (in problem index order): its exact
+        solution if it has one, otherwise the one the range logic picks.
+        """
+        solution = self.exact.get(tuple(size))
+        if solution is not None:
+            return solution
+        return self.rangeSolution(size)
+
+    def state(self):
+        return {"indexOrder": self.indexOrder,
+                "exact": [[list(size), self.exact[size]] for size in sorted(self.exact)],
+                "root": -1 if self.root is None else self.root,
+                "nodes": [[self.indices[n], self.thresholds[n], self.children[n]] for n in range(0, self.numNodes)]}
+
+    @classmethod
+    def FromState(cls, d):
+        logic = cls(d["indexOrder"], None, None)
+        logic.exact = dict([(tuple(size), solution) for (size, solution) in d["exact"]])
+        logic.root = None if d["root"] < 0 else d["root"]
+        for (index, thresholds, children) in d["nodes"]:
+            logic.indices.append(index)
+            logic.thresholds.append(list(thresholds))
+            logic.children.append(list(children))
+        return logic
+
+    def mapSolutions(self, function):
+        """
+        Copy of the logic with each solution index s replaced by function(s).
+        """
+        mapped = CompiledLogic.FromState(self.state())
+        mapped.exact = dict([(size, function(s)) for (size, s) in mapped.exact.items()])
+        for n in range(0, mapped.numNodes):
+            if mapped.indices[n] < 0 and mapped.children[n][0] != NoSolution:
+                mapped.children[n] = [function(mapped.children[n][0])]
+        return mapped
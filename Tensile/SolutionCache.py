@@ -0,0 +1,213 @@
+################################################################################
+# Copyright (C) 2019 Advanced Micro Devices, Inc. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell cop-
+# ies of the Software, and to permit persons to whom the Software is furnished
+# to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IM-
+# PLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNE-
+# CTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+################################################################################
+
+from . import __version__
+from .Common import globalParameters, ensurePath, print1, print2, printWarning
+from .DataType import DataType
+from . import Utils
+
+import collections
+import copyreg
+import hashlib
+import io
+import os
+import pickle
+
+class DerivedParameterCache:
+    """
+    Memo of Solution construction, shared by every Solution built in the
+    process, so that a solution built from the same config as an earlier one
+    doesn't go through assignDerivedParameters again.
+
+    Entries are keyed on the fingerprint of the config, including the order
+    of its keys, and of the global parameters derivation reads.  Each holds
+    the derived state, pickled so that every hit returns a copy which shares
+    nothing with the memo or with other solutions, and the reasons it was
+    rejected for, if it is invalid, and its name.  DataTypes are immutable and pickled by
+    value, so loading an entry doesn't copy their property tables.
+
+    Most configs of a benchmark step are only built once, so in memory a
+    state is only stored the second time its config is built.  At most
+    maxEntries entries are kept, least recently used first out.  With a
+    path, every state is stored, and the entries are also read from and
+    saved to a file there, keyed on the Tensile version and the source of
+    the derivation.
+    """
+
+    Version = 1
+
+    @classmethod
+    def FromGlobalParameters(cls):
+        if not globalParameters["SolutionCache"]:
+            return None
+        return cls(globalParameters["SolutionCachePath"], globalParameters["SolutionCacheMaxEntries"])
+
+    def __init__(self, path, maxEntries):
+        self.path = path
+        self.maxEntries = maxEntries
+        self.entries = collections.OrderedDict()
+        self.seen = set()
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.loaded = 0
+        if self.path is not None:
+            self.load()
+
+    @property
+    def params(self):
+        return (self.path, self.maxEntries)
+
+    @staticmethod
+    def environment():
+        """
+        The global parameters which Solution construction reads.
+        """
+        isa = globalParameters["CurrentISA"]
+        archCaps = globalParameters["ArchCaps"].get(isa) if "ArchCaps" in globalParameters else None
+        return (isa, archCaps, globalParameters["DeviceLDS"], globalParameters["MaxLDS"], \
+                globalParameters["MaxDepthU"], globalParameters["WavefrontWidth"], globalParameters["IndexChars"])
+
+    @staticmethod
+    def sourceIdentity():
+        """
+        Identifies the code of Solution construction and its defaults.
+        """
+        h = hashlib.sha1(repr((__version__, DerivedParameterCache.Version)).encode())
+        for module in ["SolutionStructs.py", "Common.py", "DataType.py"]:
+            with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), module), 'rb') as f:
+                h.update(f.read())
+        return h.hexdigest()
+
+    def fileName(self):
+        return os.path.join(self.path, "solutions-%s.pickle" % self.sourceIdentity())
+
+    def key(self, config):
+        return Utils.fingerprint(tuple(config.keys()), config, self.environment())
+
+    @staticmethod
+    def dumps(state):
+        f = io.BytesIO()
+        pickler = pickle.Pickler(f, pickle.HIGHEST_PROTOCOL)
+        pickler.dispatch_table = _dispatchTable
+        pickler.dump(state)
+        return f.getvalue()
+
+    def fetch(self, key):
+        """
+        Returns a copy of the derived state cached for key, the reasons it was
+        rejected for and its name, or None on a miss.
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        (blob, reasons, name) = entry
+        return (pickle.loads(blob), reasons, name)
+
+    def store(self, key, solution, reasons):
+        """
+        Caches the derived state of solution, just built from the config of
+        key, and the reasons it was rejected for.
+        """
+        if self.path is None and key not in self.seen:
+            if len(self.seen) >= 4 * self.maxEntries:
+                self.seen.clear()
+            self.seen.add(key)
+            return
+        self.seen.discard(key)
+        self.entries[key] = (self.dumps(solution._state), list(reasons), str(solution))
+        self.entries.move_to_end(key)
+        self.stores += 1
+        while len(self.entries) > self.maxEntries:
+            self.entries.popitem(last=False)
+
+    def readFile(self):
+        try:
+            with open(self.fileName(), 'rb') as f:
+                entries = pickle.load(f)
+        except (IOError, OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, ValueError):
+            return {}
+        return entries if isinstance(entries, dict) else {}
+
+    def load(self):
+        entries = self.readFile()
+        for key in list(entries.keys())[-self.maxEntries:]:
+            self.entries[key] = entries[key]
+        self.loaded = len(self.entries)
+        print2("# Read %u derived solution states from %s" % (self.loaded, self.fileName()))
+
+    def save(self):
+        """
+        Adds the entries to the file of the cache, keeping those other
+        processes saved since it was read.
+        """
+        if self.path is None or self.stores == 0:
+            return
+        fileName = self.fileName()
+        entries = self.readFile()
+        entries.update(self.entries)
+        while len(entries) > self.maxEntries:
+            del entries[next(iter(entries))]
+        try:
+            ensurePath(self.path)
+            tmpFile = "%s.%u.tmp" % (fileName, os.getpid())
+            with open(tmpFile, 'wb') as f:
+                pickle.dump(entries, f, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmpFile, fileName)
+        except (IOError, OSError) as e:
+            printWarning("Could not write solution cache %s: %s" % (fileName, e))
+
+    def printStats(self):
+        lookups = self.hits + self.misses
+        hitRate = 100.0 * self.hits / lookups if lookups else 0.0
+        print1("# Solution cache: %u hits, %u misses (%.1f%% hit rate), %u entries, %u read from disk" \
+            % (self.hits, self.misses, hitRate, len(self.entries), self.loaded))
+
+_dispatchTable = copyreg.dispatch_table.copy()
+_dispatchTable[DataType] = lambda dataType: (DataType, (dataType.value,))
+
+_cache = None
+
+def current():
+    """
+    The cache of the process for the current global parameters, or None if
+    SolutionCache is off.
+    """
+    global _cache
+    if not globalParameters["SolutionCache"]:
+        return None
+    params = (globalParameters["SolutionCachePath"], globalParameters["SolutionCacheMaxEntries"])
+    if _cache is None or _cache.params != params:
+        if _cache is not None:
+            _cache.save()
+        _cache = DerivedParameterCache.FromGlobalParameters()
+    return _cache
+
+def finish():
+    """
+    Prints the statistics of the cache of the process and saves it.
+    """
+    if _cache is not None and _cache.hits + _cache.misses > 0:
+        _cache.printStats()
+        _cache.save()
@@ -24,6 +24,7 @@ import itertools
 from . import Properties
 from . import Hardware
 from . import Contractions
+from . import RangeLogic
 from .SolutionStructs import Solution as OriginalSolution
 from .Utils import state
 
@@ -68,6 +69,147 @@ class GranularitySelectionLibrary:
             if index in indexMap:
                 self.indices[i] = indexMap[index]
 
+class ExactIndex:
+    """
+    Open-addressing hash table of the keys of a matching table, so that a
+    key which is in the table is found without computing its distance to
+    every row.  slots has a power of two entries, each the table row of a
+    key or -1; a key is looked for from slot hashKey(key) & (len(slots)-1)
+    onwards, one slot at a time, until its row or an empty slot is found.
+    Keys which occur more than once map to their first row, which is the
+    one a distance search picks.  Only the slots are serialized.
+    """
+    Hash = 'FNV-1a-64'
+    MaxLoadFactor = 0.5
+
+    @staticmethod
+    def hashKey(key):
+        # FNV-1a over the 64-bit values of the key, rather than its bytes
+        h = 0xcbf29ce484222325
+        for value in key:
+            h = ((h ^ value) * 0x100000001b3) & 0xffffffffffffffff
+        return h
+
+    @classmethod
+    def FromKeys(cls, keys):
+        numKeys = len(set([tuple(key) for key in keys]))
+        capacity = 1
+        while capacity * cls.MaxLoadFactor < numKeys:
+            capacity *= 2
+        slots = [-1] * capacity
+        for (row, key) in enumerate(keys):
+            slot = cls.hashKey(key) & (capacity - 1)
+            while slots[slot] >= 0 and list(keys[slots[slot]]) != list(key):
+                slot = (slot + 1) & (capacity - 1)
+            if slots[slot] < 0:
+                slots[slot] = row
+        return cls(keys, slots)
+
+    def __init__(self, keys, slots):
+        self.keys = keys
+        self.slots = slots
+
+    def state(self):
+        return {'hash': self.Hash, 'slots': self.slots}
+
+    def row(self, key):
+        """
+        The row of key among the keys the index was built from, or None.
+        """
+        keys = self.keys
+        mask = len(self.slots) - 1
+        slot = self.hashKey(key) & mask
+        row = self.slots[slot]
+        while row >= 0:
+            if list(keys[row]) == list(key):
+                return row
+            slot = (slot + 1) & mask
+            row = self.slots[slot]
+        return None
+
+class NearestIndex:
+    """
+    KD-tree of the keys of a matching table with a Euclidean distance, so
+    that the nearest row to a key is found without computing its distance
+    to every row.  rows holds the table rows in tree order and nodes the
+    tree, root first: [dim, split, left, right] splits on key[dim], with
+    the keys <= split under left and the keys >= split under right, and
+    [-1, 0, begin, end] is a leaf of rows[begin:end].  Of equally near
+    rows the first is picked, as a distance search does.
+
+    Rows are picked by distance alone; a host library which also skips rows
+    whose solution can't solve the problem has to fall back to the next
+    nearest rows.
+    """
+    Type = 'KDTree'
+    LeafSize = 8
+
+    @classmethod
+    def FromKeys(cls, keys, leafSize=None):
+        if leafSize is None:
+            leafSize = cls.LeafSize
+        index = cls(keys, [], [])
+        if len(keys) > 0:
+            index.build(list(range(0, len(keys))), leafSize)
+        return index
+
+    def __init__(self, keys, rows, nodes):
+        self.keys = keys
+        self.rows = rows
+        self.nodes = nodes
+
+    def build(self, rows, leafSize):
+        node = len(self.nodes)
+        self.nodes.append(None)
+        if len(rows) <= leafSize:
+            self.nodes[node] = [-1, 0, len(self.rows), len(self.rows) + len(rows)]
+            self.rows += sorted(rows)
+            return node
+
+        keys = self.keys
+        spreads = [max([keys[r][d] for r in rows]) - min([keys[r][d] for r in rows]) \
+                for d in range(0, len(keys[rows[0]]))]
+        dim = spreads.index(max(spreads))
+        rows = sorted(rows, key=lambda r: (keys[r][dim], r))
+        mid = len(rows) // 2
+        split = keys[rows[mid]][dim]
+        left = self.build(rows[:mid], leafSize)
+        right = self.build(rows[mid:], leafSize)
+        self.nodes[node] = [dim, split, left, right]
+        return node
+
+    def state(self):
+        return {'type': self.Type, 'rows': self.rows, 'nodes': self.nodes}
+
+    def nearestRow(self, key):
+        """
+        The row of the key nearest to key, or None if there are no keys.
+        """
+        if len(self.nodes) == 0:
+            return None
+        keys = self.keys
+        rows = self.rows
+        nodes = self.nodes
+        best = (float("inf"), None)
+        pending = [(0, 0)]
+        while len(pending) > 0:
+            (node, bound) = pending.pop()
+            if bound > best[0]:
+                continue
+            (dim, split, a, b) = nodes[node]
+            if dim < 0:
+                for row in rows[a:b]:
+                    distance = sum([(k - r) * (k - r) for (k, r) in zip(key, keys[row])])
+                    if (distance, row) < best:
+                        best = (distance, row)
+                continue
+            diff = key[dim] - split
+            (near, far) = (a, b) if diff < 0 else (b, a)
+            # the far side is at least diff away along dim
+            pending.append((far, max(bound, diff * diff)))
+            pending.append((near, bound))
+        return best[1]
+
 class MatchingLibrary:
     Tag = 'Matching'
     StateKeys = [('type', 'tag'), 'properties', 'table', 'distance']
@@ -112,14 +254,102 @@ class MatchingLibrary:
                 and self.distance == other.distance
 
         self.table += other.table
+        self.exactIndex = None
+        self.nearestIndex = None
 
     def remapSolutionIndices(self,indexMap):
         pass
 
+    def buildExactIndex(self):
+        self.exactIndex = ExactIndex.FromKeys([entry['key'] for entry in self.table])
+
+    def buildNearestIndex(self):
+        if self.distance.get('type') == 'Euclidean':
+            self.nearestIndex = NearestIndex.FromKeys([entry['key'] for entry in self.table])
+
+    def stateItems(self):
+        items = [('type', self.tag), ('properties', self.properties), ('table', self.table), ('distance', self.distance)]
+        if self.exactIndex is not None:
+            items.append(('exactIndex', self.exactIndex))
+        if self.nearestIndex is not None:
+            items.append(('nearestIndex', self.nearestIndex))
+        return items
+
+    def state(self):
+        return dict([(key, state(value)) for (key, value) in self.stateItems()])
+
+    def bestMatchRow(self, key):
+        """
+        The row of the table a lookup of key picks: the row of key itself,
+        through the exact index if there is one, or else the first of the
+        nearest rows by Euclidean distance, through the nearest index if
+        there is one.
+        """
+        if self.exactIndex is not None:
+            row = self.exactIndex.row(key)
+            if row is not None:
+                return row
+        if self.nearestIndex is not None:
+            return self.nearestIndex.nearestRow(key)
+        bestRow = None
+        bestDistance = None
+        for (row, entry) in enumerate(self.table):
+            distance = sum([(a - b) * (a - b) for (a, b) in zip(key, entry['key'])])
+            if bestDistance is None or distance < bestDistance:
+                bestRow = row
+                bestDistance = distance
+        return bestRow
+
     def __init__(self, properties, table, distance):
         self.properties = properties
         self.table = table
         self.distance = distance
+        self.exactIndex = None
+        self.nearestIndex = None
+
+class RangeLogicLibrary:
+    """
+    Exact and range logic of a logic file, compiled into interval arrays
+    (see RangeLogic.CompiledLogic) whose leaves are solutions.
+    """
+    Tag = 'RangeLogic'
+
+    @classmethod
+    def FromOriginalState(cls, d, solutions):
+        indexOrder = d[0]
+        exactLogic = d[1]
+        rangeLogic = d[2]
+
+        logic = RangeLogic.CompiledLogic(indexOrder, exactLogic, rangeLogic)
+        return cls(logic.mapSolutions(lambda s: solutions[s]))
+
+    @property
+    def tag(self):
+        return self.__class__.Tag
+
+    def state(self):
+        rv = {'type': self.tag}
+        rv.update(self.logic.mapSolutions(lambda s: s.index).state())
+        return rv
+
+    def merge(self, other):
+        assert self.__class__ == other.__class__ \
+                and self.logic.indexOrder == other.logic.indexOrder
+        # range trees can't be combined; only their exact sizes can
+        assert self.logic.root is None or other.logic.root is None, \
+                "range logic of more than one logic file for the same problems"
+
+        exact = dict(other.logic.exact)
+        exact.update(self.logic.exact)
+        if self.logic.root is None:
+            self.logic = other.logic
+        self.logic.exact = exact
+
+    def remapSolutionIndices(self,indexMap):
+        pass
+
+    def __init__(self, logic):
+        self.logic = logic
 
 class ProblemMapLibrary:
     Tag = 'ProblemMap'
@@ -199,6 +429,7 @@ class MasterSolutionLibrary:
         origProblemType = d[4]
         origSolutions = d[5]
         origLibrary = d[6:8]
+        origRangeLibrary = d[6:9]
 
         problemType = Contractions.ProblemType.FromOriginalState(origProblemType)
 
@@ -217,6 +448,9 @@ class MasterSolutionLibrary:
                 matchingLibrary = MatchingLibrary.FromOriginalState(origLibrary, allSolutions)
                 library = matchingLibrary
             
+            elif libName == 'RangeLogic':
+                library = RangeLogicLibrary.FromOriginalState(origRangeLibrary, allSolutions)
+
             elif libName == 'Granularity':
                 selectionIndices = d[9]["TileSelectionIndices"]
                 library = GranularitySelectionLibrary.FromOriginalState(selectionIndices)
@@ -274,6 +508,36 @@ class MasterSolutionLibrary:
     def state(self):
         return {'solutions': state(iter(list(self.solutions.values()))), 'library': state(self.library)}
 
+    def stateItems(self):
+        return [('solutions', iter(self.solutions.values())), ('library', self.library)]
+
+    def matchingLibraries(self):
+        pending = [self.library]
+        while len(pending) > 0:
+            library = pending.pop()
+            if isinstance(library, MatchingLibrary):
+                yield library
+            elif isinstance(library, PredicateLibrary):
+                pending.extend([row['library'] for row in library.rows])
+            elif isinstance(library, ProblemMapLibrary):
+                pending.extend(library.mapping.values())
+
+    def buildExactIndices(self):
+        """
+        Adds an exact index to each matching library, once all libraries
+        have been merged.
+        """
+        for library in self.matchingLibraries():
+            library.buildExactIndex()
+
+    def buildNearestIndices(self):
+        """
+        Adds a nearest index to each matching library with a Euclidean
+        distance, once all libraries have been merged.
+        """
+        for library in self.matchingLibraries():
+            library.buildNearestIndex()
+
     def applyNaming(self, naming=None):
         if naming is None:
             #allSolutions = itertools.chain(iter(list(self.solutions.values())), iter(list(self.sourceSolutions.values())))
@@ -0,0 +1,162 @@
+################################################################################
+# Copyright (C) 2019 Advanced Micro Devices, Inc. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell cop-
+# ies of the Software, and to permit persons to whom the Software is furnished
+# to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IM-
+# PLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNE-
+# CTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+################################################################################
+
+from .Common import globalParameters, defaultSolution, print1
+from .DataType import DataType
+from .Utils import roundUpToNearestMultiple
+
+import math
+
+class SolutionPrecheck:
+    """
+    Checks solution configs of one problem type against constraints of
+    Solution.assignDerivedParameters before the solutions are built.
+
+    Each rule computes the values its check in assignDerivedParameters
+    compares from the config and its defaults, the way assignDerivedParameters
+    derives them, and only prunes a config if that check would reject it.
+    Every early exit before those checks also rejects the solution, so a
+    pruned config is always one which would be built as an invalid solution.
+    Configs the rules can't decide on are left to Solution.
+
+    pruned counts the configs each rule pruned, the first rule to match
+    taking the config.
+    """
+
+    Rules = ["MacroTileShape", "ThreadTileVectorWidth", "VectorWidthBytes", "GlobalReadVectorWidthBytes", \
+             "NumThreads", "GlobalWriteVectorWidth", "LocalSplitU", "DepthU", "LdsPad", "LDS"]
+
+    def __init__(self, problemType):
+        from .SolutionStructs import ProblemType
+        problemType = ProblemType(problemType.state if isinstance(problemType, ProblemType) else problemType)
+        ProblemType.assignDerivedParameters(problemType)
+        self.dataType = DataType(problemType["DataType"])
+        self.tlua = problemType["TLUA"]
+        self.tlub = problemType["TLUB"]
+        self.checked = 0
+        self.pruned = dict([(rule, 0) for rule in self.Rules])
+
+    def check(self, config):
+        """
+        The rule pruning config, or None if it may be valid.
+        """
+        self.checked += 1
+        try:
+            rule = self.firstRule(config)
+        except (KeyError, TypeError, IndexError, ValueError, ZeroDivisionError):
+            rule = None
+        if rule is not None:
+            self.pruned[rule] += 1
+        return rule
+
+    def firstRule(self, config):
+        def param(name):
+            return config[name] if name in config else defaultSolution[name]
+
+        workGroup = param("WorkGroup")
+        threadTile = param("ThreadTile")
+        numThreads = workGroup[0] * workGroup[1] * workGroup[2]
+        localSplitU = workGroup[2]
+        macroTile0 = workGroup[0] * threadTile[0]
+        macroTile1 = workGroup[1] * threadTile[1]
+        numRegisters = self.dataType.numRegisters()
+        numBytes = self.dataType.numBytes()
+
+        # assignProblemIndependentDerivedParameters
+        if "MacroTile" in config and list(config["MacroTile"][:2]) != [macroTile0, macroTile1]:
+            return "MacroTileShape"
+        if macroTile0 > 0 and macroTile1 > 0:
+            macroTileShape = max(macroTile0 // macroTile1, macroTile1 // macroTile0)
+            if macroTileShape > param("MacroTileShapeMax") or macroTileShape < param("MacroTileShapeMin"):
+                return "MacroTileShape"
+
+        # VectorWidth and GlobalReadVectorWidth defaults
+        vectorWidth = param("VectorWidth")
+        if vectorWidth < 1:
+            vectorWidth = int(4 / numRegisters)
+            while threadTile[0] % vectorWidth != 0 or threadTile[1] % vectorWidth != 0:
+                vectorWidth //= 2
+        if threadTile[0] % vectorWidth != 0 or threadTile[1] % vectorWidth != 0:
+            return "ThreadTileVectorWidth"
+        globalReadVectorWidth = param("GlobalReadVectorWidth")
+        if globalReadVectorWidth == -1:
+            globalReadVectorWidth = vectorWidth
+        if vectorWidth * numBytes > 16:
+            return "VectorWidthBytes"
+        if globalReadVectorWidth * numBytes > 16:
+            return "GlobalReadVectorWidthBytes"
+
+        # elements per thread
+        numElementsPerWorkGroup = macroTile0 * macroTile1
+        if numElementsPerWorkGroup < numThreads:
+            return "NumThreads"
+        numElementsPerThread = numElementsPerWorkGroup // numThreads
+        if numElementsPerThread % min(vectorWidth, numElementsPerThread) != 0:
+            return "GlobalWriteVectorWidth"
+        if localSplitU > 1 and (numThreads % macroTile0 != 0 or numElementsPerWorkGroup % numThreads != 0):
+            return "LocalSplitU"
+
+        # a DepthU given by the config is the only one searched
+        depthU = param("DepthU")
+        if depthU == -1 and macroTile0 != macroTile1:
+            return "DepthU"
+        if depthU > 0 and depthU % (param("PrefetchLocalRead") + 1) != 0:
+            return "DepthU"
+
+        ldsPadA = param("LdsPadA")
+        ldsPadB = param("LdsPadB")
+        if param("KernelLanguage") == "Source" and ldsPadA != ldsPadB:
+            return "LdsPad"
+        if depthU <= 0:
+            return None
+
+        # LDS, which a DepthU given by the config is used for
+        if ldsPadA == -1:
+            ldsPadA = 0 if self.tlua else vectorWidth
+        if ldsPadB == -1:
+            ldsPadB = 0 if self.tlub else vectorWidth
+        ldsAlign = int(64 / numRegisters)
+        ldsNumElementsA = depthU * (macroTile0 + ldsPadA)
+        ldsNumElementsAlignedA = roundUpToNearestMultiple(ldsNumElementsA, ldsAlign)
+        ldsNumElementsB = depthU * (macroTile1 + ldsPadB)
+        ldsNumElementsAlignedB = roundUpToNearestMultiple(ldsNumElementsB, ldsAlign)
+        if param("PrefetchGlobalRead"):
+            offsetBlk = ldsNumElementsAlignedA + ldsNumElementsAlignedB
+            offsetBlk = int(2**(math.ceil(math.log(offsetBlk, 2))))
+            ldsNumElementsAB = offsetBlk + ldsNumElementsAlignedA + ldsNumElementsB
+        else:
+            ldsNumElementsAB = ldsNumElementsAlignedA + ldsNumElementsB
+        ldsNumElementsReduction = localSplitU * macroTile0 * macroTile1 if localSplitU > 1 else 0
+        ldsNumElementsOccupancy = (globalParameters["DeviceLDS"] // param("MaxOccupancy")) // numBytes
+        ldsNumElements = max(ldsNumElementsAB, ldsNumElementsReduction, ldsNumElementsOccupancy)
+        if ldsNumElements * numBytes > globalParameters["MaxLDS"]:
+            return "LDS"
+        return None
+
+    def merge(self, other):
+        self.checked += other.checked
+        for rule in self.Rules:
+            self.pruned[rule] += other.pruned[rule]
+
+    def printStats(self):
+        total = sum(self.pruned.values())
+        print1("# Pre-check pruned %u / %u candidates%s" % (total, self.checked, \
+            "".join([", %s: %u" % (rule, self.pruned[rule]) for rule in self.Rules if self.pruned[rule]])))
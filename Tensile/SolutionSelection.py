@@ -0,0 +1,349 @@
+################################################################################
+# Copyright (C) 2019 Advanced Micro Devices, Inc. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell cop-
+# ies of the Software, and to permit persons to whom the Software is furnished
+# to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IM-
+# PLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNE-
+# CTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+################################################################################
+
+"""
+Pluggable choice of the solutions LibraryLogic keeps for a problem type.
+
+A selector is registered for a value of the SolutionSelectionAlg global
+parameter and applied to a LogicAnalyzer after invalid solutions have been
+removed.  Selectors which pick solutions themselves predict the time of a
+set of solutions as the sum, over the range problems, of the problem's
+time with the fastest kept solution, weighted as the analyzer weighs its
+problems (see LogicAnalyzer.weightProblems).
+"""
+
+from .Common import print1, printExit, printWarning
+from . import YAMLIO
+
+import bisect
+import os
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+################################################################################
+# Problem Size Weights
+################################################################################
+def readSizeWeights(fileName):
+    """
+    Reads how often each problem size is used, as a dict of size tuple ->
+    weight, from either
+      - a YAML (or JSON) list of [size, weight] pairs, or
+      - a rocBLAS log of rocblas-bench command lines (ROCBLAS_LAYER=2), where
+        each GEMM call counts once with size [m, n, batch_count, k].
+    """
+    if os.path.splitext(fileName)[1] in [".yaml", ".yml", ".json"]:
+        sizeWeights = {}
+        for (size, weight) in YAMLIO.readConfig(fileName):
+            size = tuple(size)
+            sizeWeights[size] = sizeWeights.get(size, 0) + weight
+        return sizeWeights
+
+    try:
+        logFile = open(fileName, "r")
+    except IOError:
+        printExit("Cannot open file: %s" % fileName)
+    sizeWeights = {}
+    with logFile:
+        for line in logFile:
+            size = rocblasBenchSize(line.split())
+            if size is not None:
+                sizeWeights[size] = sizeWeights.get(size, 0) + 1
+    return sizeWeights
+
+def rocblasBenchSize(args):
+    if "rocblas-bench" not in " ".join(args[:1]) or "-f" not in args:
+        return None
+    function = args[args.index("-f") + 1] if args.index("-f") + 1 < len(args) else ""
+    if "gemm" not in function:
+        return None
+    values = {"-m": 1, "-n": 1, "-k": 1, "--batch_count": 1, "--batch": 1}
+    for (option, value) in zip(args, args[1:]):
+        if option in values:
+            try:
+                values[option] = int(value)
+            except ValueError:
+                return None
+    return (values["-m"], values["-n"], max(values["--batch_count"], values["--batch"]), values["-k"])
+
+def nearestIndex(sizes, size):
+    idx = bisect.bisect_left(sizes, size)
+    if idx == len(sizes) or (idx > 0 and size - sizes[idx-1] <= sizes[idx] - size):
+        return max(idx - 1, 0)
+    return idx
+
+
+################################################################################
+# Selection Problem: predicted times of the solutions of a LogicAnalyzer
+################################################################################
+class SelectionProblem:
+    def __init__(self, analyzer):
+        self.numSolutions = analyzer.numSolutions
+        if analyzer.problemWeights is None:
+            self.weights = numpy.ones(analyzer.totalProblems)
+        else:
+            self.weights = numpy.array(analyzer.problemWeights, dtype=numpy.float64)
+        gflops = numpy.asarray(analyzer.data, dtype=numpy.float32) \
+                .reshape(analyzer.totalProblems, analyzer.numSolutions).astype(numpy.float64)
+        flops = numpy.array([float(f) for f in analyzer.problemFlops()])
+        with numpy.errstate(divide="ignore"):
+            # weighted ms of each problem with each solution, inf if it failed
+            self.times = numpy.where(gflops > 0, (flops / 1000000.0)[:, None] / gflops, numpy.inf)
+
+        # solutions which win a used exact size are always kept
+        self.required = set([s for s in analyzer.requiredExactWinners() if s >= 0])
+
+    def fastest(self, solutions):
+        if len(solutions) == 0:
+            return numpy.full(len(self.times), numpy.inf)
+        return self.times[:, sorted(solutions)].min(axis=1)
+
+    def predictedTime(self, solutions):
+        """
+        (predicted ms, number of problems no solution is valid for)
+        """
+        fastest = self.fastest(solutions)
+        covered = numpy.isfinite(fastest)
+        return (float(fastest[covered].sum()), int((~covered).sum()))
+
+    def curve(self, order):
+        """
+        Predicted ms of keeping the first 1, 2, ... solutions of order.
+        """
+        fastest = numpy.minimum.accumulate(self.times[:, order], axis=1)
+        return numpy.where(numpy.isfinite(fastest), fastest, 0).sum(axis=0).tolist()
+
+
+################################################################################
+# Selectors
+################################################################################
+class SolutionSelector:
+    """
+    Chooses the solutions a LogicAnalyzer keeps.  Subclasses implement
+    order(), the solutions in the order they are kept, and stop(), how many
+    of them to keep; apply() prunes the others from the analyzer.
+    """
+    Name = None
+
+    def __init__(self, analyzer):
+        self.analyzer = analyzer
+        self.parameters = analyzer.parameters
+
+    def problem(self):
+        if getattr(self, "selectionProblem", None) is None:
+            self.selectionProblem = SelectionProblem(self.analyzer)
+        return self.selectionProblem
+
+    def budget(self):
+        return self.parameters.get("MaxSolutions", 0)
+
+    def select(self):
+        order = self.order()
+        return set(order[:self.stop(order)])
+
+    def apply(self):
+        problem = self.problem()
+        keep = self.select() | problem.required
+        if self.budget() > 0 and len(keep) > self.budget():
+            printWarning("%s: %u solutions win exact sizes, more than MaxSolutions=%u" \
+                    % (self.Name, len(problem.required), self.budget()))
+        (predictedMs, uncovered) = problem.predictedTime(keep)
+        print1("# %s keeps %u of %u solutions, predicted time %.3f ms" \
+                % (self.Name, len(keep), self.analyzer.numSolutions, predictedMs))
+        if uncovered > 0:
+            printWarning("%s: no kept solution is valid for %u problems" % (self.Name, uncovered))
+        self.analyzer.pruneSolutions(keep)
+
+
+class LeastImportantSelector(SolutionSelector):
+    """
+    SolutionSelectionAlg 0: LogicAnalyzer.removeLeastImportantSolutions.
+    """
+    Name = "removeLeastImportantSolutions"
+
+    def apply(self):
+        self.analyzer.removeLeastImportantSolutions()
+
+    def kept(self):
+        """
+        The solutions apply() keeps, without removing any of them.
+        """
+        analyzer = self.analyzer
+        exactWinners = dict([(size, list(winner)) for (size, winner) in analyzer.exactWinners.items()])
+        try:
+            analyzer.deactivateLeastImportantSolutions()
+            return set(analyzer.activeSolutionIndices())
+        finally:
+            analyzer.exactWinners = exactWinners
+            analyzer.resetActiveSolutions()
+
+
+class WinnerSelector(SolutionSelector):
+    """
+    SolutionSelectionAlg 1: LogicAnalyzer.keepWinnerSolutions.
+    """
+    Name = "keepWinnerSolutions"
+
+    def apply(self):
+        self.analyzer.keepWinnerSolutions()
+
+    def kept(self):
+        """
+        The solutions apply() keeps, without removing any of them.
+        """
+        return self.analyzer.rangeWinners() | self.analyzer.requiredExactWinners()
+
+
+class GreedySelector(SolutionSelector):
+    """
+    SolutionSelectionAlg 2: greedy set cover, then greedy marginal gain.
+    Starting from the solutions which win exact sizes, repeatedly keeps the
+    solution which is valid for the most problems no kept solution is valid
+    for (the fastest on them of equal ones) and, once every problem is
+    covered, the one which saves the most predicted time.  Stops at
+    MaxSolutions solutions or, without a budget, once the best solution
+    saves less than SolutionImportanceMin of the predicted time.
+    """
+    Name = "greedy"
+
+    def order(self):
+        problem = self.problem()
+        order = sorted(problem.required)
+        self.gains = [0.0] * len(order)
+        fastest = problem.fastest(order)
+        candidates = [s for s in range(0, problem.numSolutions) if s not in problem.required]
+        while len(candidates) > 0:
+            times = problem.times[:, candidates]
+            uncovered = ~numpy.isfinite(fastest)
+            newlyCovered = numpy.isfinite(times) & uncovered[:, None]
+            covers = newlyCovered.sum(axis=0)
+            coverMs = numpy.where(newlyCovered, times, 0).sum(axis=0)
+            with numpy.errstate(invalid="ignore"):
+                saved = numpy.where(uncovered[:, None], 0, numpy.maximum(fastest[:, None] - times, 0)).sum(axis=0)
+            # most problems covered, fastest on them, then most time saved, then lowest index
+            best = max(range(0, len(candidates)), key=lambda c: (covers[c], -coverMs[c], saved[c], -c))
+            if covers[best] == 0 and saved[best] <= 0:
+                break
+            order.append(candidates[best])
+            self.gains.append(float(saved[best]) if covers[best] == 0 else numpy.inf)
+            fastest = numpy.minimum(fastest, times[:, best])
+            del candidates[best]
+        return order
+
+    def stop(self, order):
+        if self.budget() > 0:
+            return min(self.budget(), len(order))
+        totalMs = self.problem().predictedTime(order)[0]
+        count = len(order)
+        while count > len(self.problem().required) \
+                and self.gains[count-1] < self.parameters["SolutionImportanceMin"] * totalMs:
+            count -= 1
+        return count
+
+
+class TopKSelector(SolutionSelector):
+    """
+    SolutionSelectionAlg 3: top K under budget.  Ranks the solutions by the
+    predicted time they save, over the second fastest solution, on the
+    problems they are fastest for and keeps the MaxSolutions best (all of
+    those which save any time without a budget), plus the solutions which
+    win exact sizes.
+    """
+    Name = "top-K"
+
+    def order(self):
+        problem = self.problem()
+        times = problem.times
+        if problem.numSolutions > 1:
+            ranked = numpy.argsort(times, axis=1, kind="stable")[:, :2]
+            rows = numpy.arange(len(times))
+            first = times[rows, ranked[:, 0]]
+            second = times[rows, ranked[:, 1]]
+            with numpy.errstate(invalid="ignore"):
+                saved = numpy.where(numpy.isfinite(first), second - first, 0)
+            # saving all of the time of a problem only one solution is valid for
+            saved = numpy.where(numpy.isinf(saved), first, saved)
+            self.saved = numpy.bincount(ranked[:, 0], weights=saved, minlength=problem.numSolutions)
+        else:
+            self.saved = numpy.zeros(problem.numSolutions)
+        ranking = sorted(range(0, problem.numSolutions), key=lambda s: (-self.saved[s], s))
+        return sorted(problem.required) + [s for s in ranking if s not in problem.required]
+
+    def stop(self, order):
+        count = len([s for s in order if s in self.problem().required or self.saved[s] > 0])
+        if self.budget() > 0:
+            return min(self.budget(), count)
+        return count
+
+
+Selectors = {0: LeastImportantSelector,
+             1: WinnerSelector,
+             2: GreedySelector,
+             3: TopKSelector}
+
+def registerSelector(solutionSelectionAlg, selectorClass):
+    Selectors[solutionSelectionAlg] = selectorClass
+
+def getSelector(solutionSelectionAlg, analyzer):
+    if solutionSelectionAlg not in Selectors:
+        printExit("Bad SolutionSelectionAlg=%s, expected one of %s" % (solutionSelectionAlg, sorted(Selectors.keys())))
+    selectorClass = Selectors[solutionSelectionAlg]
+    if numpy is None and selectorClass not in [LeastImportantSelector, WinnerSelector]:
+        printExit("SolutionSelectionAlg=%u requires NumPy" % solutionSelectionAlg)
+    return selectorClass(analyzer)
+
+
+################################################################################
+# Report: predicted time vs kernel count of each selector
+################################################################################
+def report(analyzer):
+    """
+    Prints the predicted time of keeping 1, 2, ... solutions in the order of
+    each selector which orders solutions, and where each selector stops.
+    """
+    problem = SelectionProblem(analyzer)
+    curves = []
+    for (alg, selectorClass) in sorted(Selectors.items()):
+        selector = selectorClass(analyzer)
+        selector.selectionProblem = problem
+        if hasattr(selector, "order"):
+            order = selector.order()
+            curves.append((selector.Name, problem.curve(order), selector.stop(order)))
+        else:
+            # selectors which only prune the analyzer: where they end up
+            kept = selector.kept()
+            (predictedMs, _) = problem.predictedTime(kept)
+            print1("# %s: %u kernels, predicted time %.3f ms" % (selector.Name, len(kept), predictedMs))
+
+    print1("# Predicted time (ms) vs kernels:")
+    print1("# %7s" % "kernels" + "".join([" %16s" % name for (name, _, _) in curves]))
+    for count in range(1, analyzer.numSolutions + 1):
+        line = "# %7u" % count
+        for (_, curve, stop) in curves:
+            if count <= len(curve):
+                line += " %15.3f%s" % (curve[count-1], "*" if count == stop else " ")
+            else:
+                line += " %16s" % ""
+        print1(line)
+    print1("# (* where each selector stops)")
+    return curves
@@ -23,12 +23,19 @@ import sys,traceback
 from .Common import globalParameters, defaultProblemType, assignParameterWithDefault, printExit, assignParameterRequired, defaultSolution, validParameters, print1
 from copy import deepcopy
 import math
-from .Utils import roundUpToNearestMultiple
+from .Utils import roundUpToNearestMultiple, fingerprint
 from .DataType import DataType
+from . import SolutionCache
+
+# reasons of the rejections of the solution being built, kept with it in the
+# solution cache
+rejectionReasons = None
 
 ########################################
 # Print a reject message :
 def reject(state, *args):
+  if rejectionReasons is not None:
+    rejectionReasons.append(" ".join([str(a) for a in args]))
   if globalParameters["PrintSolutionRejectionReason"]:
     sys.stdout.write("\nreject: ")
     for a in args:
@@ -569,7 +576,21 @@ class Solution:
 
   ########################################
   def __init__(self, config):
+    global rejectionReasons
     self._name = None
+
+    cache = SolutionCache.current()
+    if cache is not None:
+      cacheKey = cache.key(config)
+      cached = cache.fetch(cacheKey)
+      if cached is not None:
+        (self._state, reasons, self._name) = cached
+        if globalParameters["PrintSolutionRejectionReason"]:
+          for reason in reasons:
+            sys.stdout.write("\nreject: ")
+            print("%s (cached)" % reason)
+        return
+
     config = deepcopy(config)
 
     self._state = {}
@@ -596,8 +617,15 @@ class Solution:
     self["Valid"] = True
     self["AssignedProblemIndependentDerivedParameters"] = False
     self["AssignedDerivedParameters"] = False
-    Solution.assignDerivedParameters(self._state)
+    rejectionReasons = []
+    try:
+      Solution.assignDerivedParameters(self._state)
+      reasons = rejectionReasons
+    finally:
+      rejectionReasons = None
     self._name = None
+    if cache is not None:
+      cache.store(cacheKey, self, reasons)
 
   ########################################
   # get a list of kernel parameters for this solution
@@ -1806,6 +1834,15 @@ class Solution:
       printExit("Parameter \"%s\" is new object type" % str(value) )
       return str(value)
 
+  ########################################
+  # Get Fingerprint
+  # canonical hash of the parameters which identify a kernel, i.e. the same
+  # parameters which make up the full name
+  @staticmethod
+  def getFingerprint(state):
+    return fingerprint(dict([(key, state[key]) for key in state \
+        if key == "ProblemType" or key in validParameters]))
+
   # make class look like dict
   def keys(self):
     return list(self._state.keys())
@@ -1839,3 +1876,58 @@ class Solution:
       return result
     return not result
 
+
+################################################################################
+# Solution Set
+################################################################################
+class SolutionSet:
+  """
+  Insertion-ordered collection of unique solutions or kernel dictionaries.
+  Solutions are keyed on their full name, as Solution.__eq__ compares them,
+  and kernels on Solution.getFingerprint, so adding n items costs O(n)
+  rather than the O(n^2) of "if x not in list: list.append(x)".
+  """
+
+  def __init__(self, items=None):
+    self._items = []
+    self._index = {}
+    if items is not None:
+      self.update(items)
+
+  @staticmethod
+  def key(item):
+    if isinstance(item, Solution):
+      return str(item)
+    return Solution.getFingerprint(item)
+
+  def add(self, item):
+    """
+    Appends item unless an equivalent item is already present.
+    Returns True if item was added.
+    """
+    key = SolutionSet.key(item)
+    if key in self._index:
+      return False
+    self._index[key] = len(self._items)
+    self._items.append(item)
+    return True
+
+  def update(self, items):
+    for item in items:
+      self.add(item)
+
+  def index(self, item):
+    return self._index[SolutionSet.key(item)]
+
+  def remove(self, item):
+    del self._items[self.index(item)]
+    self._index = dict([(SolutionSet.key(i), idx) for (idx, i) in enumerate(self._items)])
+
+  def __contains__(self, item):
+    return SolutionSet.key(item) in self._index
+  def __len__(self):
+    return len(self._items)
+  def __iter__(self):
+    return iter(self._items)
+  def __getitem__(self, idx):
+    return self._items[idx]
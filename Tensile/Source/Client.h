@@ -34,6 +34,8 @@
 #include <sys/time.h>
 #include <unistd.h>
 #include <set>
+#include <sstream>
+#include <vector>
 #include <assert.h>
 
 TensileTimer timer;
@@ -64,6 +66,8 @@ unsigned int sleepPercent;
 unsigned int solutionStartIdx;
 unsigned int numSolutions;
 unsigned int runBenchmarkSolutions = 0;
+unsigned int problemStartIdx;
+unsigned int resumeSolutionIdx;
 #endif
 
 // benchmark parameters commandline strings
@@ -98,6 +102,8 @@ const std::string keyStrideD = "--stride_d";
 const std::string keySolutionStartIdx = "--solution-start-idx";
 const std::string keyNumSolutions = "--num-solutions";
 const std::string keyBenchmarkSolutions = "--benchmark-solutions";
+const std::string keyProblemStartIdx = "--problem-start-idx";
+const std::string keyResumeSolutionIdx = "--resume-solution-idx";
 #endif
 
 // benchmark parameters default values
@@ -130,6 +136,8 @@ unsigned int strideD = std::numeric_limits<unsigned int>::max();
 const unsigned int defaultSolutionStartIdx = 0;
 const unsigned int defaultNumSolutions = maxNumSolutions;
 const unsigned int defaultBenchmarkSolutions = 0;
+const unsigned int defaultProblemStartIdx = 0;
+const unsigned int defaultResumeSolutionIdx = 0;
 #endif
 
 // benchmark parameters for library client
@@ -143,6 +151,7 @@ const unsigned int defaultSize = 128;
 #if Tensile_CLIENT_BENCHMARK
 const size_t solutionKeySize = 4;
 std::set<unsigned int> invalidSolutions;
+std::vector<double> resumedGFlops; // results of the row a resumed benchmark continues
 std::map<std::vector<unsigned int>, std::set<std::pair<unsigned int,double>>> solutionBenchmarks;
 std::map<std::vector<unsigned int>, std::pair<unsigned int,double>> solutionMaxPeformance;
 #endif
@@ -1212,6 +1221,37 @@ bool benchmarkAllSolutions(
 } // benchmark solutions
 #endif // benchmark client
 
+/*******************************************************************************
+ * read resumed results
+ * reads the results of the solutions before resumeSolutionIdx from the
+ * unfinished last row of the results file into resumedGFlops; prefixColumns
+ * are the problem index, sizes and flops which precede them
+ ******************************************************************************/
+#if Tensile_CLIENT_BENCHMARK
+void readResumedResults(unsigned int prefixColumns) {
+  std::ifstream resultsFile(resultsFileName);
+  std::string line;
+  std::string lastLine;
+  while (std::getline(resultsFile, line)) {
+    lastLine = line;
+  }
+
+  resumedGFlops.clear();
+  std::stringstream cells(lastLine);
+  std::string cell;
+  for (unsigned int column = 0; std::getline(cells, cell, ','); column++) {
+    if (column >= prefixColumns) {
+      resumedGFlops.push_back(atof(cell.c_str()));
+    }
+  }
+  if (resumedGFlops.size() != resumeSolutionIdx) {
+    std::cout << "Tensile::FATAL: " << keyResumeSolutionIdx << " " << resumeSolutionIdx << " but the last row of "
+      << resultsFileName << " holds " << resumedGFlops.size() << " results" << std::endl;
+    exit(1);
+  }
+}
+#endif
+
 /*******************************************************************************
  * benchmark all solutions for problem size
  * return true if error/invalids
@@ -1291,14 +1331,21 @@ bool benchmarkAllSolutionsForSize(
   size_t sizeToCopyD = currentMemorySizeD*bytesPerElement[dataTypeIdx];
   size_t sizeToCopyC = currentMemorySizeC*bytesPerElement[dataTypeIdx];
 
-  file << problemIdx << ", " << sizes[0];
-  for (unsigned int i = 1; i < totalIndices[problemTypeIdx]+numIndicesLD; i++) {
-    file << ", " << sizes[i];
-  }
+  // a resumed row already holds its sizes and the results of the solutions
+  // before resumeSolutionIdx
   size_t totalFlops = numFlopsPerMac[dataTypeIdx];
   for (unsigned int i = 0; i < totalIndices[problemTypeIdx]; i++) {
     totalFlops *= sizes[i]; }
-  file << ", " << totalFlops;
+  unsigned int firstSolutionIdx = solutionStartIdx;
+  if (problemIdx == problemStartIdx && resumeSolutionIdx > 0) {
+    firstSolutionIdx += resumeSolutionIdx;
+  } else {
+    file << problemIdx << ", " << sizes[0];
+    for (unsigned int i = 1; i < totalIndices[problemTypeIdx]+numIndicesLD; i++) {
+      file << ", " << sizes[i];
+    }
+    file << ", " << totalFlops;
+  }
 
   if (specializeAB) {
     if (initA==5) {
@@ -1396,7 +1443,28 @@ bool benchmarkAllSolutionsForSize(
 
   fastestGFlops = 0;
   *problem_gpu_time_ms = 0;
-  for (unsigned int solutionIdx = solutionStartIdx; solutionIdx < solutionStartIdx + numSolutions; solutionIdx ++) {
+  // the solutions a resumed row already holds results of count as measured
+  for (unsigned int solutionIdx = solutionStartIdx; solutionIdx < firstSolutionIdx; solutionIdx ++) {
+    double gflops = resumedGFlops[solutionIdx - solutionStartIdx];
+    if (gflops > fastestGFlops) {
+      fastestGFlops = gflops;
+      fastestIdx = solutionIdx;
+      if (fastestGFlops > globalFastestGFlops) {
+        globalFastestGFlops = fastestGFlops;
+        globalFastestTime = totalFlops / gflops;
+        globalFastestIdx = fastestIdx;
+      }
+    }
+    if (gflops < 0) {
+      invalidSolutions.insert(solutionIdx);
+    }
+    solutionPerf[problemIdx][solutionIdx ] = static_cast<float>(gflops);
+  }
+  if (firstSolutionIdx > solutionStartIdx) {
+    std::cout << "Tensile::INFO: read the results of solutions " << solutionStartIdx << " to " << firstSolutionIdx-1
+      << " from " << resultsFileName << std::endl;
+  }
+  for (unsigned int solutionIdx = firstSolutionIdx; solutionIdx < solutionStartIdx + numSolutions; solutionIdx ++) {
     bool solutionIsValid = true;
 
     // validate solution
@@ -1706,7 +1774,8 @@ bool benchmarkAllSolutionsForSize(
       gflops = -1.0;
       invalidSolutions.insert(solutionIdx);
     }
-    file << ", " << gflops;
+    // flushed so that an interrupted benchmark keeps the results of the row
+    file << ", " << gflops << std::flush;
     solutionPerf[problemIdx][solutionIdx ] = static_cast<float>(gflops);
   } // solution loop
 
@@ -1862,18 +1931,26 @@ bool benchmarkProblemSizes(
     DestDataType *deviceOnHostC) {
   bool returnInvalids = false;
 
-  // write benchmark data column headers
+  // write benchmark data column headers, or append to the results of an
+  // interrupted benchmark
   std::cout << std::endl;
-  file.open(resultsFileName);
-  file << "GFlops";
-  for ( unsigned int i = 0; i < totalIndices[problemTypeIdx]; i++) {
-    file << ", Size" << indexChars[i];
-  }
-  file << ", LDD, LDC, LDA, LDB, TotalFlops";
-  for ( unsigned int s = 0; s < numSolutions; s++) {
-    file << ", " << solutions[s]._name;
+  if (problemStartIdx > 0 || resumeSolutionIdx > 0) {
+    if (resumeSolutionIdx > 0) {
+      readResumedResults(1 + totalIndices[problemTypeIdx] + numIndicesLD + 1);
+    }
+    file.open(resultsFileName, std::ios::app);
+  } else {
+    file.open(resultsFileName);
+    file << "GFlops";
+    for ( unsigned int i = 0; i < totalIndices[problemTypeIdx]; i++) {
+      file << ", Size" << indexChars[i];
+    }
+    file << ", LDD, LDC, LDA, LDB, TotalFlops";
+    for ( unsigned int s = 0; s < numSolutions; s++) {
+      file << ", " << solutions[s]._name;
+    }
+    file << std::endl;
   }
-  file << std::endl;
 
 //#if Tensile_RUNTIME_LANGUAGE_OCL
   //if (!numElementsToValidate) {
@@ -1897,7 +1974,7 @@ bool benchmarkProblemSizes(
   // iterate over all problem sizes
   double gpu_time_ms = 0;
 
-  for (unsigned int problemIdx = 0; problemIdx < numProblems; problemIdx++ ) {
+  for (unsigned int problemIdx = problemStartIdx; problemIdx < numProblems; problemIdx++ ) {
  
     // print size
     std::cout << "Problem[" << problemIdx << "/" << numProblems << "]: " << problemSizes[problemIdx][0];
@@ -2256,6 +2333,8 @@ void printClientUsage(std::string executableName) {
   std::cout << "  " << keySolutionStartIdx << " [" << defaultSolutionStartIdx << "]" << std::endl;  
   std::cout << "  " << keyNumSolutions << " [" << defaultNumSolutions << "]" << std::endl;  
   std::cout << "  " << keyBenchmarkSolutions << " [" << defaultBenchmarkSolutions << "]" << std::endl;
+  std::cout << "  " << keyProblemStartIdx << " [" << defaultProblemStartIdx << "]" << std::endl;
+  std::cout << "  " << keyResumeSolutionIdx << " [" << defaultResumeSolutionIdx << "]" << std::endl;
 #endif
 }
 
@@ -2296,6 +2375,8 @@ void parseCommandLineParameters( int argc, char *argv[] ) {
   solutionStartIdx = defaultSolutionStartIdx;
   numSolutions = defaultNumSolutions;
   runBenchmarkSolutions = defaultBenchmarkSolutions;
+  problemStartIdx = defaultProblemStartIdx;
+  resumeSolutionIdx = defaultResumeSolutionIdx;
 #endif
 
   try {
@@ -2481,6 +2562,14 @@ void parseCommandLineParameters( int argc, char *argv[] ) {
       } else if (keyBenchmarkSolutions == argv[argIdx]) {
         argIdx++;
         runBenchmarkSolutions = static_cast<unsigned int>(atoi(argv[argIdx]));
+
+      // first problem, and first solution of its row, of a resumed benchmark
+      } else if (keyProblemStartIdx == argv[argIdx]) {
+        argIdx++;
+        problemStartIdx = static_cast<unsigned int>(atoi(argv[argIdx]));
+      } else if (keyResumeSolutionIdx == argv[argIdx]) {
+        argIdx++;
+        resumeSolutionIdx = static_cast<unsigned int>(atoi(argv[argIdx]));
       }
 #endif
       // unrecognized
@@ -2495,6 +2584,13 @@ void parseCommandLineParameters( int argc, char *argv[] ) {
       std::cout << "Tensile::FATAL: " << keySolutionStartIdx << " " << solutionStartIdx << " + " << keyNumSolutions << " " << numSolutions << " must be less than maxNumSolutions " << maxNumSolutions  << std::endl;
       throw -1;
     }
+    // each pass rewrites the results file, so a benchmark of more than one
+    // pass can't be resumed by appending to it
+    if ((problemStartIdx > 0 || resumeSolutionIdx > 0) && numBenchmarks > 1) {
+      std::cout << "Tensile::FATAL: " << keyProblemStartIdx << " and " << keyResumeSolutionIdx
+        << " can't resume a benchmark of " << keyNumBenchmarks << " " << numBenchmarks << " passes" << std::endl;
+      throw -1;
+    }
 #endif
   } catch (...) {
     printClientUsage(executableName);
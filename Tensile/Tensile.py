@@ -31,6 +31,7 @@ from .Common import globalParameters, print1, ensurePath, \
 from . import BenchmarkProblems
 from . import ClientWriter
 from . import LibraryLogic
+from . import SolutionCache
 from . import YAMLIO
 from . import __version__
 
@@ -85,6 +86,8 @@ def executeStepsInConfig( config ):
     ClientWriter.main( libraryClientConfig )
     print1("")
 
+  SolutionCache.finish()
+
 
 ################################################################################
 # Tensile
@@ -121,6 +124,8 @@ def Tensile(userArgs):
       help="use serial kernel and solution names")
   argParser.add_argument("--no-merge-files", dest="noMergeFiles", action="store_true", \
       help="kernels and solutions written to individual files")
+  argParser.add_argument("--force-reprobe-asm-caps", dest="forceReprobeAsmCaps", action="store_true", \
+      help="probe the assembler capabilities instead of reading them from the cache")
   # argParser.add_argument("--hcc-version", dest="HccVersion", \
   #     help="This can affect what opcodes are emitted by the assembler")
 
@@ -143,10 +148,12 @@ def Tensile(userArgs):
   globalParameters["ConfigPath"] = configPath
 
   # assign global parameters
-  if "GlobalParameters" in config:
-    assignGlobalParameters( config["GlobalParameters"] )
-  else:
-    assignGlobalParameters({})
+  globalConfig = config["GlobalParameters"] if "GlobalParameters" in config else {}
+  if args.forceReprobeAsmCaps:
+    # needed while assigning the global parameters, where the assembler is probed
+    print1("# Command-line override: ForceReprobeAsmCaps")
+    globalConfig["ForceReprobeAsmCaps"] = True
+  assignGlobalParameters( globalConfig )
 
   globalParameters["OutputPath"] = ensurePath(os.path.abspath(args.output_path))
   globalParameters["WorkingPath"] = globalParameters["OutputPath"]
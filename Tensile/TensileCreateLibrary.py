@@ -26,14 +26,17 @@ if __name__ == "__main__":
 
 from . import Common
 from . import EmbeddedData
+from . import SolutionCache
 from . import Utils
 from . import YAMLIO
-from .Common import globalParameters, HR, print1, print2, printExit, ensurePath, \
+from .Common import globalParameters, HR, print1, print2, printExit, printWarning, ensurePath, \
                    CHeader, CMakeHeader, assignGlobalParameters, ProgressBar, \
                    listToInitializer
+from .KernelCache import KernelBuildCache
+from .LibraryManifest import LibraryManifest
 from .KernelWriterAssembly import KernelWriterAssembly
 from .KernelWriterSource import KernelWriterSource
-from .SolutionStructs import Solution
+from .SolutionStructs import Solution, SolutionSet
 from .SolutionWriter import SolutionWriter
 
 import argparse
@@ -63,6 +66,78 @@ def processKernelSource(kernel, kernelWriterSource, kernelWriterAssembly):
 
     return (err, src, header, kernelName)
 
+def assembleKernelBatch(kernelWriterAssembly, asmDir, isa, kernelNames):
+    """
+    Assembles the .s files of kernelNames, which all target isa, with a single
+    assembler invocation and links each object into its own code object.
+    Returns (err, source, kernelName) for each kernel, source being its code
+    object byte array definition as returned by getSourceFileString.
+    """
+    try:
+        args = kernelWriterAssembly.getBatchCompileArgs(isa, [name + '.s' for name in kernelNames])
+        subprocess.check_call(args, cwd=asmDir)
+    except subprocess.CalledProcessError as exc:
+        if len(kernelNames) == 1:
+            print(exc)
+            return [(-1, "", kernelNames[0])]
+        # assemble the kernels of the failed batch one by one to find the broken ones
+        return list(itertools.chain(*[assembleKernelBatch(kernelWriterAssembly, asmDir, isa, [name]) \
+                                      for name in kernelNames]))
+
+    results = []
+    for kernelName in kernelNames:
+        coFile = os.path.join(asmDir, kernelName + '.co')
+        try:
+            args = kernelWriterAssembly.getLinkCodeObjectArgs([kernelName + '.o'], coFile)
+            subprocess.check_call(args, cwd=asmDir)
+        except subprocess.CalledProcessError as exc:
+            print(exc)
+            results.append((-1, "", kernelName))
+            continue
+
+        if globalParameters["CodeFromFiles"]:
+            results.append((0, "", kernelName))
+        else:
+            results.append((0, kernelWriterAssembly.getFileCobaDefinition(kernelName, coFile), kernelName))
+    return results
+
+def assembleKernelBatches(kernels, results, kernelWriterAssembly):
+    """
+    Assembles the assembly kernels whose .s files were written by
+    processKernelSource, in batches of at most AssemblerBatchSize kernels
+    with the same ISA, spread over the processing pool.
+
+    results holds the (err, source, header, kernelName) of each kernel and is
+    updated in place with the result of assembling it.
+    """
+    asmDir = kernelWriterAssembly.getAssemblyDirectory()
+
+    archs = collections.OrderedDict()
+    for kernIdx, kernel in enumerate(kernels):
+        if kernel['KernelLanguage'] == 'Assembly' and results[kernIdx][0] == 0:
+            archs.setdefault(tuple(kernel['ISA']), []).append(kernIdx)
+    numKernels = sum([len(indices) for indices in archs.values()])
+    if numKernels == 0:
+        return
+
+    # keep every thread busy when there are few kernels
+    batchSize = min(globalParameters["AssemblerBatchSize"], \
+                    Utils.ceil_divide(numKernels, max(Common.CPUThreadCount(), 1)))
+
+    batches = []
+    for isa, indices in archs.items():
+        for start in range(0, len(indices), batchSize):
+            batches.append((isa, indices[start:start+batchSize]))
+
+    args = [(kernelWriterAssembly, asmDir, isa, [results[kernIdx][3] for kernIdx in indices]) \
+            for (isa, indices) in batches]
+    batchResults = Common.ParallelMap(assembleKernelBatch, args, "Assembling kernels", method=lambda x: x.starmap)
+
+    for (isa, indices), batchResult in zip(batches, batchResults):
+        for kernIdx, (err, src, kernelName) in zip(indices, batchResult):
+            header = results[kernIdx][2]
+            results[kernIdx] = (err, src, header, kernelName)
+
 def getAssemblyCodeObjectFiles(kernels, kernelWriterAssembly, outputPath):
     destDir = ensurePath(os.path.join(outputPath, 'library'))
     asmDir = kernelWriterAssembly.getAssemblyDirectory()
@@ -295,8 +370,34 @@ def writeSolutionsAndKernels(outputPath, CxxCompiler, problemTypes, solutions, k
 
   prepAsm()
 
-  kIter = zip(kernels, itertools.repeat(kernelWriterSource), itertools.repeat(kernelWriterAssembly))
-  results = Common.ParallelMap(processKernelSource, kIter, "Generating kernels", method=lambda x: x.starmap)
+  def kernelWriterFor(kernel):
+    return kernelWriterSource if kernel["KernelLanguage"] == "Source" else kernelWriterAssembly
+
+  # kernels found in the build cache skip both generation and assembly
+  kernelCache = KernelBuildCache.FromGlobalParameters()
+  results = [None] * len(kernels)
+  if kernelCache is not None:
+    cacheKeys = [kernelCache.key(kernel, kernelWriterFor(kernel)) for kernel in kernels]
+    for kernIdx, kernel in enumerate(kernels):
+      results[kernIdx] = kernelCache.fetch(cacheKeys[kernIdx], kernel, kernelWriterFor(kernel))
+  missIndices = [kernIdx for kernIdx in range(0, len(kernels)) if results[kernIdx] is None]
+
+  kIter = zip([kernels[kernIdx] for kernIdx in missIndices], \
+      itertools.repeat(kernelWriterSource), itertools.repeat(kernelWriterAssembly))
+  missResults = Common.ParallelMap(processKernelSource, kIter, "Generating kernels", method=lambda x: x.starmap)
+  for kernIdx, result in zip(missIndices, missResults):
+    results[kernIdx] = result
+
+  if globalParameters["AssemblerBatchSize"] > 0:
+    missResults = [results[kernIdx] for kernIdx in missIndices]
+    assembleKernelBatches([kernels[kernIdx] for kernIdx in missIndices], missResults, kernelWriterAssembly)
+    for kernIdx, result in zip(missIndices, missResults):
+      results[kernIdx] = result
+
+  if kernelCache is not None:
+    for kernIdx in missIndices:
+      kernel = kernels[kernIdx]
+      kernelCache.store(cacheKeys[kernIdx], kernel, kernelWriterFor(kernel), results[kernIdx])
   print(len(results))
 
   removeKernels = []
@@ -366,6 +467,10 @@ def writeSolutionsAndKernels(outputPath, CxxCompiler, problemTypes, solutions, k
   codeObjectFiles += buildSourceCodeObjectFiles(CxxCompiler, kernelFiles, outputPath)
   codeObjectFiles += getAssemblyCodeObjectFiles(kernelsToBuild, kernelWriterAssembly, outputPath)
 
+  if kernelCache is not None:
+    kernelCache.evict()
+    kernelCache.printStats()
+
   stop = time.time()
   print("# Kernel Building elapsed time = %.1f secs" % (stop-start))
 
@@ -529,12 +634,10 @@ def writeLogic(outputPath, logicData, solutionWriter ):
 
 
     # get solution naming for problem type
-    solutionsForProblemType = []
+    solutionsForProblemType = SolutionSet()
     for scheduleTuple in logicData[problemType]:
       solutionsForSchedule = scheduleTuple[2]
-      for solution in solutionsForSchedule:
-        if solution not in solutionsForProblemType:
-          solutionsForProblemType.append(solution)
+      solutionsForProblemType.update(solutionsForSchedule)
 
     # solution names for problem type
     solutionNamesForProblemType = []
@@ -955,6 +1058,27 @@ def TensileCreateLibrary():
 
   argParser.add_argument("--embed-library-key",      dest="EmbedLibraryKey", default=None,
                          help="Access key for embedding library files.")
+  argParser.add_argument("--kernel-cache",           dest="KernelCachePath", default=None,
+                         help="Directory of the kernel build cache; generated kernels are reused from here across runs.")
+  argParser.add_argument("--kernel-cache-max-size",  dest="KernelCacheMaxSize", type=int, default=4096,
+                         help="Maximum size of the kernel build cache in MiB.")
+  argParser.add_argument("--library-format",         dest="LibraryFormat",     choices=["yaml", "json"], action="store", default="yaml",
+                         help="Format of TensileLibrary.yaml; json is faster to write and remains valid YAML.")
+  argParser.add_argument("--library-exact-index",    dest="LibraryExactIndex", action="store_true",
+                         help="Write a hash index of the exact sizes of each matching table to TensileLibrary.yaml.")
+  argParser.add_argument("--library-nearest-index",  dest="LibraryNearestIndex", action="store_true",
+                         help="Write a KD-tree of the sizes of each Euclidean matching table to TensileLibrary.yaml.")
+  argParser.add_argument("--library-range-logic",    dest="LibraryRangeLogic", action="store_true",
+                         help="Write the exact and range logic of logic files with range logic to TensileLibrary.yaml as range logic libraries.")
+  argParser.add_argument("--incremental",            dest="Incremental",       action="store_true",
+                         help="Only re-read logic files and regenerate kernels which changed since the last build in OutputPath.")
+  argParser.add_argument("--no-incremental",         dest="Incremental",       action="store_false")
+  argParser.add_argument("--assembler-batch-size",   dest="AssemblerBatchSize", type=int, default=0,
+                         help="Assemble up to this many kernels for the same ISA per assembler invocation; 0 runs the assembler once per kernel.")
+  argParser.add_argument("--force-reprobe-asm-caps", dest="ForceReprobeAsmCaps", action="store_true",
+                         help="Probe the assembler capabilities again instead of reading them from the cache.")
+  argParser.add_argument("--ignore-bad-logic-files", dest="IgnoreBadLogicFiles", action="store_true",
+                         help="Report logic files which can't be read and build the library from the rest, instead of failing.")
   args = argParser.parse_args()
 
   logicPath = args.LogicPath
@@ -971,6 +1095,17 @@ def TensileCreateLibrary():
   arguments["LibraryPrintDebug"] = args.LibraryPrintDebug
   arguments["CodeFromFiles"] = False
   arguments["EmbedLibrary"] = args.EmbedLibrary
+  arguments["LibraryFormat"] = args.LibraryFormat
+  arguments["LibraryExactIndex"] = args.LibraryExactIndex
+  arguments["LibraryNearestIndex"] = args.LibraryNearestIndex
+  arguments["LibraryRangeLogic"] = args.LibraryRangeLogic
+  arguments["KernelCachePath"] = args.KernelCachePath
+  arguments["KernelCacheMaxSize"] = args.KernelCacheMaxSize
+  arguments["AssemblerBatchSize"] = args.AssemblerBatchSize
+  arguments["ForceReprobeAsmCaps"] = args.ForceReprobeAsmCaps
+  if args.Incremental and args.KernelCachePath is None:
+    # unchanged kernels are reused from the previous build through the kernel cache
+    arguments["KernelCachePath"] = os.path.join(outputPath, "incremental", "kernels")
   assignGlobalParameters(arguments)
 
   print1("# CodeObjectVersion from TensileCreateLibrary: %s" % arguments["CodeObjectVersion"])
@@ -987,103 +1122,165 @@ def TensileCreateLibrary():
   for logicFile in logicFiles:
     print1("#   %s" % logicFile)
 
-  ##############################################################################
-  # Parse config files
-  ##############################################################################
-  solutions = []
-  logicData = {} # keys are problemTypes, values are schedules
-  newMasterLibrary = None
+  # the solution cache is saved however the library writer finishes
+  try:
+    ##############################################################################
+    # Parse config files
+    ##############################################################################
+    solutions = SolutionSet()
+    logicData = {} # keys are problemTypes, values are schedules
+    newMasterLibrary = None
+
+    manifest = None
+    if args.Incremental:
+      manifest = LibraryManifest(outputPath, logicPath, [vars(args), KernelBuildCache.toolchainIdentity(), \
+          globalParameters["AsmCaps"], globalParameters["ArchCaps"]])
+      manifest.scanLogicFiles(logicFiles)
+      if manifest.upToDate():
+        print1("# Library in %s is up to date" % outputPath)
+        print1("# Tensile Library Writer DONE")
+        print1(HR)
+        print1("")
+        return
+      parsedLogic = manifest.iterLogicFiles(logicFiles, YAMLIO.parseLibraryLogicFile)
+      # a cached parse may be of another file with the same contents
+      parsedLogic = ((logicFiles[idx],) + tuple(result[1:]) for (idx, result) in parsedLogic)
+    else:
+      parsedLogic = Common.ParallelMap(YAMLIO.parseLibraryLogicFile, logicFiles, "Reading logic files", \
+          method=lambda x: x.imap_unordered)
+
+    # Workers only parse; the objects are built here as each file arrives, but
+    # merged in logicFiles order so that solution indices don't depend on which
+    # worker finished first.
+    logicFileIndices = dict([(logicFile, idx) for (idx, logicFile) in enumerate(logicFiles)])
+    pendingLogic = {}
+    nextLogic = 0
+    badLogicFiles = []
+    for (logicFile, data, error) in Utils.tqdm(parsedLogic, "Processing logic data"):
+      logic = None
+      if error is None:
+        try:
+          logic = YAMLIO.libraryLogicFromData(logicFile, data)
+        except SystemExit:
+          error = "invalid logic file"
+        except Exception as e:
+          error = "%s: %s" % (type(e).__name__, e)
+      if error is not None:
+        printWarning("Could not read logic file %s: %s" % (logicFile, error))
+        badLogicFiles.append(logicFile)
+
+      pendingLogic[logicFileIndices[logicFile]] = logic
+      while nextLogic in pendingLogic:
+        logic = pendingLogic.pop(nextLogic)
+        nextLogic += 1
+        if logic is None:
+          continue
+
+        (scheduleName, deviceNames, problemType, solutionsForSchedule, \
+           indexOrder, exactLogic, rangeLogic, newLibrary) = logic
+
+        if problemType not in logicData:
+          logicData[problemType] = []
+        logicData[problemType].append((scheduleName, deviceNames, \
+            solutionsForSchedule, indexOrder, exactLogic, rangeLogic ))
+        solutions.update(solutionsForSchedule)
+
+        if newMasterLibrary is None:
+            newMasterLibrary = newLibrary
+        else:
+            newMasterLibrary.merge(newLibrary)
+
+    if len(badLogicFiles) > 0:
+      if not args.IgnoreBadLogicFiles:
+        printExit("%u of %u logic files could not be read: %s" \
+            % (len(badLogicFiles), len(logicFiles), ", ".join(sorted(badLogicFiles))))
+      printWarning("Building the library without %u unreadable logic files" % len(badLogicFiles))
+    if newMasterLibrary is None:
+      printExit("No logic files were read from %s" % logicPath)
 
-  libraries = Common.ParallelMap(YAMLIO.readLibraryLogicForSchedule, logicFiles, "Reading logic files")
+    # create solution writer and kernel writer
+    kernels = SolutionSet()
+    kernelsBetaOnly = SolutionSet()
+    for solution in solutions:
+      kernels.update(solution.getKernels())
+      kernelsBetaOnly.update(solution.getKernelsBetaOnly())
 
-  for logic in Utils.tqdm(libraries, "Processing logic data"):
-    (scheduleName, deviceNames, problemType, solutionsForSchedule, \
-       indexOrder, exactLogic, rangeLogic, newLibrary) = logic
+    solutions = list(solutions)
+    kernels = list(kernels)
+    kernelsBetaOnly = list(kernelsBetaOnly)
 
-    if problemType not in logicData:
-      logicData[problemType] = []
-    logicData[problemType].append((scheduleName, deviceNames, \
-        solutionsForSchedule, indexOrder, exactLogic, rangeLogic ))
-    for solution in solutionsForSchedule:
-      if solution not in solutions:
-        solutions.append(solution)
+    # if any kernels are assembly, append every ISA supported
 
-    if newMasterLibrary is None:
-        newMasterLibrary = newLibrary
+    if globalParameters["ShortNames"] and not globalParameters["MergeFiles"]:
+      solutionSerialNaming = Solution.getSerialNaming(solutions)
+      kernelSerialNaming = Solution.getSerialNaming(kernels)
     else:
-        newMasterLibrary.merge(newLibrary)
-
-  # create solution writer and kernel writer
-  kernels = []
-  kernelsBetaOnly = []
-  for solution in solutions:
-    solutionKernels = solution.getKernels()
-    for kernel in solutionKernels:
-      if kernel not in kernels:
-        kernels.append(kernel)
-    solutionKernelsBetaOnly = solution.getKernelsBetaOnly()
-    for kernel in solutionKernelsBetaOnly:
-      if kernel not in kernelsBetaOnly:
-        kernelsBetaOnly.append(kernel)
-
-  # if any kernels are assembly, append every ISA supported
-
-  if globalParameters["ShortNames"] and not globalParameters["MergeFiles"]:
-    solutionSerialNaming = Solution.getSerialNaming(solutions)
-    kernelSerialNaming = Solution.getSerialNaming(kernels)
-  else:
-    solutionSerialNaming = None
-    kernelSerialNaming = None
-  solutionMinNaming = Solution.getMinNaming(solutions)
-  kernelMinNaming = Solution.getMinNaming(kernels)
-  solutionWriter = SolutionWriter( \
-      solutionMinNaming, solutionSerialNaming, \
-      kernelMinNaming, kernelSerialNaming)
-  kernelWriterSource = KernelWriterSource( \
-      kernelMinNaming, kernelSerialNaming)
-  kernelWriterAssembly = KernelWriterAssembly( \
-      kernelMinNaming, kernelSerialNaming)
-
-  libraryStaticFiles = [
-      "SolutionMapper.h",
-      "TensileTypes.h",
-      "tensile_bfloat16.h",
-      "KernelHeader.h",
-      "SolutionHelper.cpp",
-      "SolutionHelper.h",
-      "Tools.cpp",
-      "Tools.h" ]
-
-  # write cmake
-  clientName = "LibraryClient"
-  writeCMake(outputPath, solutions, kernels, libraryStaticFiles, clientName )
-
-  # write solutions and kernels
-  problemTypes = list(logicData.keys())
-  codeObjectFiles = writeSolutionsAndKernels(outputPath, CxxCompiler, problemTypes, solutions,
-                                             kernels, kernelsBetaOnly,
-                                             solutionWriter,
-                                             kernelWriterSource, kernelWriterAssembly)
-
-  # write logic
-  writeLogic(outputPath, logicData, solutionWriter)
-
-  newLibraryDir = ensurePath(os.path.join(outputPath, 'library'))
+      solutionSerialNaming = None
+      kernelSerialNaming = None
+    solutionMinNaming = Solution.getMinNaming(solutions)
+    kernelMinNaming = Solution.getMinNaming(kernels)
+    solutionWriter = SolutionWriter( \
+        solutionMinNaming, solutionSerialNaming, \
+        kernelMinNaming, kernelSerialNaming)
+    kernelWriterSource = KernelWriterSource( \
+        kernelMinNaming, kernelSerialNaming)
+    kernelWriterAssembly = KernelWriterAssembly( \
+        kernelMinNaming, kernelSerialNaming)
+
+    libraryStaticFiles = [
+        "SolutionMapper.h",
+        "TensileTypes.h",
+        "tensile_bfloat16.h",
+        "KernelHeader.h",
+        "SolutionHelper.cpp",
+        "SolutionHelper.h",
+        "Tools.cpp",
+        "Tools.h" ]
+
+    # write cmake
+    clientName = "LibraryClient"
+    writeCMake(outputPath, solutions, kernels, libraryStaticFiles, clientName )
+
+    # write solutions and kernels
+    problemTypes = list(logicData.keys())
+    codeObjectFiles = writeSolutionsAndKernels(outputPath, CxxCompiler, problemTypes, solutions,
+                                               kernels, kernelsBetaOnly,
+                                               solutionWriter,
+                                               kernelWriterSource, kernelWriterAssembly)
+
+    # write logic
+    writeLogic(outputPath, logicData, solutionWriter)
+
+    newLibraryDir = ensurePath(os.path.join(outputPath, 'library'))
   
-  masterFile = os.path.join(newLibraryDir, "TensileLibrary.yaml")
-  newMasterLibrary.applyNaming(kernelMinNaming)
-  YAMLIO.write(masterFile, Utils.state(newMasterLibrary))
-
-  if args.EmbedLibrary is not None:
-      embedFileName = os.path.join(outputPath, "library/{}.cpp".format(args.EmbedLibrary))
-      with EmbeddedData.EmbeddedDataFile(embedFileName) as embedFile:
-          embedFile.embed_file(newMasterLibrary.cpp_base_class, masterFile, nullTerminated=True,
-                               key=args.EmbedLibraryKey)
-
-          for co in Utils.tqdm(codeObjectFiles):
-              embedFile.embed_file("SolutionAdapter", co, nullTerminated=False,
-                                   key=args.EmbedLibraryKey)
-
+    masterFile = os.path.join(newLibraryDir, "TensileLibrary.yaml")
+    newMasterLibrary.applyNaming(kernelMinNaming)
+    if globalParameters["LibraryExactIndex"]:
+      newMasterLibrary.buildExactIndices()
+    if globalParameters["LibraryNearestIndex"]:
+      newMasterLibrary.buildNearestIndices()
+    YAMLIO.writeState(masterFile, newMasterLibrary, globalParameters["LibraryFormat"])
+
+    embedFileName = None
+    if args.EmbedLibrary is not None:
+        embedFileName = os.path.join(outputPath, "library/{}.cpp".format(args.EmbedLibrary))
+        with EmbeddedData.EmbeddedDataFile(embedFileName) as embedFile:
+            embedFile.embed_file(newMasterLibrary.cpp_base_class, masterFile, nullTerminated=True,
+                                 key=args.EmbedLibraryKey)
+
+            for co in Utils.tqdm(codeObjectFiles):
+                embedFile.embed_file("SolutionAdapter", co, nullTerminated=False,
+                                     key=args.EmbedLibraryKey)
+
+    if manifest is not None:
+      artifacts = [masterFile, os.path.join(outputPath, "Generated.cmake"), \
+          os.path.join(outputPath, "Solutions.cpp"), os.path.join(outputPath, "Tensile.h")]
+      artifacts += codeObjectFiles
+      if embedFileName is not None:
+        artifacts.append(embedFileName)
+      manifest.write(artifacts)
+  finally:
+    SolutionCache.finish()
   print1("# Tensile Library Writer DONE")
   print1(HR)
   print1("")
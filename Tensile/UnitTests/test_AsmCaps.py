@@ -0,0 +1,117 @@
+################################################################################
+# Copyright (C) 2019 Advanced Micro Devices, Inc. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell cop-
+# ies of the Software, and to permit persons to whom the Software is furnished
+# to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IM-
+# PLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNE-
+# CTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+################################################################################
+
+import os
+import stat
+import sys
+import pytest
+from Tensile.Common import assignGlobalParameters, globalParameters
+
+# Logs each probe and accepts everything except a few instructions on gfx803.
+stubAssembler = """#!{python}
+import sys
+mcpu = [a for a in sys.argv if a.startswith('-mcpu=')][0][6:]
+asm = sys.stdin.read()
+with open({log!r}, 'a') as f:
+    f.write(mcpu + '\\n')
+if mcpu == 'gfx803' and ('vmcnt(63)' in asm or 'v_add_lshl' in asm):
+    sys.exit(1)
+if mcpu == 'gfx000' and '-mno-code-object-v3' in sys.argv:
+    print('unknown option')
+"""
+
+@pytest.fixture
+def assembler(tmpdir, monkeypatch):
+    log = str(tmpdir.join("probes.log"))
+    path = str(tmpdir.join("stub-assembler"))
+    with open(path, 'w') as f:
+        f.write(stubAssembler.format(python=sys.executable, log=log))
+    os.chmod(path, os.stat(path).st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("TENSILE_ROCM_ASSEMBLER_PATH", path)
+
+    def probes():
+        if not os.path.exists(log):
+            return 0
+        with open(log) as f:
+            count = len(f.readlines())
+        os.remove(log)
+        return count
+
+    yield (path, probes)
+    assignGlobalParameters({"PrintLevel": 0})
+
+def assign(cachePath, **params):
+    params.update({"PrintLevel": 0, "AsmCapsCachePath": cachePath})
+    assignGlobalParameters(params)
+    return globalParameters["AsmCaps"]
+
+def test_probed_caps(assembler, tmpdir):
+    (_, probes) = assembler
+    asmCaps = assign(str(tmpdir.join("cache")))
+
+    isaList = globalParameters["SupportedISA"] + [(0,0,0)]
+    assert sorted(asmCaps.keys()) == sorted(isaList)
+    assert probes() == 8 * len(isaList)
+
+    assert asmCaps[(9,0,0)] == {"SupportedISA": 1, "HasExplicitCO": 1, "HasDirectToLds": 1, "HasAddLshl": 1,
+                                "HasSMulHi": 1, "HasCodeObjectV3": 1, "MaxVmcnt": 63}
+    assert asmCaps[(8,0,3)]["HasAddLshl"] == 0
+    assert asmCaps[(8,0,3)]["MaxVmcnt"] == 15
+    assert asmCaps[(0,0,0)]["HasCodeObjectV3"] == 0
+
+def test_cached_caps(assembler, tmpdir):
+    (path, probes) = assembler
+    cachePath = str(tmpdir.join("cache"))
+    probed = assign(cachePath)
+    assert probes() > 0
+
+    assert assign(cachePath) == probed
+    assert probes() == 0
+
+    assert assign(cachePath, ForceReprobeAsmCaps=True) == probed
+    assert probes() > 0
+
+    # a different assembler binary invalidates the cache
+    st = os.stat(path)
+    os.utime(path, (st.st_atime, st.st_mtime + 10))
+    assert assign(cachePath) == probed
+    assert probes() > 0
+    assert len(os.listdir(cachePath)) == 2
+
+def test_cache_disabled(assembler, tmpdir):
+    (_, probes) = assembler
+    cachePath = str(tmpdir.join("cache"))
+    assign(cachePath, AsmCapsCache=False)
+    assign(cachePath, AsmCapsCache=False)
+    assert probes() == 2 * 8 * len(globalParameters["SupportedISA"] + [(0,0,0)])
+    assert not os.path.exists(cachePath)
+
+def test_unreadable_cache(assembler, tmpdir):
+    (_, probes) = assembler
+    cachePath = str(tmpdir.join("cache"))
+    probed = assign(cachePath)
+    probes()
+    for f in os.listdir(cachePath):
+        with open(os.path.join(cachePath, f), 'w') as cacheFile:
+            cacheFile.write("{")
+
+    assert assign(cachePath) == probed
+    assert probes() > 0
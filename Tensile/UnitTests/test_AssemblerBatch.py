@@ -0,0 +1,113 @@
+################################################################################
+# Copyright (C) 2019 Advanced Micro Devices, Inc. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell cop-
+# ies of the Software, and to permit persons to whom the Software is furnished
+# to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IM-
+# PLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNE-
+# CTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+################################################################################
+
+import json
+import os
+import stat
+import sys
+import pytest
+from Tensile.Common import assignGlobalParameters, globalParameters
+from Tensile.KernelWriterAssembly import KernelWriterAssembly
+from Tensile.TensileCreateLibrary import assembleKernelBatches
+
+# Records its command line and writes the outputs an assembler would:
+# X.o for each X.s with -c, or the file named by -o.
+stubAssembler = """#!{python}
+import json, os, sys
+args = sys.argv[1:]
+with open({log!r}, 'a') as f:
+    f.write(json.dumps([os.getcwd()] + args) + '\\n')
+inputs = [a for a in args if a.endswith('.s') or a.endswith('.o')]
+if any(['broken' in a for a in inputs]):
+    sys.exit(1)
+if '-o' in args:
+    outputs = [args[args.index('-o') + 1]]
+    inputs = [a for a in inputs if a not in outputs]
+else:
+    outputs = [os.path.splitext(os.path.basename(a))[0] + '.o' for a in inputs]
+for output in outputs:
+    with open(output, 'w') as f:
+        f.write(' '.join(inputs))
+"""
+
+@pytest.fixture
+def assembler(tmpdir):
+    workingPath = str(tmpdir.mkdir("working"))
+    assignGlobalParameters({"PrintLevel": 0, "WorkingPath": workingPath, "CpuThreads": 0, "CodeFromFiles": False})
+    log = str(tmpdir.join("invocations.log"))
+    path = str(tmpdir.join("stub-assembler"))
+    with open(path, 'w') as f:
+        f.write(stubAssembler.format(python=sys.executable, log=log))
+    os.chmod(path, os.stat(path).st_mode | stat.S_IEXEC)
+    globalParameters["AssemblerPath"] = path
+
+    def invocations():
+        with open(log) as f:
+            return [json.loads(line)[1:] for line in f]
+    yield invocations
+
+    assignGlobalParameters({"PrintLevel": 0})
+
+def writeKernels(kernelWriter, names):
+    asmDir = kernelWriter.getAssemblyDirectory()
+    for name in names:
+        with open(os.path.join(asmDir, name + '.s'), 'w') as f:
+            f.write(name)
+
+def test_batches_per_isa(assembler):
+    globalParameters["AssemblerBatchSize"] = 2
+    kernelWriter = KernelWriterAssembly({}, None)
+    kernels = [{"KernelLanguage": "Assembly", "ISA": isa} for isa in \
+        [[9,0,0], [9,0,6], [9,0,0], [9,0,0], [9,0,6], [0,0,0]]]
+    kernels[-1]["KernelLanguage"] = "Source"
+    names = ["k%u" % i for i in range(0, len(kernels))]
+    writeKernels(kernelWriter, names[:-1])
+    results = [(0, "", "header%u" % i, name) for (i, name) in enumerate(names)]
+    results[-1] = (0, "source", "header5", "k5")
+
+    assembleKernelBatches(kernels, results, kernelWriter)
+
+    compiles = [args for args in assembler() if '-c' in args]
+    assert [[a for a in args if a.endswith('.s')] for args in compiles] == \
+        [["k0.s", "k2.s"], ["k3.s"], ["k1.s", "k4.s"]]
+    assert [[a for a in args if a.startswith('-mcpu')] for args in compiles] == \
+        [["-mcpu=gfx900"], ["-mcpu=gfx900"], ["-mcpu=gfx906"]]
+    links = [args for args in assembler() if '-c' not in args]
+    assert len(links) == 5
+
+    for (i, (err, src, header, name)) in enumerate(results[:-1]):
+        assert (err, header, name) == (0, "header%u" % i, names[i])
+        assert "const unsigned char %s_coba" % name in src
+    assert results[-1] == (0, "source", "header5", "k5")
+
+def test_broken_kernel_isolated(assembler):
+    globalParameters["AssemblerBatchSize"] = 8
+    kernelWriter = KernelWriterAssembly({}, None)
+    names = ["k0", "broken1", "k2"]
+    writeKernels(kernelWriter, names)
+    kernels = [{"KernelLanguage": "Assembly", "ISA": [9,0,0]} for name in names]
+    results = [(0, "", "", name) for name in names]
+
+    assembleKernelBatches(kernels, results, kernelWriter)
+
+    assert [err for (err, _, _, _) in results] == [0, -1, 0]
+    compiles = [[a for a in args if a.endswith('.s')] for args in assembler() if '-c' in args]
+    assert compiles == [["k0.s", "broken1.s", "k2.s"], ["k0.s"], ["broken1.s"], ["k2.s"]]
@@ -0,0 +1,91 @@
+################################################################################
+# Copyright (C) 2019 Advanced Micro Devices, Inc. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell cop-
+# ies of the Software, and to permit persons to whom the Software is furnished
+# to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IM-
+# PLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNE-
+# CTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+################################################################################
+
+import random
+import pytest
+from Tensile import BenchmarkCSV, BenchmarkProblems
+from Tensile.Common import assignGlobalParameters, globalParameters
+from Tensile.SolutionStructs import Solution
+
+numpy = pytest.importorskip("numpy")
+
+problemType = {"OperationType": "TensorContraction", "DataType": "s", "UseBeta": True, \
+    "NumIndicesC": 3, "IndexAssignmentsA": [0, 3, 2], "IndexAssignmentsB": [1, 3, 2]}
+
+@pytest.fixture
+def params():
+    assignGlobalParameters({"PrintLevel": 0})
+    yield
+    assignGlobalParameters({"PrintLevel": 0})
+
+def writeResults(path, numRows, numSolutions, seed, shortRow=None):
+    """
+    Writes a results CSV as the client does, with ", " separators, where row
+    shortRow (if any) is cut short.
+    """
+    rand = random.Random(seed)
+    rows = []
+    with open(path, "w") as f:
+        f.write(", ".join(["GFlops", "SizeI", "SizeJ", "SizeK", "SizeL", "TotalFlops"] \
+            + ["Solution%u" % s for s in range(0, numSolutions)]) + "\n")
+        for problemIdx in range(0, numRows):
+            row = [problemIdx, 64, 128, 2, rand.randrange(1, 1000), 12345] \
+                + [rand.uniform(0, 2000) for s in range(0, numSolutions)]
+            if problemIdx == shortRow:
+                row = row[:7]
+            f.write(", ".join([repr(value) for value in row]) + "\n")
+            rows.append(row)
+    return rows
+
+@pytest.mark.parametrize("blockRows", [1, 7, 1000])
+def test_blocks(params, tmpdir, blockRows):
+    path = str(tmpdir.join("results.csv"))
+    rows = writeResults(path, 50, 5, 1)
+    with open(path) as f:
+        blocks = list(BenchmarkCSV.readBlocks(f, path, 11, blockRows))
+    assert len(blocks) == (50 + blockRows - 1) // blockRows
+    assert numpy.concatenate(blocks).tolist() == [[float(value) for value in row] for row in rows]
+
+def test_short_row(params, tmpdir):
+    path = str(tmpdir.join("results.csv"))
+    rows = writeResults(path, 50, 5, 2, shortRow=23)
+    with open(path) as f:
+        columns = BenchmarkCSV.readColumns(f, path, 6, 11)
+    assert columns.flags["F_CONTIGUOUS"]
+    assert columns.tolist() == [row[6:] for row in rows[:23]]
+
+def test_results(params, tmpdir, monkeypatch):
+    path = str(tmpdir.join("results.csv"))
+    writeResults(path, 40, 5, 3, shortRow=31)
+    solutions = []
+    for wgm in range(1, 6):
+        solutions.append(Solution({"ProblemType": problemType, "KernelLanguage": "Source", \
+            "WorkGroup": [16, 16, 1], "ThreadTile": [4, 4], "DepthU": 8, "WorkGroupMapping": wgm}))
+    hardcoded = [solutions[0:2], solutions[2:5]]
+
+    globalParameters["CSVBlockRows"] = 8
+    results = BenchmarkProblems.getResults(path, hardcoded, False)
+    assert all([isinstance(r, numpy.ndarray) for rs in results for r in rs])
+
+    # the row-by-row reader, as used without NumPy
+    monkeypatch.setattr(BenchmarkCSV, "numpy", None)
+    reference = BenchmarkProblems.getResults(path, hardcoded, False)
+    assert [[r.tolist() for r in rs] for rs in results] == reference
@@ -0,0 +1,215 @@
+################################################################################
+# Copyright (C) 2019 Advanced Micro Devices, Inc. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell cop-
+# ies of the Software, and to permit persons to whom the Software is furnished
+# to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IM-
+# PLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNE-
+# CTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+################################################################################
+
+import json
+import os
+import pytest
+import stat
+import sys
+from Tensile import BenchmarkCheckpoint
+from Tensile.BenchmarkProblems import WinningParameterDict
+from Tensile.Common import assignGlobalParameters
+
+# Writes results like the benchmark client: a header unless resuming, then
+# one row per problem of its index, sizes and flops followed by a result per
+# solution, each flushed.  After StopAfter results of a run it is killed,
+# which may leave the start of a result behind.  Every result it measures
+# is logged.
+fakeClient = """#!%s
+import json, os, sys
+config = json.load(open(sys.argv[0] + ".json"))
+args = dict(zip(sys.argv[1::2], [int(a) for a in sys.argv[2::2]]))
+problemStartIdx = args.get("--problem-start-idx", 0)
+resumeSolutionIdx = args.get("--resume-solution-idx", 0)
+resuming = problemStartIdx > 0 or resumeSolutionIdx > 0
+results = open(config["Results"], "a" if resuming else "w")
+log = open(config["Log"], "a")
+if not resuming:
+    results.write("GFlops, SizeI, SizeJ, SizeK, SizeL, LDD, LDC, LDA, LDB, TotalFlops")
+    results.write("".join([", Solution%%u" %% s for s in range(0, config["NumSolutions"])]) + "\\n")
+runs = json.load(open(config["Runs"])) if os.path.exists(config["Runs"]) else 0
+json.dump(runs + 1, open(config["Runs"], "w"))
+stopAfter = config["StopAfter"][runs] if runs < len(config["StopAfter"]) else -1
+measured = 0
+for problemIdx in range(problemStartIdx, config["NumProblems"]):
+    firstSolutionIdx = resumeSolutionIdx if problemIdx == problemStartIdx else 0
+    if firstSolutionIdx == 0:
+        results.write("%%u, 8, 8, 1, %%u, 8, 8, 8, %%u, %%u" %% (problemIdx, 4 + problemIdx, 4 + problemIdx, 512 * (4 + problemIdx)))
+    for solutionIdx in range(firstSolutionIdx, config["NumSolutions"]):
+        if measured == stopAfter:
+            results.write(", 12"[:config["CutOff"]])
+            results.flush()
+            os._exit(1)
+        results.write(", %%.1f" %% (100.0 * problemIdx + solutionIdx + 0.5))
+        results.flush()
+        log.write("%%u %%u\\n" %% (problemIdx, solutionIdx))
+        log.flush()
+        measured += 1
+    results.write("\\n")
+"""
+
+numProblems = 5
+numSolutions = 4
+prefixColumns = 10
+
+def writeFakeClient(path, stopAfter, cutOff):
+    path.mkdir()
+    client = str(path / "client")
+    with open(client, "w") as f:
+        f.write(fakeClient % sys.executable)
+    os.chmod(client, os.stat(client).st_mode | stat.S_IXUSR)
+    config = {"Results": str(path / "results.csv"), "Log": str(path / "log.txt"), \
+            "Runs": str(path / "runs.json"), "NumProblems": numProblems, \
+            "NumSolutions": numSolutions, "StopAfter": stopAfter, "CutOff": cutOff}
+    with open(client + ".json", "w") as f:
+        json.dump(config, f)
+    return (client, config)
+
+def runToCompletion(client, config, resume=True, numBenchmarks=1):
+    returncodes = []
+    for run in range(0, 20):
+        returncode = BenchmarkCheckpoint.runBenchmarkClient(client, os.path.dirname(client), \
+                config["Results"], numProblems, prefixColumns, numSolutions, resume, numBenchmarks)
+        returncodes.append(returncode)
+        if returncode == 0:
+            break
+    with open(config["Results"]) as f:
+        results = f.read()
+    with open(config["Log"]) as f:
+        measured = [tuple(int(i) for i in line.split()) for line in f]
+    return (returncodes, results, measured)
+
+@pytest.mark.parametrize("stopAfter,cutOff", [([], 0), ([3], 0), ([3], 2), ([4, 1, 0, 7], 3), ([0], 4), ([2, 5], 1)])
+def test_resume_interrupted_client(tmp_path, stopAfter, cutOff):
+    assignGlobalParameters({"PrintLevel": 0})
+    (client, config) = writeFakeClient(tmp_path / "uninterrupted", [], 0)
+    (returncodes, expected, measured) = runToCompletion(client, config, resume=False)
+    assert returncodes == [0] and len(measured) == numProblems * numSolutions
+
+    (client, config) = writeFakeClient(tmp_path / "interrupted", stopAfter, cutOff)
+    (returncodes, results, measured) = runToCompletion(client, config)
+    assert returncodes == [1] * len(stopAfter) + [0]
+    assert results == expected
+
+    # each result is measured once, except one cut off by the interruption
+    # after the start of its row, which is measured again
+    assert sorted(set(measured)) == [(p, s) for p in range(0, numProblems) for s in range(0, numSolutions)]
+    assert len(measured) - numProblems * numSolutions <= len(stopAfter)
+
+    # finished results aren't benchmarked again
+    assert BenchmarkCheckpoint.runBenchmarkClient(client, os.path.dirname(client), config["Results"], \
+            numProblems, prefixColumns, numSolutions, True) == 0
+    with open(config["Runs"]) as f:
+        assert json.load(f) == len(returncodes)
+
+def test_multiple_passes_start_over(tmp_path):
+    assignGlobalParameters({"PrintLevel": 0})
+    (client, config) = writeFakeClient(tmp_path / "interrupted", [3], 2)
+    (returncodes, results, measured) = runToCompletion(client, config, numBenchmarks=2)
+    assert returncodes == [1, 0]
+    assert measured == measured[:3] + [(p, s) for p in range(0, numProblems) for s in range(0, numSolutions)]
+
+    # finished results are still kept
+    assert BenchmarkCheckpoint.runBenchmarkClient(client, os.path.dirname(client), config["Results"], \
+            numProblems, prefixColumns, numSolutions, True, 2) == 0
+    with open(config["Runs"]) as f:
+        assert json.load(f) == 2
+
+@pytest.mark.parametrize("newline", ["\n", "\r\n"])
+def test_resume_point(tmp_path, newline):
+    fileName = str(tmp_path / "results.csv")
+    assert BenchmarkCheckpoint.resumeResults(fileName, 3, 2) is None
+    header = "GFlops, SizeI, TotalFlops, S0, S1\n"
+    rows = ["0, 4, 16, 1.5, 2.5\n", "1, 8, 32, 3.5, 4.5\n"]
+    def resumePoint(text):
+        # written and read as bytes, so line ends are kept as the client wrote them
+        with open(fileName, "wb") as f:
+            f.write(text.replace("\n", newline).encode())
+        scan = BenchmarkCheckpoint.scanResults(fileName, 3, 2)
+        with open(fileName, "rb") as f:
+            assert f.read() == text.replace("\n", newline).encode()
+        point = BenchmarkCheckpoint.resumeResults(fileName, 3, 2)
+        assert point == (None if scan is None else scan[:2])
+        with open(fileName, "rb") as f:
+            return (point, f.read().decode().replace(newline, "\n"))
+
+    assert resumePoint("GFlops, SizeI, Tot") == (None, "GFlops, SizeI, Tot")
+    assert resumePoint(header) == ((0, 0), header)
+    assert resumePoint(header + rows[0]) == ((1, 0), header + rows[0])
+    assert resumePoint(header + "".join(rows)) == ((2, 0), header + "".join(rows))
+    # a partial row keeps the results before its last one
+    assert resumePoint(header + rows[0] + "1, 8, 32, 3.5, 4.") == ((1, 1), header + rows[0] + "1, 8, 32, 3.5")
+    assert resumePoint(header + rows[0] + "1, 8, 32, 3.5, 4.5") == ((1, 1), header + rows[0] + "1, 8, 32, 3.5")
+    assert resumePoint(header + rows[0] + "1, 8, 32, 3.") == ((1, 0), header + rows[0])
+    assert resumePoint(header + rows[0] + "1, 8") == ((1, 0), header + rows[0])
+    # rows after a broken one are benchmarked again
+    assert resumePoint(header + rows[0] + "1, 8, 32\n" + rows[1]) == ((1, 0), header + rows[0])
+    assert resumePoint(header + rows[1] + rows[0]) == ((0, 0), header)
+
+    # checking whether results are complete doesn't change them
+    text = (header + rows[0] + "1, 8, 32, 3.5, 4.").replace("\n", newline).encode()
+    with open(fileName, "wb") as f:
+        f.write(text)
+    assert not BenchmarkCheckpoint.resultsComplete(fileName, 3, 2, 2)
+    assert BenchmarkCheckpoint.resultsComplete(fileName, 3, 2, 1)
+    with open(fileName, "rb") as f:
+        assert f.read() == text
+
+def test_checkpoint(tmp_path):
+    assignGlobalParameters({"PrintLevel": 0})
+    fileName = BenchmarkCheckpoint.checkpointFileName(str(tmp_path / "00_Final"))
+    assert BenchmarkCheckpoint.StepCheckpoint.read(fileName, "key").stage is None
+
+    checkpoint = BenchmarkCheckpoint.StepCheckpoint(fileName, "key")
+    enumerated = ["SolutionA", "SolutionB", "SolutionC"]
+    checkpoint.write(Stage=BenchmarkCheckpoint.Written, Enumerated=BenchmarkCheckpoint.solutionsKey(enumerated), \
+            Solutions=["SolutionA", "SolutionC"])
+    checkpoint = BenchmarkCheckpoint.StepCheckpoint.read(fileName, "key")
+    assert checkpoint.stage == BenchmarkCheckpoint.Written
+    assert checkpoint.writtenSolutions(enumerated) == ["SolutionA", "SolutionC"]
+    assert checkpoint.writtenSolutions(enumerated[:2]) is None
+    assert BenchmarkCheckpoint.StepCheckpoint.read(fileName, "other key").stage is None
+
+    winners = WinningParameterDict()
+    winners.addHardcoded({"WorkGroup": [16, 16, 1], "ThreadTile": [4, 4]})
+    winners.addHardcoded({"WorkGroup": [8, 8, 1], "ThreadTile": [4, 4]})
+    for (hardcodedParameters, winner) in zip([{"WorkGroup": [16, 16, 1]}, {"WorkGroup": [8, 8, 1]}], \
+            [{"DepthU": 16, "PrefetchGlobalRead": True}, {"DepthU": 8, "PrefetchGlobalRead": False}]):
+        winners[hardcodedParameters].update(winner)
+    winners.winners[list(winners.winners)[0]][1] = 1234.5
+    checkpoint.write(Stage=BenchmarkCheckpoint.Done, Winners=winners.state())
+
+    restored = WinningParameterDict.FromState(BenchmarkCheckpoint.StepCheckpoint.read(fileName, "key").state["Winners"])
+    assert restored.state() == winners.state()
+
+    # later steps are keyed on the winners of earlier ones
+    class Step:
+        hardcodedParameters = [{"ThreadTile": [4, 4]}]
+        benchmarkParameters = {"DepthU": [8, 16]}
+        initialSolutionParameters = {"KernelLanguage": "Source"}
+        class problemSizes:
+            sizes = [[64, 64, 1, 64]]
+    key = BenchmarkCheckpoint.stepKey("previous", winners.state(), "Step", Step)
+    assert key == BenchmarkCheckpoint.stepKey("previous", restored.state(), "Step", Step)
+    assert key != BenchmarkCheckpoint.stepKey("previous", WinningParameterDict().state(), "Step", Step)
+
+    assert restored[{"WorkGroup": [8, 8, 1]}] == {"DepthU": 8, "PrefetchGlobalRead": False}
+    assert [h["WorkGroup"] for h in restored.wpdUpdate([{"ThreadTile": [4, 4]}])] == [[16, 16, 1]]
@@ -0,0 +1,150 @@
+################################################################################
+# Copyright (C) 2019 Advanced Micro Devices, Inc. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell cop-
+# ies of the Software, and to permit persons to whom the Software is furnished
+# to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IM-
+# PLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNE-
+# CTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+################################################################################
+
+
+import pytest
+import random
+from copy import deepcopy
+from Tensile.BenchmarkProblems import FrozenDictionary, HardcodedParameterIndex, WinningParameterDict
+from Tensile.Common import assignGlobalParameters
+
+def makeWinners(rand, numWinners):
+    winners = {}
+    for i in range(0, numWinners):
+        parameters = {"WorkGroup": rand.choice([[16, 16, 1], [8, 8, 1], [16, 8, 1]]),
+                      "ThreadTile": rand.choice([[4, 4], [2, 4], [8, 8]]),
+                      "GlobalSplitU": rand.choice([1, 2, 4])}
+        if rand.random() < 0.7:
+            parameters["PrefetchGlobalRead"] = rand.choice([True, False])
+        if rand.random() < 0.2:
+            parameters["MacroTile0"] = rand.choice([32, 64])
+        winning = {"DepthU": rand.choice([8, 16, 32])} if rand.random() < 0.5 else {}
+        winners[FrozenDictionary(parameters)] = [winning, rand.random()]
+    return winners
+
+def makeLookups(rand, numLookups):
+    lookups = []
+    for i in range(0, numLookups):
+        lookup = {}
+        for (name, values) in [("WorkGroup", [[16, 16, 1], [8, 8, 1], [4, 4, 1]]), ("ThreadTile", [[4, 4], [8, 8]]), \
+                ("GlobalSplitU", [1, 2, 4]), ("PrefetchGlobalRead", [True, False]), ("LoopTail", [True])]:
+            if rand.random() < 0.6:
+                lookup[name] = rand.choice(values)
+        if rand.random() < 0.3:
+            lookup["MacroTile0"] = rand.choice([32, 64, 128])
+            lookup["MacroTile1"] = rand.choice([32, 64, 128])
+        lookups.append(lookup)
+    return lookups
+
+def matchIds(matches, winners):
+    ids = dict([(id(frozen), i) for (i, frozen) in enumerate(winners)])
+    return [(ids[id(frozen)], winning, score) for (frozen, winning, score) in matches]
+
+def test_hardcoded_parameter_index():
+    assignGlobalParameters({"PrintLevel": 0})
+    rand = random.Random(7)
+    for numWinners in [1, 2, 40, 300]:
+        winners = makeWinners(rand, numWinners)
+        # get derives the parameters of the winners it matches on MacroTile,
+        # so each is given its own copy
+        linearWinners = deepcopy(winners)
+        index = HardcodedParameterIndex(winners)
+        for lookup in makeLookups(rand, 300):
+            expected = matchIds(WinningParameterDict.get(lookup, linearWinners), linearWinners)
+            assert matchIds(index.get(lookup), winners) == expected
+        assert [f.parameters for f in winners] == [f.parameters for f in linearWinners]
+
+def test_hashable_value():
+    assert HardcodedParameterIndex.hashableValue([16, 16, 1]) == (16, 16, 1)
+    assert HardcodedParameterIndex.hashableValue({"b": [1], "a": 2}) == (("a", 2), ("b", (1,)))
+    assert HardcodedParameterIndex.hashableValue([{1, 2}]) is HardcodedParameterIndex.Unhashable
+
+def test_update():
+    assignGlobalParameters({"PrintLevel": 0})
+    winners = WinningParameterDict()
+    for workGroup in [[16, 16, 1], [8, 8, 1]]:
+        for threadTile in [[4, 4], [8, 8]]:
+            winners.addHardcoded({"WorkGroup": workGroup, "ThreadTile": threadTile})
+    for (score, frozen) in enumerate(winners.winners):
+        winners.winners[frozen] = [{"DepthU": 8 * (score + 1)}, float(score)]
+    assert winners[{"WorkGroup": [8, 8, 1], "ThreadTile": [4, 4]}] == {"DepthU": 24}
+
+    # fork GlobalSplitU
+    hardcoded = winners.wpdUpdate([dict(h, GlobalSplitU=gsu) for h in \
+            [{"WorkGroup": [16, 16, 1]}, {"WorkGroup": [8, 8, 1]}] for gsu in [1, 2]])
+    assert len(hardcoded) == 4
+    assert winners[{"WorkGroup": [8, 8, 1], "GlobalSplitU": 2}] == {"DepthU": 32}
+    assert winners[{"WorkGroup": [16, 16, 1], "GlobalSplitU": 1}] == {"DepthU": 16}
+
+    # join on MacroTile keeps the fastest of each
+    hardcoded = winners.wpdUpdate([{"MacroTile0": 64, "MacroTile1": 64}, {"MacroTile0": 128, "MacroTile1": 128}, \
+            {"MacroTile0": 32, "MacroTile1": 32}])
+    assert len(hardcoded) == 2
+    assert [(h["WorkGroup"], h["ThreadTile"]) for h in hardcoded] == [([8, 8, 1], [8, 8]), ([16, 16, 1], [8, 8])]
+    assert winners[{"MacroTile0": 64, "MacroTile1": 64}] == {"DepthU": 32}
+    assert winners[{"MacroTile0": 32, "MacroTile1": 32}] is None
+
+def serialSolutions(problemTypeState, hardcodedParameters, winningParameters, benchmarkPermutations, \
+        initialSolutionParameters):
+    # the enumeration loop of benchmarkProblemType before it was sharded
+    from Tensile.SolutionStructs import Solution
+    solutions = []
+    solutionSet = set()
+    for (hardcodedIdx, hardcodedParamDict) in enumerate(hardcodedParameters):
+        solutions.append([])
+        for (benchmarkIdx, benchmarkPermutation) in enumerate(benchmarkPermutations):
+            solution = {"ProblemType": deepcopy(problemTypeState)}
+            solution.update(benchmarkPermutation)
+            solution.update(hardcodedParamDict)
+            winning = winningParameters[hardcodedIdx][0 if benchmarkIdx == 0 else 1]
+            if winning is None:
+                continue
+            solution.update(winning)
+            for name in initialSolutionParameters:
+                if name not in solution:
+                    solution[name] = initialSolutionParameters[name]
+            solutionObject = Solution(solution)
+            if solutionObject["Valid"] and solutionObject not in solutionSet:
+                solutionSet.add(solutionObject)
+                solutions[hardcodedIdx].append(solutionObject)
+    return solutions
+
+@pytest.mark.parametrize("cpuThreads,precheck", [(0, False), (0, True), (-2, True)])
+def test_enumerate_solutions(cpuThreads, precheck):
+    from Tensile.BenchmarkProblems import enumerateSolutions
+    from Tensile.SolutionStructs import ProblemType
+    assignGlobalParameters({"PrintLevel": 0, "CpuThreads": cpuThreads, "ShowProgressBar": False, \
+            "SolutionPrecheck": precheck})
+    problemType = ProblemType({"OperationType": "GEMM", "DataType": "s", "TransposeA": False, \
+            "TransposeB": True, "UseBeta": True, "Batched": True})
+    hardcoded = [{"WorkGroup": workGroup, "ThreadTile": threadTile} \
+            for workGroup in [[16, 16, 1], [8, 8, 1], [16, 8, 1]] for threadTile in [[4, 4], [8, 8], [2, 2]]]
+    permutations = [{"DepthU": depthU, "GlobalSplitU": gsu} for depthU in [8, 16, 32] for gsu in [1, 2]]
+    # winners of a later step: some fix DepthU, giving duplicate solutions,
+    # and one has no winner
+    winning = [[{}, {}], [{"DepthU": 16}, {"DepthU": 16}], [None, None]] + [[{}, {}]] * (len(hardcoded) - 3)
+    initial = {"KernelLanguage": "Source", "WorkGroupMapping": 1}
+
+    solutions = enumerateSolutions(problemType.state, hardcoded, winning, permutations, initial)
+    expected = serialSolutions(problemType.state, hardcoded, winning, permutations, initial)
+    assert [[str(s) for s in row] for row in solutions] == [[str(s) for s in row] for row in expected]
+    assert len(solutions[1]) == 2 and solutions[2] == []
+    assert sum([len(row) for row in solutions]) > 20
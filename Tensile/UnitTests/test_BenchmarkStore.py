@@ -0,0 +1,85 @@
+################################################################################
+# Copyright (C) 2019 Advanced Micro Devices, Inc. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell cop-
+# ies of the Software, and to permit persons to whom the Software is furnished
+# to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IM-
+# PLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNE-
+# CTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+################################################################################
+
+import os
+import pytest
+from Tensile import BenchmarkStore, LibraryLogic, YAMLIO
+from Tensile.Common import defaultAnalysisParameters
+from Tensile.UnitTests.test_LogicAnalyzer import writeBenchmarkData
+
+numpy = pytest.importorskip("numpy")
+
+exact = [(64, 128, 1, 32), (256, 64, 2, 64)]
+
+def makeAnalyzer(analyzerClass, problemSizeGroup, storeFileName):
+    (problemSizes, solutions) = YAMLIO.readSolutions(problemSizeGroup[2])
+    return analyzerClass(solutions[0]["ProblemType"], [problemSizes], [solutions], \
+        [problemSizeGroup[1]], dict(defaultAnalysisParameters), storeFileName)
+
+def analyze(analyzer):
+    analyzer.removeInvalidSolutions()
+    analyzer.removeLeastImportantSolutions()
+    rangeLogic = analyzer.enRule(0, analyzer.globalIndexRange)
+    return (analyzer.solutions, analyzer.exactWinners, rangeLogic)
+
+@pytest.mark.parametrize("analyzerClass", [LibraryLogic.LogicAnalyzer, LibraryLogic.NumPyLogicAnalyzer])
+def test_store(params, tmpdir, analyzerClass):
+    (problemSizeGroup,) = writeBenchmarkData(str(tmpdir), 8, 1, [(2, 5)], exact)
+    storeFileName = BenchmarkStore.storeFileName(str(tmpdir), "Cijk_Ailk_Bjlk_SB")
+    fromCSV = makeAnalyzer(analyzerClass, problemSizeGroup, None)
+
+    written = makeAnalyzer(analyzerClass, problemSizeGroup, storeFileName)
+    assert os.path.isfile(storeFileName)
+    store = BenchmarkStore.BenchmarkResultStore.read(storeFileName)
+    assert store.data.tolist() == numpy.asarray(fromCSV.data).reshape(-1, 8).tolist()
+    assert store.data.ctypes.data % BenchmarkStore.BenchmarkResultStore.Alignment == 0
+
+    fromStore = makeAnalyzer(analyzerClass, problemSizeGroup, storeFileName)
+    if analyzerClass is LibraryLogic.NumPyLogicAnalyzer:
+        assert isinstance(fromStore.data.base, numpy.memmap)
+    assert list(fromStore.data) == list(fromCSV.data)
+    assert fromStore.exactWinners == fromCSV.exactWinners
+    assert analyze(fromStore) == analyze(fromCSV) == analyze(written)
+
+def test_stale_store(params, tmpdir):
+    (problemSizeGroup,) = writeBenchmarkData(str(tmpdir), 6, 2)
+    storeFileName = str(tmpdir.join("results.tbr"))
+    analyzer = makeAnalyzer(LibraryLogic.NumPyLogicAnalyzer, problemSizeGroup, storeFileName)
+    key = analyzer.resultStoreKey([problemSizeGroup[1]])
+    assert BenchmarkStore.BenchmarkResultStore.read(storeFileName, key).key == key
+
+    # new results for the same problems and solutions
+    writeBenchmarkData(str(tmpdir), 6, 3)
+    os.utime(problemSizeGroup[1], ns=(0, 0))
+    reread = makeAnalyzer(LibraryLogic.NumPyLogicAnalyzer, problemSizeGroup, storeFileName)
+    assert reread.resultStoreKey([problemSizeGroup[1]]) != key
+    assert list(reread.data) == list(makeAnalyzer(LibraryLogic.LogicAnalyzer, problemSizeGroup, None).data)
+    assert list(reread.data) != list(analyzer.data)
+
+def test_export_csv(params, tmpdir):
+    (problemSizeGroup,) = writeBenchmarkData(str(tmpdir), 6, 4, [(7, 1)])
+    storeFileName = str(tmpdir.join("results.tbr"))
+    analyzer = makeAnalyzer(LibraryLogic.LogicAnalyzer, problemSizeGroup, storeFileName)
+
+    exportFileName = str(tmpdir.join("export.csv"))
+    BenchmarkStore.BenchmarkResultStore.read(storeFileName).exportCSV(exportFileName)
+    exported = makeAnalyzer(LibraryLogic.LogicAnalyzer, (None, exportFileName, problemSizeGroup[2]), None)
+    assert list(exported.data) == list(analyzer.data)
@@ -0,0 +1,51 @@
+################################################################################
+# Copyright (C) 2019 Advanced Micro Devices, Inc. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell cop-
+# ies of the Software, and to permit persons to whom the Software is furnished
+# to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IM-
+# PLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNE-
+# CTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+################################################################################
+
+from Tensile import Code
+
+def test_module_render():
+    inner = Code.Module("inner")
+    inner.addInst("v_mov_b32", "v0", "0", "zero")
+    inner.addCode(Code.WaitCnt(0, -1, "wait"))
+    outer = Code.Module("outer")
+    outer.addComment0("start")
+    outer.addCode(inner)
+    outer.addCode(Code.Module("empty"))
+    outer.addText("s_endpgm\n")
+
+    expected = "/* start */\n" + str(inner.items()[0]) + str(inner.items()[1]) + "s_endpgm\n"
+    assert str(outer) == expected
+
+    out = ["before"]
+    outer.render(out)
+    assert "".join(out) == "before" + expected
+
+def test_render_list():
+    module = Code.Module()
+    module.addText("b")
+    assert Code.render(["a", module, Code.Module(), "c"], "\n") == "a\nb\n\nc"
+    assert Code.render([]) == ""
+
+def test_format_inst():
+    assert Code.formatInst(("s_endpgm",)) == "s_endpgm"
+    assert Code.formatInst(("v_mov_b32", "v0", 1)) == "v_mov_b32 v0, 1"
+    assert Code.formatInst(("v_mac_f32", "v[0]", "v[1]", "v[2]")) == "v_mac_f32 v[0], v[1], v[2]"
+    assert str(Code.Inst("v_mov_b32", "v0", "0", "zero")) == "%-50s // %s\n" % ("v_mov_b32 v0, 0", "zero")
@@ -0,0 +1,114 @@
+################################################################################
+# Copyright (C) 2019 Advanced Micro Devices, Inc. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell cop-
+# ies of the Software, and to permit persons to whom the Software is furnished
+# to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IM-
+# PLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNE-
+# CTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+################################################################################
+
+import os
+from Tensile.KernelCache import KernelBuildCache
+from Tensile.DataType import DataType
+from Tensile import Utils
+
+class FakeAssemblyWriter:
+    def __init__(self, asmPath):
+        self.asmPath = asmPath
+
+    def getKernelName(self, kernel):
+        return "Cijk_MT%u" % kernel["MacroTile0"]
+
+    def getReplacementKernelPath(self, kernel):
+        return None
+
+    def getAssemblyDirectory(self):
+        return self.asmPath
+
+    def writeByteArrayScript(self):
+        pass
+
+def makeKernel(macroTile=64):
+    return {"KernelLanguage": "Assembly", "ISA": [9,0,6], "MacroTile0": macroTile, "DataType": DataType('S')}
+
+def writeArtifacts(asmPath, kernelName, contents):
+    for ext in KernelBuildCache.AssemblyExtensions:
+        with open(os.path.join(asmPath, kernelName + ext), 'w') as f:
+            f.write(contents + ext)
+
+def test_fingerprint_order_independent():
+    a = {"x": 1, "y": [1, 2], "t": DataType('S')}
+    b = {"t": DataType('S'), "y": [1, 2], "x": 1}
+    assert Utils.fingerprint(a) == Utils.fingerprint(b)
+    assert Utils.fingerprint(a) != Utils.fingerprint(dict(a, x=2))
+    assert Utils.fingerprint(a) != Utils.fingerprint(dict(a, t=DataType('D')))
+
+def test_store_and_fetch(tmpdir):
+    asmPath = str(tmpdir.mkdir("assembly"))
+    writer = FakeAssemblyWriter(asmPath)
+    cache = KernelBuildCache(str(tmpdir.join("cache")), 1 << 20)
+
+    kernel = makeKernel()
+    kernelName = writer.getKernelName(kernel)
+    key = cache.key(kernel, writer)
+    assert cache.fetch(key, kernel, writer) is None
+
+    writeArtifacts(asmPath, kernelName, "asm")
+    cache.store(key, kernel, writer, (0, "src", "header", kernelName))
+
+    for ext in KernelBuildCache.AssemblyExtensions:
+        os.remove(os.path.join(asmPath, kernelName + ext))
+
+    assert cache.key(makeKernel(), writer) == key
+    assert cache.fetch(key, kernel, writer) == (0, "src", "header", kernelName)
+    for ext in KernelBuildCache.AssemblyExtensions:
+        with open(os.path.join(asmPath, kernelName + ext)) as f:
+            assert f.read() == "asm" + ext
+
+    assert cache.fetch(cache.key(makeKernel(128), writer), makeKernel(128), writer) is None
+    assert (cache.hits, cache.misses, cache.stores) == (1, 2, 1)
+
+def test_failed_kernels_not_stored(tmpdir):
+    writer = FakeAssemblyWriter(str(tmpdir.mkdir("assembly")))
+    cache = KernelBuildCache(str(tmpdir.join("cache")), 1 << 20)
+    kernel = makeKernel()
+    key = cache.key(kernel, writer)
+    cache.store(key, kernel, writer, (-1, "", "", writer.getKernelName(kernel)))
+    assert cache.stores == 0
+    assert cache.fetch(key, kernel, writer) is None
+
+def test_evict_least_recently_used(tmpdir):
+    asmPath = str(tmpdir.mkdir("assembly"))
+    writer = FakeAssemblyWriter(asmPath)
+    cache = KernelBuildCache(str(tmpdir.join("cache")), 1 << 20)
+
+    keys = []
+    for (i, macroTile) in enumerate([32, 64, 128]):
+        kernel = makeKernel(macroTile)
+        kernelName = writer.getKernelName(kernel)
+        writeArtifacts(asmPath, kernelName, "x" * 100)
+        key = cache.key(kernel, writer)
+        cache.store(key, kernel, writer, (0, "src", "header", kernelName))
+        os.utime(cache.entryPath(key), (1000 + i, 1000 + i))
+        keys.append(key)
+
+    entrySize = cache.size() // 3
+    cache.maxSize = 2 * entrySize
+    cache.evict()
+
+    assert cache.evictions == 1
+    assert not os.path.exists(cache.entryPath(keys[0]))
+    assert os.path.exists(cache.entryPath(keys[1]))
+    assert os.path.exists(cache.entryPath(keys[2]))
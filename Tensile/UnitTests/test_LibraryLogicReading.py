@@ -0,0 +1,87 @@
+################################################################################
+# Copyright (C) 2019 Advanced Micro Devices, Inc. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell cop-
+# ies of the Software, and to permit persons to whom the Software is furnished
+# to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IM-
+# PLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNE-
+# CTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+################################################################################
+
+import os
+import shutil
+import pytest
+from Tensile import Common, YAMLIO
+from Tensile.Common import assignGlobalParameters, globalParameters
+from Tensile.SolutionStructs import Solution
+
+configsPath = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Configs")
+logicFileName = os.path.join(configsPath, "miopen", "Logic", "deepbench_gemm", "vega10_Cijk_Ailk_Bjlk_SB.yaml")
+
+@pytest.fixture
+def logicFiles(tmpdir):
+    assignGlobalParameters({"PrintLevel": 0})
+    good = str(tmpdir.join("good.yaml"))
+    shutil.copy(logicFileName, good)
+    short = str(tmpdir.join("short.yaml"))
+    with open(short, 'w') as f:
+        f.write("- {MinimumRequiredVersion: 4.2.0}\n- vega10\n")
+    malformed = str(tmpdir.join("malformed.yaml"))
+    with open(malformed, 'w') as f:
+        f.write("- [unterminated\n")
+    return (good, short, malformed)
+
+def test_solutions_independent_of_library(logicFiles):
+    good = logicFiles[0]
+    (_, _, problemType, solutions, _, _, _, library) = \
+        YAMLIO.libraryLogicFromData(good, YAMLIO.parseLibraryLogic(good))
+
+    librarySolutions = list(library.solutions.values())
+    assert len(solutions) == len(librarySolutions) == 8
+    assert all([s is not ls.originalSolution for (s, ls) in zip(solutions, librarySolutions)])
+
+    # same as building each solution from its state in the file
+    for (solution, solutionState) in zip(solutions, YAMLIO.readConfig(good)[5]):
+        solutionState["ISA"] = [0, 0, 0] if solutionState["KernelLanguage"] == "Source" else [9, 0, 0]
+        assert solution == Solution(solutionState)
+        assert solution["ProblemType"] == problemType
+
+    # changing one doesn't change the other
+    solutions[0]["ISA"] = [9, 0, 6]
+    assert librarySolutions[0].originalSolution["ISA"] != [9, 0, 6]
+
+def test_bad_files_reported(logicFiles):
+    (good, short, malformed) = logicFiles
+    (filename, data, error) = YAMLIO.parseLibraryLogicFile(good)
+    assert (filename, error) == (good, None)
+    assert len(data[5]) == 8
+
+    for bad in [short, malformed]:
+        (filename, data, error) = YAMLIO.parseLibraryLogicFile(bad)
+        assert filename == bad
+        assert data is None
+        assert error is not None
+
+def test_bad_file_does_not_abort_pool(logicFiles):
+    (good, short, malformed) = logicFiles
+    cpuThreads = globalParameters["CpuThreads"]
+    globalParameters["CpuThreads"] = 2
+    try:
+        results = Common.ParallelMap(YAMLIO.parseLibraryLogicFile, [short, good, malformed, good],
+                                     "Reading logic files", method=lambda x: x.imap_unordered)
+        results = sorted([(filename, error is None) for (filename, data, error) in results])
+    finally:
+        globalParameters["CpuThreads"] = cpuThreads
+
+    assert results == sorted([(short, False), (good, True), (malformed, False), (good, True)])
@@ -0,0 +1,127 @@
+################################################################################
+# Copyright (C) 2019 Advanced Micro Devices, Inc. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell cop-
+# ies of the Software, and to permit persons to whom the Software is furnished
+# to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IM-
+# PLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNE-
+# CTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+################################################################################
+
+import os
+from Tensile.LibraryManifest import LibraryManifest
+
+def readLogic(filename):
+    with open(filename) as f:
+        return (os.path.basename(filename), f.read())
+
+def writeFile(filename, contents):
+    with open(filename, 'w') as f:
+        f.write(contents)
+
+def test_incremental_rebuild(tmpdir):
+    logicPath = tmpdir.mkdir("logic")
+    outputPath = str(tmpdir.mkdir("output"))
+    logicFiles = [str(logicPath.join(name)) for name in ["a.yaml", "b.yaml"]]
+    writeFile(logicFiles[0], "a1")
+    writeFile(logicFiles[1], "b1")
+    artifact = os.path.join(outputPath, "TensileLibrary.yaml")
+    writeFile(artifact, "")
+
+    manifest = LibraryManifest(outputPath, str(logicPath), {"MergeFiles": True})
+    manifest.scanLogicFiles(logicFiles)
+    assert not manifest.upToDate()
+    assert manifest.readLogicFiles(logicFiles, readLogic) == [("a.yaml", "a1"), ("b.yaml", "b1")]
+    manifest.write([artifact])
+
+    manifest = LibraryManifest(outputPath, str(logicPath), {"MergeFiles": True})
+    manifest.scanLogicFiles(logicFiles)
+    assert manifest.changedLogicFiles == []
+    assert manifest.upToDate()
+
+    writeFile(logicFiles[1], "b2")
+    manifest = LibraryManifest(outputPath, str(logicPath), {"MergeFiles": True})
+    manifest.scanLogicFiles(logicFiles)
+    assert manifest.changedLogicFiles == [logicFiles[1]]
+    assert not manifest.upToDate()
+    assert manifest.readLogicFiles(logicFiles, readLogic) == [("a.yaml", "a1"), ("b.yaml", "b2")]
+    manifest.write([artifact])
+
+    os.remove(artifact)
+    manifest = LibraryManifest(outputPath, str(logicPath), {"MergeFiles": True})
+    manifest.scanLogicFiles(logicFiles)
+    assert manifest.changedLogicFiles == []
+    assert not manifest.upToDate()
+
+def test_parameters_invalidate(tmpdir):
+    logicFile = str(tmpdir.join("a.yaml"))
+    outputPath = str(tmpdir.mkdir("output"))
+    writeFile(logicFile, "a1")
+
+    manifest = LibraryManifest(outputPath, str(tmpdir), {"MergeFiles": True})
+    manifest.readLogicFiles([logicFile], readLogic)
+    manifest.write([logicFile])
+
+    manifest = LibraryManifest(outputPath, str(tmpdir), {"MergeFiles": False})
+    manifest.scanLogicFiles([logicFile])
+    assert manifest.changedLogicFiles == [logicFile]
+
+def test_removed_logic_file(tmpdir):
+    logicFiles = [str(tmpdir.join(name)) for name in ["a.yaml", "b.yaml"]]
+    outputPath = str(tmpdir.mkdir("output"))
+    for logicFile in logicFiles:
+        writeFile(logicFile, logicFile)
+
+    manifest = LibraryManifest(outputPath, str(tmpdir), {})
+    manifest.readLogicFiles(logicFiles, readLogic)
+    manifest.write([logicFiles[0]])
+
+    manifest = LibraryManifest(outputPath, str(tmpdir), {})
+    manifest.scanLogicFiles(logicFiles[:1])
+    assert manifest.removedLogicFiles() == ["b.yaml"]
+    assert not manifest.upToDate()
+
+def test_iter_logic_files(tmpdir):
+    logicFiles = [str(tmpdir.join(name)) for name in ["a.yaml", "b.yaml", "c.yaml"]]
+    outputPath = str(tmpdir.mkdir("output"))
+    for logicFile in logicFiles:
+        writeFile(logicFile, os.path.basename(logicFile)[0])
+
+    manifest = LibraryManifest(outputPath, str(tmpdir), {})
+    manifest.readLogicFiles(logicFiles, readLogic)
+    manifest.write([logicFiles[0]])
+
+    writeFile(logicFiles[1], "b2")
+    manifest = LibraryManifest(outputPath, str(tmpdir), {})
+    results = sorted(manifest.iterLogicFiles(logicFiles, readLogic))
+    assert results == [(0, ("a.yaml", "a")), (1, ("b.yaml", "b2")), (2, ("c.yaml", "c"))]
+    assert manifest.changedLogicFiles == [logicFiles[1]]
+
+def test_same_name_in_subdirectories(tmpdir):
+    logicPath = tmpdir.mkdir("logic")
+    outputPath = str(tmpdir.mkdir("output"))
+    logicFiles = [str(logicPath.mkdir(arch).join("a.yaml")) for arch in ["vega10", "vega20"]]
+    writeFile(logicFiles[0], "a1")
+    writeFile(logicFiles[1], "a2")
+
+    manifest = LibraryManifest(outputPath, str(logicPath), {})
+    assert manifest.readLogicFiles(logicFiles, readLogic) == [("a.yaml", "a1"), ("a.yaml", "a2")]
+    assert sorted(manifest.logicFiles) == ["vega10/a.yaml", "vega20/a.yaml"]
+    manifest.write([logicFiles[0]])
+
+    writeFile(logicFiles[1], "a3")
+    manifest = LibraryManifest(outputPath, str(logicPath), {})
+    manifest.scanLogicFiles(logicFiles)
+    assert manifest.changedLogicFiles == [logicFiles[1]]
+    assert manifest.readLogicFiles(logicFiles, readLogic) == [("a.yaml", "a1"), ("a.yaml", "a3")]
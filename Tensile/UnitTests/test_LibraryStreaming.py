@@ -0,0 +1,94 @@
+################################################################################
+# Copyright (C) 2019 Advanced Micro Devices, Inc. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell cop-
+# ies of the Software, and to permit persons to whom the Software is furnished
+# to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IM-
+# PLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNE-
+# CTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+################################################################################
+
+import io
+import pytest
+from Tensile import Contractions, Hardware, Properties, Utils, YAMLIO
+from Tensile.SolutionLibrary import MasterSolutionLibrary, MatchingLibrary, PredicateLibrary, \
+                                    ProblemMapLibrary, SingleSolutionLibrary
+
+def makeProblemType():
+    return Contractions.ProblemType.FromOriginalState({
+        "TotalIndices": 4, "IndicesFree": [0, 1], "IndicesBatch": [2], "IndicesSummation": [3],
+        "IndexAssignmentsA": [0, 3, 2], "IndexAssignmentsB": [3, 1, 2], "NumIndicesC": 3,
+        "ComplexConjugateA": False, "ComplexConjugateB": False, "DataType": 0, "Batched": True})
+
+def makeSolution(index, problemType):
+    s = Contractions.Solution()
+    s.name = "Cijk_Ailk_Bjlk_SB_MT%u" % (index * 32 + 32)
+    s.index = index
+    s.problemType = problemType
+    s.hardwarePredicate = Hardware.HardwarePredicate.FromISA((9,0,6))
+    s.problemPredicate = Contractions.ProblemPredicate("FreeSizeAMultiple", index=0, value=index + 1)
+    s.sizeMapping = Contractions.SizeMapping(workGroup=[16, 16, 1], macroTile=[32 * index + 32, 64, 1],
+                                             threadTile=[4, 4], depthU=8, staggerU=32, globalSplitU=1,
+                                             staggerStrideShift=3, workGroupMapping=8)
+    s.info = {"DepthU": "8", "KernelLanguage": "Assembly", "Valid": "True"}
+    return s
+
+def makeLibrary():
+    problemType = makeProblemType()
+    solutions = dict([(i, makeSolution(i, problemType)) for i in range(3)])
+    table = [{"key": [128 * (i + 1), 128, 1, 64], "value": SingleSolutionLibrary(solutions[i]), "speed": 1.5 * i}
+             for i in solutions]
+    matching = MatchingLibrary([Properties.Property("FreeSizeA", index=0), Properties.Property("BoundSize", index=0)],
+                               table, {"type": "Euclidean"})
+    problems = PredicateLibrary(tag="Problem", rows=[
+        {"predicate": Contractions.ProblemPredicate.And(problemType.predicates(True, True, True)), "library": matching}])
+    opMap = ProblemMapLibrary(Properties.Property("OperationIdentifier"), {problemType.operationIdentifier: problems})
+    hardware = PredicateLibrary(tag="Hardware", rows=[
+        {"predicate": Hardware.HardwarePredicate.FromISA((9,0,6)), "library": opMap}])
+    return MasterSolutionLibrary(solutions, hardware)
+
+@pytest.mark.parametrize("useLibYAML", [True, False])
+def test_yaml_stream_matches_dump(useLibYAML):
+    backend = YAMLIO.YAMLBackend(useLibYAML)
+    library = makeLibrary()
+
+    expected = io.StringIO()
+    backend.dump(Utils.state(library), expected, explicit_start=True, explicit_end=True)
+    streamed = io.StringIO()
+    backend.dumpState(library, streamed, explicit_start=True, explicit_end=True)
+
+    assert streamed.getvalue() == expected.getvalue()
+
+def test_json_stream_matches_state():
+    library = makeLibrary()
+    streamed = io.StringIO()
+    YAMLIO.Backends["json"].dumpState(library, streamed, explicit_start=True, explicit_end=True)
+    streamed.seek(0)
+    assert YAMLIO.load(streamed, "json") == Utils.state(library)
+
+@pytest.mark.parametrize("format", ["yaml", "json"])
+def test_write_state(tmpdir, format):
+    filename = str(tmpdir.join("TensileLibrary.yaml"))
+    library = makeLibrary()
+    YAMLIO.writeState(filename, library, format)
+    assert YAMLIO.readConfig(filename) == Utils.state(library)
+
+def test_lazy_state():
+    library = makeLibrary()
+    (kind, items) = Utils.lazy_state(library)
+    assert kind == "map"
+    assert dict([(k, Utils.state(v)) for (k, v) in items]) == Utils.state(library)
+    assert Utils.lazy_state(3) == ("leaf", 3)
+    (kind, items) = Utils.lazy_state((1, 2))
+    assert (kind, list(items)) == ("seq", [1, 2])
@@ -0,0 +1,252 @@
+################################################################################
+# Copyright (C) 2019 Advanced Micro Devices, Inc. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell cop-
+# ies of the Software, and to permit persons to whom the Software is furnished
+# to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IM-
+# PLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNE-
+# CTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+################################################################################
+
+import csv
+import itertools
+import os
+import random
+import pytest
+from Tensile import LibraryLogic, YAMLIO
+from Tensile.Common import defaultAnalysisParameters, globalParameters
+from Tensile.SolutionStructs import ProblemSizes, Solution
+
+numpy = pytest.importorskip("numpy")
+
+# a batched NT GEMM as a contraction, since range analysis doesn't cover
+# the leading dimension indices of GEMM problem types
+problemType = {"OperationType": "TensorContraction", "DataType": "s", "UseBeta": True, \
+    "NumIndicesC": 3, "IndexAssignmentsA": [0, 3, 2], "IndexAssignmentsB": [1, 3, 2]}
+
+# I, J, K (batch), L
+sizeRange = [[64, 64, 256], [64, 64, 256], [1, 1, 2], [32, 32, 128]]
+
+def makeSolutions(count):
+    solutions = []
+    for (wgm, depthU) in itertools.product(range(1, 100), [8, 16, 32]):
+        solution = Solution({"ProblemType": problemType, "KernelLanguage": "Source", \
+            "WorkGroup": [16, 16, 1], "ThreadTile": [4, 4], "DepthU": depthU, \
+            "WorkGroupMapping": wgm})
+        if solution["Valid"]:
+            solutions.append(solution)
+        if len(solutions) == count:
+            return solutions
+
+def writeBenchmarkData(path, numSolutions, seed, invalid=[], exact=[]):
+    """
+    Writes the solutions .yaml and .csv which benchmarking would write for
+    sizeRange and the exact sizes, with random gflops where some solutions
+    win some regions.  invalid is a list of (problemIdx, solutionIdx) which
+    failed (0 gflops).
+    """
+    solutions = makeSolutions(numSolutions)
+    problemSizes = ProblemSizes(solutions[0]["ProblemType"], \
+        [{"Range": sizeRange}] + [{"Exact": list(size)} for size in exact])
+    solutionsFileName = os.path.join(path, "data.yaml")
+    dataFileName = os.path.join(path, "data.csv")
+    YAMLIO.writeSolutions(solutionsFileName, problemSizes, [solutions])
+
+    rand = random.Random(seed)
+    with open(dataFileName, "w") as f:
+        writer = csv.writer(f)
+        numIndices = len(problemSizes.sizes[0])
+        writer.writerow(["Problem"] + ["Size%u" % i for i in range(0, numIndices)] + ["TotalFlops"] \
+            + ["Solution%u" % i for i in range(0, numSolutions)])
+        for (problemIdx, size) in enumerate(problemSizes.sizes):
+            best = rand.randrange(numSolutions)
+            gflops = [rand.uniform(500, 1000) * (1.5 if s == best else 1) for s in range(0, numSolutions)]
+            for (p, s) in invalid:
+                if p == problemIdx:
+                    gflops[s] = 0
+            writer.writerow([problemIdx] + list(size) + [0] + gflops)
+    return [(None, dataFileName, solutionsFileName)]
+
+def makeAnalyzers(problemSizeGroups, analysisParameters={}, \
+        analyzerClasses=[LibraryLogic.LogicAnalyzer, LibraryLogic.NumPyLogicAnalyzer]):
+    analyzers = []
+    for analyzerClass in analyzerClasses:
+        (problemSizes, solutions) = YAMLIO.readSolutions(problemSizeGroups[0][2])
+        parameters = dict(defaultAnalysisParameters)
+        parameters.update(analysisParameters)
+        analyzers.append(analyzerClass(solutions[0]["ProblemType"], [problemSizes], [solutions], \
+            [problemSizeGroups[0][1]], parameters))
+    return analyzers
+
+def test_data_cube(params, tmpdir):
+    # NumPyLogicAnalyzer reads the CSV in blocks, here of 7 rows
+    globalParameters["CSVBlockRows"] = 7
+    exact = [(64, 128, 1, 32), (256, 64, 2, 64)]
+    (reference, analyzer) = makeAnalyzers(writeBenchmarkData(str(tmpdir), 6, 1, [(9, 3)], exact))
+    assert analyzer.numProblemSizes == [4, 4, 2, 4]
+    assert list(analyzer.data) == list(reference.data)
+    assert analyzer.exactWinners == reference.exactWinners
+    assert len(analyzer.exactWinners) == 2
+
+    cube = analyzer.cube()
+    for problemIndices in reference.problemIndicesForGlobalRange[::7]:
+        for solutionIdx in range(0, reference.numSolutions):
+            assert cube[tuple([solutionIdx] + problemIndices)] == reference[problemIndices, solutionIdx]
+
+def test_ranges(params, tmpdir):
+    (reference, analyzer) = makeAnalyzers(writeBenchmarkData(str(tmpdir), 6, 2))
+    ranges = [reference.globalIndexRange,
+              [[1, 3], [0, 4], [1, 2], [0, 4]],
+              [[2, 3], [3, 4], [0, 2], [1, 2]],
+              [[2, 2], [0, 4], [0, 2], [0, 4]]]
+    for indexRange in ranges:
+        assert analyzer.problemIndicesForRange(indexRange) == reference.problemIndicesForRange(indexRange)
+        assert analyzer.scoreRangeForSolutions(indexRange) == reference.scoreRangeForSolutions(indexRange)
+        assert analyzer.winnerForRange(indexRange) == reference.winnerForRange(indexRange)
+
+    for problemIndices in reference.problemIndicesForGlobalRange[::5]:
+        assert analyzer.getWinnerForProblem(problemIndices) == reference.getWinnerForProblem(problemIndices)
+
+def test_importance(params, tmpdir):
+    (reference, analyzer) = makeAnalyzers(writeBenchmarkData(str(tmpdir), 8, 3))
+    while reference.numSolutions > 1:
+        assert analyzer.solutionImportance() == reference.solutionImportance()
+        assert analyzer.rangeWinners() == reference.rangeWinners()
+        lis = reference.leastImportantSolution()
+        assert analyzer.leastImportantSolution() == lis
+        for a in [reference, analyzer]:
+            a.removeSolution(lis[0])
+        assert list(analyzer.data) == list(reference.data)
+
+def test_invalid_solutions(params, tmpdir):
+    (reference, analyzer) = makeAnalyzers(writeBenchmarkData(str(tmpdir), 6, 4, [(3, 1), (20, 4), (20, 2)]))
+    for a in [reference, analyzer]:
+        a.removeInvalidSolutions()
+    assert analyzer.numSolutions == reference.numSolutions == 3
+    assert analyzer.solutions == reference.solutions
+    assert list(analyzer.data) == list(reference.data)
+
+@pytest.mark.parametrize("analyzerClass", [LibraryLogic.LogicAnalyzer, LibraryLogic.NumPyLogicAnalyzer])
+def test_masked_removal(params, tmpdir, analyzerClass):
+    # removing solutions one at a time and compacting the data after each
+    # removal, as removeInvalidSolutions and removeLeastImportantSolutions
+    # used to, must select the same solutions as masking them
+    exact = [(64, 128, 1, 32), (256, 64, 2, 64)]
+    problemSizeGroups = writeBenchmarkData(str(tmpdir), 24, 7, [(3, 1), (20, 4), (20, 2), (40, 0)], exact)
+    (reference, analyzer) = makeAnalyzers(problemSizeGroups, {"SolutionImportanceMin": 0.05}, \
+        [analyzerClass, analyzerClass])
+    assert set(reference.exactWinners) == set(exact)
+
+    while reference.invalidSolution() >= 0:
+        reference.removeSolution(reference.invalidSolution())
+    while reference.numSolutions > 1:
+        lis = reference.leastImportantSolution()
+        if lis is None or not (lis[1] < reference.parameters["SolutionImportanceMin"] or lis[2] == 0):
+            break
+        reference.removeSolution(lis[0])
+
+    analyzer.removeInvalidSolutions()
+    analyzer.removeLeastImportantSolutions()
+
+    assert 1 < analyzer.numSolutions < 20
+    assert analyzer.solutions == reference.solutions
+    assert list(analyzer.data) == list(reference.data)
+    assert analyzer.exactWinners == reference.exactWinners
+
+def test_weighted_importance(params, tmpdir):
+    exact = [(64, 128, 1, 32), (256, 64, 2, 64)]
+    problemSizeGroups = writeBenchmarkData(str(tmpdir), 12, 8, exact=exact)
+    (reference, analyzer) = makeAnalyzers(problemSizeGroups, {"SolutionImportanceMin": 0.05})
+    # a heavily used range problem, sizes between and beyond the benchmarked
+    # ones and the first exact size
+    sizeWeights = {(128, 128, 1, 64): 1000, (100, 70, 1, 32): 3, (1000, 64, 1, 32): 2, exact[0]: 5}
+    heavy = analyzer.indicesToSerial(0, [1, 1, 0, 1]) // analyzer.numSolutions
+    for a in [reference, analyzer]:
+        a.removeInvalidSolutions()
+        a.weightProblems(sizeWeights)
+        assert a.problemWeights[heavy] == 1000
+        assert a.problemWeights[a.indicesToSerial(0, [1, 0, 0, 0]) // a.numSolutions] == 3
+        assert a.problemWeights[a.indicesToSerial(0, [3, 0, 0, 0]) // a.numSolutions] == 2
+        assert sorted(set(a.problemWeights)) == [0.01, 2, 3, 1000]
+        assert a.exactWeights == {exact[0]: 5, exact[1]: 0}
+        assert a.problemFlops()[heavy] == 2 * 128 * 128 * 1 * 64 * 1000
+
+    # the winner of the heavy problem saves the most production time
+    (importance, _, _, _) = analyzer.solutionImportance()
+    heavyWinner = max(range(0, analyzer.numSolutions), key=lambda s: analyzer.data[heavy*analyzer.numSolutions + s])
+    assert max(importance, key=lambda i: i[1])[0] == heavyWinner
+    for (i, r) in zip(importance, reference.solutionImportance()[0]):
+        assert i[1:] == pytest.approx(r[1:])
+
+    scores = analyzer.scoreRangeForSolutions(analyzer.globalIndexRange)
+    assert scores == pytest.approx(reference.scoreRangeForSolutions(reference.globalIndexRange))
+
+    # only the used exact size keeps its winner
+    assert analyzer.requiredExactWinners() == set([analyzer.exactWinners[exact[0]][0]])
+    heavySolution = analyzer.solutions[heavyWinner]
+    usedExactSolution = analyzer.solutions[analyzer.exactWinners[exact[0]][0]]
+    for a in [reference, analyzer]:
+        a.removeLeastImportantSolutions()
+    assert analyzer.solutions == reference.solutions
+    assert analyzer.exactWinners == reference.exactWinners
+    assert heavySolution in analyzer.solutions
+    assert analyzer.solutions[analyzer.exactWinners[exact[0]][0]] == usedExactSolution
+    if exact[1] in analyzer.exactWinners:
+        assert analyzer.exactWinners[exact[1]][0] >= 0
+
+def test_weighted_exact_prefix(params, tmpdir):
+    # two exact sizes which only differ in their last index
+    exact = [(64, 128, 1, 32), (64, 128, 1, 64)]
+    (analyzer,) = makeAnalyzers(writeBenchmarkData(str(tmpdir), 4, 3, exact=exact), {}, [LibraryLogic.LogicAnalyzer])
+    # a used size without the last index is spread over both
+    analyzer.weightProblems({(64, 128, 1): 6, exact[1]: 4})
+    assert analyzer.exactWeights == {exact[0]: 3, exact[1]: 7}
+    analyzer.weightProblems({exact[1]: 4})
+    assert analyzer.exactWeights == {exact[0]: 0, exact[1]: 4}
+
+@pytest.mark.parametrize("selectionAlg", [0, 1])
+def test_logic(params, tmpdir, selectionAlg):
+    (reference, analyzer) = makeAnalyzers(writeBenchmarkData(str(tmpdir), 10, 5))
+    results = []
+    for a in [reference, analyzer]:
+        a.removeInvalidSolutions()
+        if selectionAlg == 0:
+            a.removeLeastImportantSolutions()
+        else:
+            a.keepWinnerSolutions()
+        rangeLogic = a.enRule(0, a.globalIndexRange)
+        score = a.scoreRangeForLogic(a.globalIndexRange, rangeLogic)
+        results.append((a.solutions, rangeLogic, score))
+    assert results[1] == results[0]
+
+def test_partial_logic(params, tmpdir):
+    (reference, analyzer) = makeAnalyzers(writeBenchmarkData(str(tmpdir), 4, 6))
+    # the last index (in index order) isn't covered above size index 1
+    logic = [[-1, [[-1, [[-1, [[1, 2]]]]]]]]
+    indexRange = reference.globalIndexRange
+    assert not analyzer.assignLogic(numpy.empty(analyzer.numProblemSizes, dtype=numpy.intp),
+        [[0, n] for n in analyzer.numProblemSizes], indexRange, 0, logic)
+
+@pytest.mark.parametrize("analyzerClass", [LibraryLogic.LogicAnalyzer, LibraryLogic.NumPyLogicAnalyzer])
+def test_parallel_logic(params, tmpdir, analyzerClass):
+    (analyzer,) = makeAnalyzers(writeBenchmarkData(str(tmpdir), 10, 8, [(5, 2)]), {}, [analyzerClass])
+    analyzer.removeInvalidSolutions()
+    analyzer.removeLeastImportantSolutions()
+    rangeLogic = analyzer.enRule(0, analyzer.globalIndexRange)
+
+    globalParameters["CpuThreads"] = -2
+    (indexIndex, subRanges) = analyzer.enRuleSubRanges(analyzer.globalIndexRange, 8)
+    assert indexIndex == 2 and len(subRanges) == 8
+    assert analyzer.parallelEnRule(analyzer.globalIndexRange) == rangeLogic
+    assert analyzer.enRuleCache == {}
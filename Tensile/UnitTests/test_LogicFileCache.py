@@ -0,0 +1,94 @@
+################################################################################
+# Copyright (C) 2019 Advanced Micro Devices, Inc. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell cop-
+# ies of the Software, and to permit persons to whom the Software is furnished
+# to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IM-
+# PLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNE-
+# CTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+################################################################################
+
+import json
+import os
+import pytest
+from Tensile import YAMLIO
+from Tensile.Common import globalParameters
+
+def writeFile(filename, contents):
+    with open(filename, 'w') as f:
+        f.write(contents)
+
+@pytest.fixture
+def cachePath(params, tmpdir):
+    globalParameters["LogicFileCachePath"] = str(tmpdir.join("cache"))
+    return globalParameters["LogicFileCachePath"]
+
+def test_cache_written_and_used(cachePath, tmpdir):
+    logicFile = str(tmpdir.join("logic.yaml"))
+    writeFile(logicFile, "- {MinimumRequiredVersion: 4.11.0}\n- vega10\n- [[128, 128, 1, 64], [0, 1000.0]]\n")
+    expected = [{"MinimumRequiredVersion": "4.11.0"}, "vega10", [[128, 128, 1, 64], [0, 1000.0]]]
+
+    assert YAMLIO.readCachedYAML(logicFile) == expected
+    cacheFile = YAMLIO.logicCacheFileName(logicFile)
+    assert os.path.isfile(cacheFile)
+    assert os.path.dirname(cacheFile) == cachePath
+    # nothing is written next to the source
+    assert sorted(os.listdir(str(tmpdir))) == ["cache", "logic.yaml"]
+
+    # a valid cache entry is used in place of the source
+    with open(cacheFile) as f:
+        cache = json.load(f)
+    cache["Data"][1] = "from-cache"
+    with open(cacheFile, 'w') as f:
+        json.dump(cache, f)
+    assert YAMLIO.readCachedYAML(logicFile)[1] == "from-cache"
+    # entries are keyed on the absolute path
+    relativeFile = os.path.relpath(logicFile)
+    assert YAMLIO.logicCacheFileName(relativeFile) == cacheFile
+    assert YAMLIO.readCachedYAML(relativeFile)[1] == "from-cache"
+
+def test_cache_invalidated_by_change(cachePath, tmpdir):
+    logicFile = str(tmpdir.join("logic.yaml"))
+    writeFile(logicFile, "- a\n")
+    assert YAMLIO.readCachedYAML(logicFile) == ["a"]
+
+    writeFile(logicFile, "- b\n- c\n")
+    os.utime(logicFile, (1, 1))
+    assert YAMLIO.readCachedYAML(logicFile) == ["b", "c"]
+
+def test_touched_file_revalidated_by_hash(cachePath, tmpdir):
+    logicFile = str(tmpdir.join("logic.yaml"))
+    writeFile(logicFile, "- a\n")
+    YAMLIO.readCachedYAML(logicFile)
+
+    os.utime(logicFile, (1, 1))
+    assert YAMLIO.readCachedYAML(logicFile) == ["a"]
+    with open(YAMLIO.logicCacheFileName(logicFile)) as f:
+        assert json.load(f)["Stamp"] == YAMLIO.fileStamp(logicFile)
+
+def test_unrepresentable_not_cached(cachePath, tmpdir):
+    logicFile = str(tmpdir.join("logic.yaml"))
+    writeFile(logicFile, "- {1: a}\n")
+    assert YAMLIO.readCachedYAML(logicFile) == [{1: "a"}]
+    assert not os.path.exists(YAMLIO.logicCacheFileName(logicFile))
+
+def test_cache_disabled(cachePath, tmpdir):
+    logicFile = str(tmpdir.join("logic.yaml"))
+    writeFile(logicFile, "- a\n")
+    globalParameters["LogicFileCache"] = False
+    try:
+        assert YAMLIO.readCachedYAML(logicFile) == ["a"]
+    finally:
+        globalParameters["LogicFileCache"] = True
+    assert not os.path.exists(YAMLIO.logicCacheFileName(logicFile))
@@ -0,0 +1,190 @@
+################################################################################
+# Copyright (C) 2019 Advanced Micro Devices, Inc. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell cop-
+# ies of the Software, and to permit persons to whom the Software is furnished
+# to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IM-
+# PLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNE-
+# CTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+################################################################################
+
+import copy
+import os
+import random
+import shutil
+import stat
+import sys
+import pytest
+from Tensile import Common, LibraryLogic, RangeLogic, YAMLIO
+from Tensile.Common import globalParameters
+from Tensile.TensileCreateLibrary import TensileCreateLibrary
+from Tensile.UnitTests.test_LogicAnalyzer import makeAnalyzers, writeBenchmarkData
+
+configsPath = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Configs")
+logicFileName = os.path.join(configsPath, "miopen", "archives", "resnet50", "2018-10-09", "logic", "merged", \
+    "vega20_Cijk_Ailk_Bljk_SB.yaml")
+
+@pytest.fixture
+def logicFile(params, tmpdir):
+    fileName = str(tmpdir.join(os.path.basename(logicFileName)))
+    shutil.copy(logicFileName, fileName)
+    return fileName
+
+# Writes the file named by -o, or X.o for each X.s, as hipcc and the
+# assembler would.
+stubCompiler = """#!{python}
+import os, sys
+args = sys.argv[1:]
+if '-o' in args:
+    outputs = [args[args.index('-o') + 1]]
+else:
+    outputs = [os.path.splitext(os.path.basename(a))[0] + '.o' for a in args if a.endswith('.s')]
+for output in outputs:
+    with open(output, 'w') as f:
+        f.write('')
+"""
+
+def rangeLibraries(state):
+    libraries = []
+    if isinstance(state, dict):
+        if state.get("type") == "RangeLogic":
+            libraries.append(state)
+        for value in state.values():
+            libraries += rangeLibraries(value)
+    elif isinstance(state, list):
+        for value in state:
+            libraries += rangeLibraries(value)
+    return libraries
+
+def thresholdSizes(indexOrder, rangeLogic):
+    # for each index, sizes at, just above and between its thresholds
+    sizes = [set([1]) for i in indexOrder]
+    def collect(logic, level):
+        if isinstance(logic, list):
+            for (threshold, nextLogic) in logic:
+                if threshold >= 0:
+                    sizes[indexOrder[level]].update([threshold, threshold + 1])
+                collect(nextLogic, level + 1)
+    collect(rangeLogic, len(indexOrder) - RangeLogic.logicDepth(rangeLogic))
+    return [sorted(s) for s in sizes]
+
+def test_small_logic():
+    indexOrder = [1, 0]
+    rangeLogic = [[16, [[8, 0], [32, 0], [-1, 1]]],
+                  [64, [[8, 0], [32, 0], [-1, 1]]],
+                  [128, [[4, 2], [-1, 3]]],
+                  [256, 4]]
+    exactLogic = {(10, 10): [5, 100.0]}
+    logic = RangeLogic.CompiledLogic(indexOrder, exactLogic, rangeLogic)
+    # the first two intervals of index 1 share their subtree and are merged,
+    # and so are the first two intervals of their index 0 node
+    assert logic.thresholds[logic.root] == [64, 128, 256]
+    assert logic.numNodes == 9
+
+    for size in [(s0, s1) for s0 in range(0, 40) for s1 in range(0, 300, 7)] + [(10, 10)]:
+        expected = 5 if size == (10, 10) else RangeLogic.walkRangeLogic(indexOrder, rangeLogic, size)
+        assert logic.solution(size) == expected
+    # sizes beyond the last threshold without -1 have no solution
+    assert logic.solution((1, 257)) is None
+
+    reread = RangeLogic.CompiledLogic.FromState(YAMLIO.yaml.safe_load(YAMLIO.yaml.safe_dump(logic.state())))
+    assert reread.state() == logic.state()
+    assert reread.solution((3, 100)) == logic.solution((3, 100))
+
+    assert RangeLogic.CompiledLogic(indexOrder, exactLogic, None).solution((1, 1)) is None
+
+def test_compiled_logic_file(logicFile):
+    data = YAMLIO.parseLibraryLogic(logicFile)
+    (indexOrder, exactLogic, rangeLogic) = data[6:9]
+    logic = RangeLogic.CompiledLogic(indexOrder, exactLogic, rangeLogic)
+    assert logic.numNodes < 200
+
+    rand = random.Random(1)
+    choices = thresholdSizes(indexOrder, rangeLogic)
+    for i in range(0, 20000):
+        size = tuple([rand.choice(c) for c in choices])
+        assert logic.rangeSolution(size) == RangeLogic.walkRangeLogic(indexOrder, rangeLogic, size)
+    for (size, winner) in exactLogic:
+        assert logic.solution(size) == winner[0]
+
+def test_analyzer_logic(params, tmpdir):
+    (analyzer,) = makeAnalyzers(writeBenchmarkData(str(tmpdir), 10, 5), {}, [LibraryLogic.LogicAnalyzer])
+    analyzer.removeInvalidSolutions()
+    analyzer.removeLeastImportantSolutions()
+    indexLogic = analyzer.enRule(0, analyzer.globalIndexRange)
+    rangeLogic = copy.deepcopy(indexLogic)
+    analyzer.prepareLogic(rangeLogic)
+    logic = RangeLogic.CompiledLogic(analyzer.indexOrder, analyzer.exactWinners, rangeLogic)
+
+    for problemIndices in analyzer.problemIndicesForGlobalRange:
+        size = [analyzer.problemIndexToSize[i][problemIndices[i]] for i in range(0, analyzer.numIndices)]
+        assert logic.solution(size) == analyzer.getSolutionForProblemIndicesUsingLogic(problemIndices, indexLogic)
+
+def test_library(logicFile):
+    globalParameters["LibraryRangeLogic"] = True
+    data = YAMLIO.parseLibraryLogic(logicFile)
+    library = YAMLIO.libraryLogicFromData(logicFile, data)[-1]
+    # only the exact sizes of another file for the same problems are merged
+    otherData = YAMLIO.parseLibraryLogic(logicFile)
+    otherData[8] = []
+    other = YAMLIO.libraryLogicFromData(logicFile, otherData)[-1]
+    library.merge(other)
+
+    libraries = rangeLibraries(library.state())
+    assert len(libraries) == 1
+
+    # the library refers to solutions by their index in the merged library
+    logic = RangeLogic.CompiledLogic.FromState(libraries[0])
+    reference = RangeLogic.CompiledLogic(data[6], data[7], data[8])
+    names = dict([(s.index, s.name) for s in library.solutions.values()])
+    solutions = list(library.solutions.values())[:len(data[5])]
+    rand = random.Random(2)
+    choices = thresholdSizes(data[6], data[8])
+    for i in range(0, 1000):
+        size = tuple([rand.choice(c) for c in choices])
+        assert names[logic.solution(size)] == solutions[reference.solution(size)].name
+    # but not a second range tree
+    with pytest.raises(AssertionError):
+        library.merge(YAMLIO.libraryLogicFromData(logicFile, YAMLIO.parseLibraryLogic(logicFile))[-1])
+
+    globalParameters["LibraryRangeLogic"] = False
+    library = YAMLIO.libraryLogicFromData(logicFile, data)[-1]
+    assert len(rangeLibraries(library.state())) == 0
+
+def test_create_library(params, tmpdir, monkeypatch):
+    logicPath = tmpdir.mkdir("logic")
+    shutil.copy(logicFileName, str(logicPath))
+    binPath = tmpdir.mkdir("bin")
+    for name in ["hipcc", "assembler"]:
+        path = str(binPath.join(name))
+        with open(path, "w") as f:
+            f.write(stubCompiler.format(python=sys.executable))
+        os.chmod(path, os.stat(path).st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", str(binPath) + os.pathsep + os.environ["PATH"])
+    monkeypatch.setenv("TENSILE_ROCM_ASSEMBLER_PATH", str(binPath.join("assembler")))
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmpdir.join("cache")))
+    # TensileCreateLibrary restores the default working path
+    monkeypatch.setitem(Common.defaultGlobalParameters, "WorkingPath", str(tmpdir))
+
+    outputPath = tmpdir.join("output")
+    monkeypatch.setattr(sys, "argv", ["TensileCreateLibrary", str(logicPath), str(outputPath), "HIP", \
+        "--cxx-compiler=hipcc", "--library-range-logic"])
+    TensileCreateLibrary()
+    with open(str(outputPath.join("library", "TensileLibrary.yaml"))) as f:
+        libraries = rangeLibraries(YAMLIO.yaml.safe_load(f))
+
+    fileName = str(logicPath.join(os.path.basename(logicFileName)))
+    library = YAMLIO.libraryLogicFromData(fileName, YAMLIO.parseLibraryLogic(fileName))[-1]
+    assert libraries == rangeLibraries(library.state())
+    assert len(libraries) == 1
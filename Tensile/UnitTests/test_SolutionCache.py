@@ -0,0 +1,111 @@
+################################################################################
+# Copyright (C) 2019 Advanced Micro Devices, Inc. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell cop-
+# ies of the Software, and to permit persons to whom the Software is furnished
+# to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IM-
+# PLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNE-
+# CTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+################################################################################
+
+
+import pytest
+from copy import deepcopy
+from Tensile import SolutionCache
+from Tensile.Common import assignGlobalParameters, globalParameters
+from Tensile.SolutionStructs import Solution
+
+problemType = {"OperationType": "GEMM", "DataType": "s", "TransposeA": False, \
+        "TransposeB": True, "UseBeta": True, "Batched": True}
+config = {"ProblemType": problemType, "KernelLanguage": "Source", "WorkGroup": [16, 16, 1], \
+        "ThreadTile": [4, 4], "DepthU": 16}
+# MacroTile 64 x 64 doesn't divide into 64 x 32 LocalSplitU threads
+invalidConfig = dict(config, WorkGroup=[16, 16, 4], ThreadTile=[4, 4], DepthU=8)
+
+@pytest.fixture
+def cache():
+    assignGlobalParameters({"PrintLevel": 0})
+    SolutionCache._cache = None
+    yield
+    SolutionCache._cache = None
+
+def stats():
+    current = SolutionCache.current()
+    return (current.hits, current.misses, len(current.entries))
+
+def test_memo(cache):
+    uncached = Solution(config)
+    assert stats() == (0, 1, 0)
+    assert str(Solution(config)) == str(uncached)
+    assert stats() == (0, 2, 1)
+    solutions = [Solution(config) for i in range(0, 3)]
+    assert stats() == (3, 2, 1)
+    for solution in solutions:
+        assert solution.getAttributes() == uncached.getAttributes()
+        assert str(solution) == str(uncached)
+
+    # hits share nothing with the cache or each other
+    solutions[0]["WorkGroup"][0] = 8
+    solutions[0]["ProblemType"]["TransposeA"] = True
+    solutions[1]["DepthU"] = 32
+    assert str(solutions[1]) != str(uncached)
+    again = Solution(config)
+    assert again.getAttributes() == uncached.getAttributes()
+    assert str(again) == str(uncached)
+
+    # neither does the config
+    modified = deepcopy(config)
+    built = [Solution(modified) for i in range(0, 3)]
+    modified["WorkGroup"][0] = 8
+    assert built[2].getAttributes() == uncached.getAttributes()
+
+def test_key(cache):
+    current = SolutionCache.current()
+    key = current.key(config)
+    assert current.key(deepcopy(config)) == key
+    # a different key order can give a different state order
+    assert current.key(dict(reversed(list(config.items())))) != key
+    assert current.key(dict(config, DepthU=16.0)) != key
+    globalParameters["CurrentISA"] = (9, 0, 6)
+    assert current.key(config) != key
+
+def test_rejection(cache, capsys):
+    solutions = [Solution(invalidConfig) for i in range(0, 3)]
+    assert stats() == (1, 2, 1)
+    assert [s["Valid"] for s in solutions] == [False] * 3
+    (blob, reasons, name) = list(SolutionCache.current().entries.values())[0]
+    assert len(reasons) > 0
+
+    capsys.readouterr()
+    globalParameters["PrintSolutionRejectionReason"] = True
+    Solution(invalidConfig)
+    assert "%s (cached)" % reasons[0] in capsys.readouterr().out
+
+def test_disk(cache, tmpdir):
+    globalParameters["SolutionCachePath"] = str(tmpdir)
+    uncached = Solution(config)
+    assert stats() == (0, 1, 1)
+    SolutionCache.finish()
+    assert len(tmpdir.listdir()) == 1
+
+    SolutionCache._cache = None
+    solution = Solution(config)
+    assert stats() == (1, 0, 1)
+    assert solution.getAttributes() == uncached.getAttributes()
+    assert str(solution) == str(uncached)
+
+def test_disabled(cache):
+    globalParameters["SolutionCache"] = False
+    Solution(config)
+    assert SolutionCache.current() is None
@@ -0,0 +1,122 @@
+################################################################################
+# Copyright (C) 2019 Advanced Micro Devices, Inc. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell cop-
+# ies of the Software, and to permit persons to whom the Software is furnished
+# to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IM-
+# PLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNE-
+# CTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+################################################################################
+
+import os
+import random
+import shutil
+import pytest
+from Tensile import YAMLIO
+from Tensile.Common import assignGlobalParameters
+from Tensile.SolutionLibrary import ExactIndex, NearestIndex
+
+configsPath = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Configs")
+logicFileName = os.path.join(configsPath, "miopen", "Logic", "deepbench_gemm", "vega10_Cijk_Ailk_Bjlk_SB.yaml")
+
+@pytest.fixture
+def logicFile(tmpdir):
+    assignGlobalParameters({"PrintLevel": 0})
+    fileName = str(tmpdir.join(os.path.basename(logicFileName)))
+    shutil.copy(logicFileName, fileName)
+    return fileName
+
+def test_exact_index():
+    # the hash is part of the serialized index
+    assert ExactIndex.hashKey([]) == 0xcbf29ce484222325
+    assert ExactIndex.hashKey([1024, 32, 1, 512]) == 0x4cff91d911b9e42c
+
+    rand = random.Random(3)
+    keys = [[rand.randrange(1, 64) for i in range(0, 4)] for row in range(0, 500)]
+    keys += keys[:50]
+    index = ExactIndex.FromKeys(keys)
+    assert len(index.slots) == 1024
+    assert len([row for row in index.slots if row >= 0]) == len(set([tuple(key) for key in keys]))
+    for key in keys:
+        assert index.row(key) == keys.index(key)
+    assert index.row([100, 100, 100, 100]) is None
+
+    assert ExactIndex.FromKeys([]).row([1, 2]) is None
+
+def bruteForceRow(keys, key):
+    distances = [sum([(a - b) * (a - b) for (a, b) in zip(key, k)]) for k in keys]
+    return distances.index(min(distances))
+
+@pytest.mark.parametrize("leafSize", [1, 2, 8])
+def test_nearest_index(leafSize):
+    rand = random.Random(5)
+    # few distinct values along each index, so there are duplicate keys,
+    # keys on the split planes and equally near rows
+    keys = [[rand.choice([1, 2, 4, 8, 16]) * 64, rand.choice([64, 128, 192]), 1, rand.randrange(1, 9) * 32] \
+            for row in range(0, 300)]
+    keys += [[rand.randrange(1, 4096), rand.randrange(1, 4096), rand.randrange(1, 3), rand.randrange(1, 4096)] \
+            for row in range(0, 300)]
+    index = NearestIndex.FromKeys(keys, leafSize)
+    assert sorted(index.rows) == list(range(0, len(keys)))
+
+    queries = keys[:100] + [[k + 1 for k in key] for key in keys[:100]]
+    queries += [[rand.randrange(0, 5000), rand.randrange(0, 5000), rand.randrange(0, 4), rand.randrange(0, 5000)] \
+            for q in range(0, 500)]
+    for key in queries:
+        assert index.nearestRow(key) == bruteForceRow(keys, key)
+
+    reread = NearestIndex(keys, index.state()["rows"], index.state()["nodes"])
+    assert [reread.nearestRow(key) for key in queries] == [index.nearestRow(key) for key in queries]
+
+    assert NearestIndex.FromKeys([]).nearestRow([1, 2]) is None
+    assert NearestIndex.FromKeys([[3, 4]], leafSize).nearestRow([0, 0]) == 0
+
+def test_matching_library(logicFile):
+    library = YAMLIO.libraryLogicFromData(logicFile, YAMLIO.parseLibraryLogic(logicFile))[-1]
+    library.merge(YAMLIO.libraryLogicFromData(logicFile, YAMLIO.parseLibraryLogic(logicFile))[-1])
+    (matching,) = list(library.matchingLibraries())
+    assert "exactIndex" not in matching.state()
+    assert "nearestIndex" not in matching.state()
+
+    keys = [entry["key"] for entry in matching.table]
+    distanceRows = [matching.bestMatchRow(key) for key in keys]
+    nearRows = [matching.bestMatchRow([k + 1 for k in key]) for key in keys]
+    library.buildExactIndices()
+    library.buildNearestIndices()
+    # duplicate keys of the merged libraries find their first row, as the distance search does
+    assert [matching.bestMatchRow(key) for key in keys] == distanceRows
+    assert distanceRows == [keys.index(key) for key in keys]
+    assert [matching.bestMatchRow([k + 1 for k in key]) for key in keys] == nearRows
+    assert nearRows == [bruteForceRow(keys, [k + 1 for k in key]) for key in keys]
+
+    libraryFileName = os.path.join(os.path.dirname(logicFile), "TensileLibrary.yaml")
+    YAMLIO.writeState(libraryFileName, library, "json")
+    def find(state):
+        if isinstance(state, dict):
+            if state.get("type") == "Matching":
+                return state
+            state = list(state.values())
+        if isinstance(state, list):
+            for value in state:
+                found = find(value)
+                if found is not None:
+                    return found
+    written = find(YAMLIO.readConfig(libraryFileName))
+    assert written["exactIndex"] == {"hash": "FNV-1a-64", "slots": matching.exactIndex.slots}
+    assert written["nearestIndex"] == {"type": "KDTree", "rows": matching.nearestIndex.rows, "nodes": matching.nearestIndex.nodes}
+    assert written == find(library.state())
+    reread = ExactIndex([row["key"] for row in written["table"]], written["exactIndex"]["slots"])
+    assert [reread.row(key) for key in keys] == distanceRows
+    reread = NearestIndex([row["key"] for row in written["table"]], written["nearestIndex"]["rows"], written["nearestIndex"]["nodes"])
+    assert [reread.nearestRow([k + 1 for k in key]) for key in keys] == nearRows
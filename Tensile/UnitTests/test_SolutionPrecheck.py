@@ -0,0 +1,82 @@
+################################################################################
+# Copyright (C) 2019 Advanced Micro Devices, Inc. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell cop-
+# ies of the Software, and to permit persons to whom the Software is furnished
+# to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IM-
+# PLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNE-
+# CTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+################################################################################
+
+import pytest
+import random
+from Tensile.Common import assignGlobalParameters
+from Tensile.SolutionPrecheck import SolutionPrecheck
+from Tensile.SolutionStructs import Solution
+
+def problemType(dataType, transposeA):
+    return {"OperationType": "GEMM", "DataType": dataType, "TransposeA": transposeA, \
+            "TransposeB": True, "UseBeta": True, "Batched": True}
+
+def randomConfig(rng):
+    config = {"WorkGroup": [rng.choice([2, 4, 8, 16, 32]), rng.choice([2, 4, 8, 16, 32]), rng.choice([1, 1, 2, 4])], \
+            "ThreadTile": [rng.choice([1, 2, 3, 4, 6, 8]), rng.choice([1, 2, 3, 4, 6, 8])], \
+            "KernelLanguage": "Source"}
+    for (name, values) in [("DepthU", [-1, 4, 8, 16, 32, 64, 128]), ("VectorWidth", [-1, 1, 2, 4, 8]), \
+            ("GlobalReadVectorWidth", [-1, 1, 2, 4, 8]), ("PrefetchLocalRead", [False, True, 2]), \
+            ("PrefetchGlobalRead", [False, True]), ("LdsPadA", [-1, 0, 1]), ("LdsPadB", [-1, 0, 1]), \
+            ("MaxOccupancy", [1, 4, 40]), ("MacroTileShapeMax", [1, 4, 64]), ("GlobalSplitU", [1, 2])]:
+        if rng.random() < 0.6:
+            config[name] = rng.choice(values)
+    return config
+
+@pytest.mark.parametrize("dataType,transposeA", [("s", False), ("d", True), ("h", False)])
+def test_pruned_are_invalid(dataType, transposeA):
+    assignGlobalParameters({"PrintLevel": 0, "SolutionCache": False})
+    rng = random.Random(dataType)
+    precheck = SolutionPrecheck(problemType(dataType, transposeA))
+    numValid = 0
+    for i in range(0, 400):
+        config = randomConfig(rng)
+        rule = precheck.check(config)
+        solution = Solution(dict(config, ProblemType=problemType(dataType, transposeA)))
+        numValid += solution["Valid"]
+        assert rule is None or not solution["Valid"], (rule, config)
+
+    assert precheck.checked == 400
+    assert sum(precheck.pruned.values()) > 100
+    assert numValid > 0
+    for rule in ["MacroTileShape", "ThreadTileVectorWidth", "NumThreads", "GlobalWriteVectorWidth", \
+            "LocalSplitU", "DepthU", "LdsPad", "LDS"]:
+        assert precheck.pruned[rule] > 0, rule
+    if dataType == "d":
+        assert precheck.pruned["VectorWidthBytes"] > 0 and precheck.pruned["GlobalReadVectorWidthBytes"] > 0
+
+def test_rules():
+    assignGlobalParameters({"PrintLevel": 0})
+    precheck = SolutionPrecheck(problemType("s", False))
+    config = {"WorkGroup": [16, 16, 1], "ThreadTile": [4, 4], "DepthU": 16}
+    assert precheck.check(config) is None
+    assert precheck.check(dict(config, ThreadTile=[4, 6], VectorWidth=4)) == "ThreadTileVectorWidth"
+    assert precheck.check(dict(config, ThreadTile=[3, 3])) is None
+    assert precheck.check(dict(config, WorkGroup=[16, 16, 4], ThreadTile=[1, 1])) == "NumThreads"
+    assert precheck.check(dict(config, WorkGroup=[8, 8, 2], ThreadTile=[6, 4])) == "LocalSplitU"
+    assert precheck.check(dict(config, DepthU=-1, ThreadTile=[4, 8])) == "DepthU"
+    assert precheck.check(dict(config, DepthU=6, PrefetchLocalRead=3)) == "DepthU"
+    assert precheck.check(dict(config, DepthU=128, ThreadTile=[8, 8])) == "LDS"
+    assert precheck.check(dict(config, GlobalReadVectorWidth=8)) == "GlobalReadVectorWidthBytes"
+    # a config without a DepthU of its own searches for one
+    assert precheck.check(dict(config, DepthU=-2, ThreadTile=[8, 8])) is None
+    assert precheck.checked == 10
+    assert precheck.pruned["DepthU"] == 2 and precheck.pruned["LDS"] == 1
@@ -0,0 +1,141 @@
+################################################################################
+# Copyright (C) 2019 Advanced Micro Devices, Inc. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell cop-
+# ies of the Software, and to permit persons to whom the Software is furnished
+# to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IM-
+# PLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNE-
+# CTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+################################################################################
+
+import itertools
+import pytest
+from Tensile import LibraryLogic, SolutionSelection, YAMLIO
+from Tensile.UnitTests.test_LogicAnalyzer import makeAnalyzers, writeBenchmarkData
+
+numpy = pytest.importorskip("numpy")
+
+def makeAnalyzer(tmpdir, numSolutions, seed, analysisParameters={}, invalid=[], exact=[]):
+    problemSizeGroups = writeBenchmarkData(str(tmpdir), numSolutions, seed, invalid, exact)
+    (analyzer,) = makeAnalyzers(problemSizeGroups, analysisParameters, [LibraryLogic.NumPyLogicAnalyzer])
+    if len(invalid) == 0:
+        analyzer.removeInvalidSolutions()
+    return analyzer
+
+def test_greedy(params, tmpdir):
+    # solution 0 is the only one valid for the first 4 problems and fails for the others
+    invalid = [(p, s) for p in range(0, 4) for s in range(1, 8)] + [(p, 0) for p in range(4, 128)]
+    analyzer = makeAnalyzer(tmpdir, 8, 1, {"MaxSolutions": 3}, invalid)
+    problem = SolutionSelection.SelectionProblem(analyzer)
+    selector = SolutionSelection.GreedySelector(analyzer)
+    order = selector.order()
+
+    # the fastest of the solutions valid for most problems, then the one valid for the rest
+    assert order[0] == min(range(1, 8), key=lambda s: problem.predictedTime(set([s]))[0])
+    assert order[1] == 0
+    assert problem.predictedTime(order[:1])[1] == 4
+    assert problem.predictedTime(order[:2])[1] == 0
+    curve = problem.curve(order)
+    # the curve doesn't count uncovered problems, so only falls once all are covered
+    assert curve[1:] == sorted(curve[1:], reverse=True)
+    for count in range(1, len(order) + 1):
+        assert curve[count-1] == pytest.approx(problem.predictedTime(order[:count])[0])
+
+    best = min([problem.predictedTime(set(c))[0] for c in itertools.combinations(range(0, 8), 3) \
+            if problem.predictedTime(set(c))[1] == 0])
+    assert best <= curve[2] <= 1.1 * best
+
+    selector.apply()
+    assert analyzer.numSolutions == 3
+
+def test_top_k(params, tmpdir):
+    exact = [(64, 128, 1, 32)]
+    analyzer = makeAnalyzer(tmpdir, 12, 2, {"MaxSolutions": 4}, exact=exact)
+    exactWinner = analyzer.solutions[analyzer.exactWinners[exact[0]][0]]
+    selector = SolutionSelection.TopKSelector(analyzer)
+    order = selector.order()
+    assert order[0] == analyzer.exactWinners[exact[0]][0]
+    saved = [selector.saved[s] for s in order[1:]]
+    assert saved == sorted(saved, reverse=True)
+
+    selector.apply()
+    assert analyzer.numSolutions == 4
+    assert exactWinner in analyzer.solutions
+
+def test_weights(params, tmpdir):
+    logFileName = str(tmpdir.join("rocblas.log"))
+    with open(logFileName, "w") as f:
+        f.write("./rocblas-bench -f gemm -r f32_r --transposeA N --transposeB T -m 128 -n 256 -k 40 --alpha 1 --lda 128 --ldb 256 --beta 0 --ldc 128\n")
+        f.write("./rocblas-bench -f gemm_strided_batched -r f32_r -m 128 -n 256 -k 40 --batch_count 2\n")
+        f.write("./rocblas-bench -f gemm -r f32_r --transposeA N --transposeB T -m 128 -n 256 -k 40 --alpha 1\n")
+        f.write("./rocblas-bench -f trsm -m 128 -n 256\n")
+    sizeWeights = SolutionSelection.readSizeWeights(logFileName)
+    assert sizeWeights == {(128, 256, 1, 40): 2, (128, 256, 2, 40): 1}
+
+    yamlFileName = str(tmpdir.join("weights.yaml"))
+    with open(yamlFileName, "w") as f:
+        YAMLIO.dump([[[64, 64, 1, 32], 5], [[1000, 64, 1, 32], 1], [[64, 64, 1, 32], 2]], f)
+    sizeWeights = SolutionSelection.readSizeWeights(yamlFileName)
+    assert sizeWeights == {(64, 64, 1, 32): 7, (1000, 64, 1, 32): 1}
+
+    analyzer = makeAnalyzer(tmpdir, 4, 3, {"UntracedSizeWeight": 0})
+    analyzer.weightProblems(sizeWeights)
+    problem = SolutionSelection.SelectionProblem(analyzer)
+    assert problem.weights.sum() == 8
+    # only the weighted problems take any predicted time
+    assert (problem.times[problem.weights == 0] == 0).all()
+    assert (problem.times[problem.weights > 0] > 0).all()
+
+def test_report(params, tmpdir):
+    analyzer = makeAnalyzer(tmpdir, 6, 4, {"MaxSolutions": 2})
+    curves = SolutionSelection.report(analyzer)
+    assert [name for (name, _, _) in curves] == ["greedy", "top-K"]
+    assert [stop for (_, _, stop) in curves] == [2, 2]
+    # reporting leaves the analyzer as it was
+    assert analyzer.numSolutions == 6
+
+@pytest.mark.parametrize("selectorClass", [SolutionSelection.LeastImportantSelector, SolutionSelection.WinnerSelector])
+def test_kept(params, tmpdir, selectorClass):
+    exact = [(64, 128, 1, 32)]
+    analyzer = makeAnalyzer(tmpdir, 12, 3, {"SolutionImportanceMin": 0.05}, exact=exact)
+    solutions = list(analyzer.solutions)
+    exactWinners = dict([(size, list(winner)) for (size, winner) in analyzer.exactWinners.items()])
+    kept = selectorClass(analyzer).kept()
+    # finding the kept solutions leaves the analyzer as it was
+    assert analyzer.solutions == solutions
+    assert analyzer.exactWinners == exactWinners
+    assert analyzer.numActiveSolutions == len(solutions)
+
+    selectorClass(analyzer).apply()
+    assert analyzer.solutions == [solutions[s] for s in sorted(kept)]
+
+def test_register(params, tmpdir):
+    class FirstSelector(SolutionSelection.SolutionSelector):
+        Name = "first"
+        def order(self):
+            return list(range(0, self.analyzer.numSolutions))
+        def stop(self, order):
+            return 1
+
+    SolutionSelection.registerSelector(100, FirstSelector)
+    try:
+        analyzer = makeAnalyzer(tmpdir, 4, 5)
+        first = analyzer.solutions[0]
+        SolutionSelection.getSelector(100, analyzer).apply()
+        assert analyzer.solutions == [first]
+    finally:
+        del SolutionSelection.Selectors[100]
+
+    with pytest.raises(SystemExit):
+        SolutionSelection.getSelector(100, analyzer)
@@ -0,0 +1,78 @@
+################################################################################
+# Copyright (C) 2019 Advanced Micro Devices, Inc. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell cop-
+# ies of the Software, and to permit persons to whom the Software is furnished
+# to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IM-
+# PLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNE-
+# CTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+################################################################################
+
+from Tensile.SolutionStructs import Solution, SolutionSet
+
+def makeSolution(**params):
+    config = {"ProblemType": {"OperationType": "GEMM", "DataType": "s", "TransposeA": False,
+                              "TransposeB": True, "UseBeta": True, "Batched": True},
+              "KernelLanguage": "Source"}
+    config.update(params)
+    return Solution(config)
+
+def test_dedup_matches_list():
+    solutions = [makeSolution(WorkGroupMapping=wgm) for wgm in [1, 2, 1, 4, 2, 8]]
+    expected = []
+    for s in solutions:
+        if s not in expected:
+            expected.append(s)
+
+    solutionSet = SolutionSet(solutions)
+    assert list(solutionSet) == expected
+    assert all([a is b for (a, b) in zip(solutionSet, [solutions[0], solutions[1], solutions[3], solutions[5]])])
+
+def test_kernels():
+    solutions = [makeSolution(WorkGroupMapping=wgm) for wgm in [1, 2, 1]]
+    kernels = SolutionSet()
+    for s in solutions:
+        kernels.update(s.getKernels())
+
+    assert len(kernels) == 2
+    assert solutions[2].getKernels()[0] in kernels
+    assert kernels[0] == solutions[0].getKernels()[0]
+    assert kernels.index(solutions[1].getKernels()[0]) == 1
+
+def test_add_remove():
+    a = makeSolution(WorkGroupMapping=1)
+    b = makeSolution(WorkGroupMapping=2)
+    solutionSet = SolutionSet()
+    assert solutionSet.add(a)
+    assert solutionSet.add(b)
+    assert not solutionSet.add(makeSolution(WorkGroupMapping=1))
+
+    solutionSet.remove(a)
+    assert a not in solutionSet
+    assert list(solutionSet) == [b]
+    assert solutionSet.index(b) == 0
+
+def test_key_follows_changes():
+    a = makeSolution(WorkGroupMapping=1)
+    before = SolutionSet.key(a)
+    a["WorkGroupMapping"] = 2
+    assert SolutionSet.key(a) != before
+    assert SolutionSet.key(a) == SolutionSet.key(makeSolution(WorkGroupMapping=2))
+
+def test_key_matches_eq():
+    solutions = [makeSolution(WorkGroupMapping=wgm, GlobalSplitU=gsu) for wgm in [1, 2] for gsu in [1, 2]]
+    solutions.append(makeSolution(WorkGroupMapping=1, GlobalSplitU=1))
+    for a in solutions:
+        for b in solutions:
+            assert (SolutionSet.key(a) == SolutionSet.key(b)) == (a == b)
@@ -0,0 +1,56 @@
+################################################################################
+# Copyright (C) 2019 Advanced Micro Devices, Inc. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell cop-
+# ies of the Software, and to permit persons to whom the Software is furnished
+# to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IM-
+# PLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNE-
+# CTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+################################################################################
+
+import io
+import pytest
+import yaml
+from Tensile import YAMLIO
+
+data = {"solutions": [{"index": 0, "name": "Cijk_Ailk_Bjlk_SB_MT64x64x8", "sizeMapping": {"workGroup": [16, 16, 1]},
+                       "info": {"DepthU": "8"}, "debugKernel": False, "ideals": {}}],
+        "library": {"type": "Matching", "table": [{"key": [128, 128, 1, 64], "value": {"index": 0}, "speed": 1.5}]}}
+
+@pytest.mark.parametrize("format", [None, "yaml", "json"])
+def test_round_trip(tmpdir, format):
+    filename = str(tmpdir.join("TensileLibrary.yaml"))
+    YAMLIO.write(filename, data, format)
+    with open(filename) as f:
+        assert YAMLIO.load(f, format) == data
+
+def test_json_readable_as_yaml(tmpdir):
+    filename = str(tmpdir.join("TensileLibrary.yaml"))
+    YAMLIO.write(filename, data, "json")
+    with open(filename) as f:
+        assert yaml.load(f, yaml.SafeLoader) == data
+    assert YAMLIO.readConfig(filename) == data
+
+def test_json_backend_reads_yaml():
+    stream = io.StringIO("---\na: [1, 2]\nb: x\n...\n")
+    assert YAMLIO.load(stream, "json") == {"a": [1, 2], "b": "x"}
+
+def test_pure_python_backend_matches():
+    stream = io.StringIO()
+    YAMLIO.YAMLBackend(useLibYAML=False).dump(data, stream)
+    assert YAMLIO.load(io.StringIO(stream.getvalue())) == data
+
+def test_unknown_format():
+    with pytest.raises(SystemExit):
+        YAMLIO.getBackend("xml")
@@ -0,0 +1,1114 @@
+################################################################################
+# Copyright (C) 2019 Advanced Micro Devices, Inc. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell cop-
+# ies of the Software, and to permit persons to whom the Software is furnished
+# to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IM-
+# PLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNE-
+# CTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+################################################################################
+
+# Host-side (no GPU required) benchmarks of the Tensile library build and
+# analysis steps.
+# usage: python -m Tensile.Utilities.benchmark_host <benchmark> [options]
+
+from __future__ import print_function
+import argparse
+import gc
+import glob
+import itertools
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+HR = "################################################################################"
+
+################################################################################
+# Synthetic Data
+################################################################################
+def syntheticSolutions(count):
+  """
+  Returns count distinct valid GEMM solutions.
+  """
+  from Tensile.SolutionStructs import Solution
+
+  problemType = {"OperationType": "GEMM", "DataType": "s", "TransposeA": False, \
+      "TransposeB": True, "UseBeta": True, "Batched": True}
+  tiles = [([16,16,1], [4,4]), ([16,16,1], [8,8]), ([8,8,1], [4,4]), ([16,8,1], [4,8]), \
+      ([8,16,1], [8,4]), ([16,16,1], [2,2])]
+  depthUs = [8, 16, 32]
+
+  solutions = []
+  for (wgm, (workGroup, threadTile), depthU) in itertools.product(range(1, 1025), tiles, depthUs):
+    solution = Solution({"ProblemType": problemType, "KernelLanguage": "Source", \
+        "WorkGroup": workGroup, "ThreadTile": threadTile, "DepthU": depthU, \
+        "WorkGroupMapping": wgm})
+    if solution["Valid"]:
+      solutions.append(solution)
+    if len(solutions) == count:
+      break
+  return solutions
+
+def timeIt(function, *args):
+  start = time.time()
+  rv = function(*args)
+  return (time.time() - start, rv)
+
+################################################################################
+# Solution / Kernel Dedup
+################################################################################
+def listDedup(items):
+  rv = []
+  for item in items:
+    if item not in rv:
+      rv.append(item)
+  return rv
+
+def setDedup(items):
+  from Tensile.SolutionStructs import SolutionSet
+  return list(SolutionSet(items))
+
+def benchmarkDedup(args):
+  print(HR)
+  print("# Solution and kernel dedup: list membership vs SolutionSet")
+  print("# each solution appears twice, as when merging overlapping logic files")
+  print("%10s %8s %14s %14s %10s" % ("solutions", "kind", "list (s)", "set (s)", "speedup"))
+  for size in args.sizes:
+    solutions = syntheticSolutions(size)
+    for s in solutions:
+      str(s) # names are cached by both approaches, so compute them up front
+    solutions = solutions + solutions
+    kernels = [k for s in solutions for k in s.getKernels()]
+
+    for (kind, items) in [("solution", solutions), ("kernel", kernels)]:
+      (listTime, listResult) = timeIt(listDedup, items)
+      (setTime, setResult) = timeIt(setDedup, items)
+      assert len(listResult) == len(setResult) == size
+      print("%10u %8s %14.4f %14.4f %9.1fx" % (size, kind, listTime, setTime, listTime / max(setTime, 1e-9)))
+
+################################################################################
+# Logic File Reading
+################################################################################
+def initGlobalParameters():
+  from Tensile.Common import assignGlobalParameters, globalParameters
+  globalParameters["PrintLevel"] = 0
+  assignGlobalParameters({"PrintLevel": 0})
+
+def benchmarkLogic(args):
+  from Tensile import YAMLIO
+  from Tensile.Common import globalParameters
+  initGlobalParameters()
+
+  tmpDir = tempfile.mkdtemp()
+  globalParameters["LogicFileCachePath"] = os.path.join(tmpDir, "cache")
+  try:
+    logicFiles = []
+    for f in sorted(glob.glob(os.path.join(args.path, "*.yaml"))):
+      logicFiles.append(shutil.copy(f, tmpDir))
+    totalSize = sum([os.path.getsize(f) for f in logicFiles])
+
+    print(HR)
+    print("# Reading %u logic files (%.1f MB) from %s" % (len(logicFiles), totalSize / 1e6, args.path))
+    print("%28s %12s %12s" % ("", "cold (s)", "cached (s)"))
+    for (name, function) in [("parse (readCachedYAML)", YAMLIO.readCachedYAML), \
+        ("readLibraryLogicForSchedule", YAMLIO.readLibraryLogicForSchedule)]:
+      for f in logicFiles:
+        cacheFile = YAMLIO.logicCacheFileName(f)
+        if os.path.exists(cacheFile):
+          os.remove(cacheFile)
+      (coldTime, _) = timeIt(lambda: [function(f) for f in logicFiles])
+      (warmTime, _) = timeIt(lambda: [function(f) for f in logicFiles])
+      print("%28s %12.3f %12.3f" % (name, coldTime, warmTime))
+  finally:
+    shutil.rmtree(tmpDir)
+
+################################################################################
+# YAML Backends
+################################################################################
+def syntheticLibraryState(count):
+  """
+  Returns the state of a TensileLibrary with count solutions, made by
+  replicating the solutions of a shipped logic file.
+  """
+  from copy import deepcopy
+  from Tensile import YAMLIO, Utils
+  logicFile = os.path.join(configsPath(), "miopen", "Logic", "deepbench_gemm", "vega10_Cijk_Ailk_Bjlk_SB.yaml")
+  state = Utils.state(YAMLIO.readLibraryLogicForSchedule(logicFile)[-1])
+
+  baseSolutions = state["solutions"]
+  solutions = []
+  for idx in range(0, count):
+    # deep copies, so that the YAML dumpers can't use aliases
+    solution = deepcopy(baseSolutions[idx % len(baseSolutions)])
+    solution["index"] = idx
+    solution["name"] = "%s_%u" % (solution["name"], idx)
+    solutions.append(solution)
+  state["solutions"] = solutions
+  return state
+
+def configsPath():
+  return os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Configs")
+
+def benchmarkYAML(args):
+  import io
+  from Tensile import YAMLIO
+  initGlobalParameters()
+
+  backends = [("SafeLoader/SafeDumper", YAMLIO.YAMLBackend(useLibYAML=False))]
+  if YAMLIO.Backends["yaml"].loader is not YAMLIO.yaml.SafeLoader:
+    backends.append(("CSafeLoader/CSafeDumper", YAMLIO.Backends["yaml"]))
+  else:
+    print("# PyYAML was built without libyaml; C loader/dumper unavailable")
+  backends.append(("json", YAMLIO.Backends["json"]))
+
+  configFiles = sorted(glob.glob(os.path.join(args.path, "**", "*.yaml"), recursive=True))
+  configs = []
+  for configFile in configFiles:
+    with open(configFile) as f:
+      configs.append(f.read())
+  configData = [YAMLIO.load(io.StringIO(c)) for c in configs]
+
+  libraryState = syntheticLibraryState(args.solutions)
+
+  print(HR)
+  print("# YAMLIO backend throughput")
+  print("%24s %30s %10s %10s %10s" % ("backend", "data", "MB", "load (s)", "dump (s)"))
+  for (name, backend) in backends:
+    for (dataName, documents) in [("%u Configs files" % len(configData), configData), \
+        ("%u-solution library" % args.solutions, [libraryState])]:
+      if backend is YAMLIO.Backends["json"] and documents is configData:
+        # configs are hand written YAML; json only applies to generated libraries
+        continue
+      streams = [io.StringIO() for d in documents]
+      (dumpTime, _) = timeIt(lambda: [backend.dump(d, st) for (d, st) in zip(documents, streams)])
+      texts = [st.getvalue() for st in streams]
+      size = sum([len(t) for t in texts]) / 1e6
+      (loadTime, loaded) = timeIt(lambda: [backend.load(io.StringIO(t)) for t in texts])
+      assert loaded == documents
+      print("%24s %30s %10.1f %10.2f %10.2f" % (name, dataName, size, loadTime, dumpTime))
+
+################################################################################
+# Streaming Library Writer
+################################################################################
+def benchmarkStream(args):
+  import tracemalloc
+  from Tensile import YAMLIO, Utils
+  from Tensile.Common import globalParameters
+  initGlobalParameters()
+  globalParameters["LogicFileCache"] = False
+
+  logicFiles = sorted(glob.glob(os.path.join(configsPath(), "miopen", "Logic", "deepbench_gemm", "*.yaml")))
+  library = None
+  for logicFile in itertools.islice(itertools.cycle(logicFiles), args.copies):
+    newLibrary = YAMLIO.readLibraryLogicForSchedule(logicFile)[-1]
+    if library is None:
+      library = newLibrary
+    else:
+      library.merge(newLibrary)
+
+  print(HR)
+  print("# Writing a %u-solution TensileLibrary: Utils.state + dump vs streaming" % len(library.solutions))
+  print("%8s %26s %10s %16s" % ("format", "writer", "time (s)", "peak alloc (MB)"))
+  tmpDir = tempfile.mkdtemp()
+  try:
+    filename = os.path.join(tmpDir, "TensileLibrary.yaml")
+    for format in ["yaml", "json"]:
+      for (name, function) in [("write(Utils.state(lib))", lambda: YAMLIO.write(filename, Utils.state(library), format)), \
+          ("writeState(lib)", lambda: YAMLIO.writeState(filename, library, format))]:
+        (elapsed, _) = timeIt(function)
+        # measure memory separately, tracemalloc slows allocations down
+        tracemalloc.start()
+        function()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print("%8s %26s %10.2f %16.1f" % (format, name, elapsed, peak / 1e6))
+  finally:
+    shutil.rmtree(tmpDir)
+
+################################################################################
+# Parallel Logic Reading
+################################################################################
+def readFullLogic(logicFile):
+  import pickle
+  from Tensile import YAMLIO
+  logic = YAMLIO.readLibraryLogicForSchedule(logicFile)
+  return (logic, len(pickle.dumps(logic, pickle.HIGHEST_PROTOCOL)))
+
+def readParsedLogic(logicFile):
+  import pickle
+  from Tensile import YAMLIO
+  parsed = YAMLIO.parseLibraryLogicFile(logicFile)
+  return (parsed, len(pickle.dumps(parsed, pickle.HIGHEST_PROTOCOL)))
+
+def benchmarkParse(args):
+  from Tensile import Common, YAMLIO
+  from Tensile.Common import globalParameters
+  initGlobalParameters()
+  globalParameters["LogicFileCache"] = False
+  globalParameters["CpuThreads"] = args.threads
+
+  tmpDir = tempfile.mkdtemp()
+  try:
+    sources = sorted(glob.glob(os.path.join(configsPath(), "miopen", "Logic", "deepbench_gemm", "*.yaml")))
+    logicFiles = []
+    for idx in range(0, args.files):
+      logicFiles.append(os.path.join(tmpDir, "%03u_%s" % (idx, os.path.basename(sources[idx % len(sources)]))))
+      shutil.copy(sources[idx % len(sources)], logicFiles[-1])
+
+    def readAndMerge():
+      # objects built in the workers, merged once they have all been returned
+      results = Common.ParallelMap(readFullLogic, logicFiles, "")
+      library = results[0][0][-1]
+      for (logic, _) in results[1:]:
+        library.merge(logic[-1])
+      return (library, sum([size for (_, size) in results]))
+
+    def parseAndStream():
+      # workers only parse; objects are built and merged as files arrive
+      results = Common.ParallelMap(readParsedLogic, logicFiles, "", method=lambda x: x.imap_unordered)
+      indices = dict([(f, idx) for (idx, f) in enumerate(logicFiles)])
+      pending = {}
+      nextIdx = 0
+      library = None
+      transferred = 0
+      for ((logicFile, data, error), size) in results:
+        assert error is None
+        transferred += size
+        pending[indices[logicFile]] = YAMLIO.libraryLogicFromData(logicFile, data)[-1]
+        while nextIdx in pending:
+          newLibrary = pending.pop(nextIdx)
+          nextIdx += 1
+          if library is None:
+            library = newLibrary
+          else:
+            library.merge(newLibrary)
+      return (library, transferred)
+
+    print(HR)
+    print("# Reading and merging %u logic files with %u worker processes" % (len(logicFiles), args.threads))
+    print("%34s %10s %20s" % ("", "time (s)", "pickled results (MB)"))
+    solutions = []
+    for (name, function) in [("readLibraryLogicForSchedule, merge", readAndMerge), \
+        ("parseLibraryLogic, stream", parseAndStream)]:
+      (elapsed, (library, transferred)) = timeIt(function)
+      solutions.append(len(library.solutions))
+      # don't make the next run pay for collecting this library
+      library = None
+      gc.collect()
+      print("%34s %10.2f %20.1f" % (name, elapsed, transferred / 1e6))
+    assert solutions[0] == solutions[1]
+  finally:
+    shutil.rmtree(tmpDir)
+
+################################################################################
+# Kernel Generation
+################################################################################
+class LegacyEmission:
+  """
+  Puts back the previous way of emitting kernel text: every Code.Module
+  builds its own string out of the strings of its items, and instruction
+  operands are formatted through a format string built per instruction.
+  """
+  def __enter__(self):
+    from Tensile import Code
+    def moduleStr(module):
+      return "".join([str(x) for x in module.itemList])
+    def render(items, separator=""):
+      return separator.join([str(x) for x in items])
+    def formatInst(params):
+      formatting = "%s"
+      if len(params) > 1:
+        formatting += " %s"
+      for i in range(0, len(params)-2):
+        formatting += ", %s"
+      return formatting % (params)
+    self.saved = (Code.Module.__str__, Code.Module.render, Code.render, Code.formatInst)
+    Code.Module.__str__ = moduleStr
+    Code.Module.render = Code.Item.render
+    Code.render = render
+    Code.formatInst = formatInst
+    return self
+
+  def __exit__(self, *args):
+    from Tensile import Code
+    (Code.Module.__str__, Code.Module.render, Code.render, Code.formatInst) = self.saved
+
+def benchmarkKernels(args):
+  from Tensile import YAMLIO
+  from Tensile.Common import globalParameters
+  from Tensile.KernelWriterAssembly import KernelWriterAssembly
+  from Tensile.KernelWriterSource import KernelWriterSource
+  from Tensile.SolutionStructs import Solution
+  initGlobalParameters()
+  globalParameters["LogicFileCache"] = False
+
+  groups = []
+  for name in args.logic:
+    logicFile = os.path.join(configsPath(), "miopen", "Logic", "deepbench_gemm", name)
+    solutions = YAMLIO.readLibraryLogicForSchedule(logicFile)[3]
+    groups.append((name, [k for s in solutions for k in s.getKernels()]))
+  groups.append(("synthetic source kernels", [k for s in syntheticSolutions(args.source) for k in s.getKernels()]))
+
+  kernelMinNaming = Solution.getMinNaming([k for (_, kernels) in groups for k in kernels])
+  writers = {"Assembly": KernelWriterAssembly(kernelMinNaming, None), \
+      "Source": KernelWriterSource(kernelMinNaming, None)}
+
+  def generate(kernels):
+    for kernel in kernels:
+      if kernel["KernelLanguage"] == "Assembly":
+        globalParameters["CurrentISA"] = tuple(kernel["ISA"])
+      writers[kernel["KernelLanguage"]].getKernelSource(kernel)
+
+  def cpuTime(kernels):
+    start = time.process_time()
+    generate(kernels)
+    return time.process_time() - start
+
+  print(HR)
+  print("# Kernel source generation: nested module strings vs Code.render")
+  print("%34s %8s %16s %16s %10s" % ("kernels", "count", "before (k/s)", "after (k/s)", "speedup"))
+  for (name, kernels) in groups:
+    # best of several interleaved runs; kernel generation is short and easily disturbed
+    (before, after) = ([], [])
+    for r in range(0, args.runs):
+      with LegacyEmission():
+        before.append(cpuTime(kernels))
+      after.append(cpuTime(kernels))
+    (before, after) = (len(kernels) / min(before), len(kernels) / min(after))
+    print("%34s %8u %16.1f %16.1f %9.2fx" % (name, len(kernels), before, after, after / before))
+
+################################################################################
+# Batched Assembly
+################################################################################
+stubAssembler = """#!/bin/sh
+# stand-in for the assembler: writes X.o for each X.s with -c, else the -o file
+out=""
+compile=0
+prev=""
+for a in "$@"; do
+  case "$a" in
+    -c) compile=1 ;;
+    *.s) [ $compile = 1 ] && touch "$(basename "$a" .s).o" ;;
+  esac
+  [ "$prev" = "-o" ] && out="$a"
+  prev="$a"
+done
+[ -n "$out" ] && echo "$@" > "$out"
+exit 0
+"""
+
+def benchmarkAssemble(args):
+  from Tensile import Common
+  from Tensile.Common import assignGlobalParameters, globalParameters
+  from Tensile.KernelWriterAssembly import KernelWriterAssembly
+  from Tensile.TensileCreateLibrary import assembleKernelBatches
+
+  tmpDir = tempfile.mkdtemp()
+  try:
+    assignGlobalParameters({"PrintLevel": 0, "WorkingPath": tmpDir, "CodeFromFiles": False, \
+        "CpuThreads": args.threads, "ShowProgressBar": False})
+    assembler = os.path.join(tmpDir, "stub-assembler")
+    with open(assembler, "w") as f:
+      f.write(stubAssembler)
+    os.chmod(assembler, 0o755)
+    globalParameters["AssemblerPath"] = assembler if args.assembler is None else args.assembler
+
+    kernelWriter = KernelWriterAssembly({}, None)
+    asmDir = kernelWriter.getAssemblyDirectory()
+    kernels = []
+    names = []
+    for idx in range(0, args.kernels):
+      kernels.append({"KernelLanguage": "Assembly", "ISA": [[9,0,0], [9,0,6]][idx % 2]})
+      names.append("kernel%04u" % idx)
+      with open(os.path.join(asmDir, names[-1] + ".s"), "w") as f:
+        f.write("s_endpgm\n")
+
+    print(HR)
+    print("# Assembling %u kernels for 2 ISAs with %s, %u threads" % (len(kernels), globalParameters["AssemblerPath"], Common.CPUThreadCount()))
+    print("%12s %14s %10s %12s" % ("batch size", "invocations", "time (s)", "kernels/s"))
+    for batchSize in [1] + args.batch_sizes:
+      globalParameters["AssemblerBatchSize"] = batchSize
+      results = [(0, "", "", name) for name in names]
+      (elapsed, _) = timeIt(assembleKernelBatches, kernels, results, kernelWriter)
+      assert all([err == 0 for (err, _, _, _) in results])
+      effective = min(batchSize, -(-len(kernels) // max(Common.CPUThreadCount(), 1)))
+      compiles = sum([-(-len(kernels[isa::2]) // effective) for isa in range(0, 2)])
+      print("%12u %14u %10.2f %12.1f" % (batchSize, compiles + len(kernels), elapsed, len(kernels) / elapsed))
+  finally:
+    shutil.rmtree(tmpDir)
+
+################################################################################
+# Assembler Capabilities
+################################################################################
+slowAssembler = """#!/bin/sh
+# stand-in for the assembler which takes as long as a compiler to start up
+cat > /dev/null
+sleep %f
+exit 0
+"""
+
+def probeAsmCapsSequentially(isaList):
+  from Tensile.Common import asmCapsProbes, isaName, tryAssembler
+  return dict([(v, [tryAssembler(isaName(v), options, asmString) for (_, options, asmString) in asmCapsProbes]) \
+      for v in isaList])
+
+def benchmarkAsmCaps(args):
+  from Tensile.Common import getAsmCaps, globalParameters
+
+  initGlobalParameters()
+  tmpDir = tempfile.mkdtemp()
+  try:
+    assembler = args.assembler
+    if assembler is None:
+      assembler = os.path.join(tmpDir, "slow-assembler")
+      with open(assembler, "w") as f:
+        f.write(slowAssembler % args.startup)
+      os.chmod(assembler, 0o755)
+    globalParameters["AssemblerPath"] = assembler
+
+    isaList = globalParameters["SupportedISA"] + [(0,0,0)]
+    cachePath = os.path.join(tmpDir, "cache")
+    print(HR)
+    print("# Probing %s for %u ISAs" % (assembler, len(isaList)))
+    print("%-24s %10s" % ("", "time (s)"))
+    for (name, function, params) in [("sequential", probeAsmCapsSequentially, ()),
+                                     ("parallel", getAsmCaps, (False,)),
+                                     ("parallel, cache miss", getAsmCaps, (True, cachePath)),
+                                     ("cache hit", getAsmCaps, (True, cachePath))]:
+      (elapsed, _) = timeIt(function, isaList, *params)
+      print("%-24s %10.3f" % (name, elapsed))
+  finally:
+    shutil.rmtree(tmpDir)
+
+################################################################################
+# Library Logic Analysis
+################################################################################
+def syntheticBenchmarkData(path, sizes, numSolutions, seed=0):
+  """
+  Writes the solutions .yaml and .csv which benchmarking a batched NT GEMM
+  contraction over sizes[i] values of each of its 4 indices would produce,
+  with random gflops where a different solution is fastest in each problem.
+  """
+  import csv
+  import random
+  from Tensile import YAMLIO
+  from Tensile.SolutionStructs import ProblemSizes, Solution
+
+  problemType = {"OperationType": "TensorContraction", "DataType": "s", "UseBeta": True, \
+      "NumIndicesC": 3, "IndexAssignmentsA": [0, 3, 2], "IndexAssignmentsB": [1, 3, 2]}
+  solutions = []
+  for (wgm, (workGroup, threadTile), depthU) in itertools.product(range(1, 1025), \
+      [([16,16,1], [4,4]), ([16,16,1], [8,8]), ([8,8,1], [4,4])], [8, 16, 32]):
+    solution = Solution({"ProblemType": problemType, "KernelLanguage": "Source", \
+        "WorkGroup": workGroup, "ThreadTile": threadTile, "DepthU": depthU, "WorkGroupMapping": wgm})
+    if solution["Valid"]:
+      solutions.append(solution)
+    if len(solutions) == numSolutions:
+      break
+
+  sizeRange = [[64, 64, 64*sizes[0]], [64, 64, 64*sizes[1]], [1, 1, sizes[2]], [32, 32, 32*sizes[3]]]
+  problemSizes = ProblemSizes(solutions[0]["ProblemType"], [{"Range": sizeRange}])
+  solutionsFileName = os.path.join(path, "data.yaml")
+  dataFileName = os.path.join(path, "data.csv")
+  YAMLIO.writeSolutions(solutionsFileName, problemSizes, [solutions])
+
+  rand = random.Random(seed)
+  with open(dataFileName, "w") as f:
+    writer = csv.writer(f)
+    writer.writerow(["Problem", "SizeI", "SizeJ", "SizeK", "SizeL", "TotalFlops"] \
+        + ["Solution%u" % i for i in range(0, numSolutions)])
+    for (problemIdx, size) in enumerate(problemSizes.sizes):
+      best = rand.randrange(numSolutions)
+      writer.writerow([problemIdx] + list(size) + [0] \
+          + [rand.uniform(500, 1000) * (1.5 if s == best else 1) for s in range(0, numSolutions)])
+  return (solutionsFileName, dataFileName)
+
+def analyzeBenchmarkData(analyzerClass, solutionsFileName, dataFileName, analysisParameters):
+  from Tensile import YAMLIO
+
+  timings = []
+  start = time.time()
+  (problemSizes, solutions) = YAMLIO.readSolutions(solutionsFileName)
+  analyzer = analyzerClass(solutions[0]["ProblemType"], [problemSizes], [solutions], [dataFileName], \
+      analysisParameters)
+  timings.append(time.time() - start)
+  for step in [analyzer.removeInvalidSolutions, analyzer.removeLeastImportantSolutions]:
+    (elapsed, _) = timeIt(step)
+    timings.append(elapsed)
+  (elapsed, rangeLogic) = timeIt(analyzer.enRule, 0, analyzer.globalIndexRange)
+  timings.append(elapsed)
+  (elapsed, score) = timeIt(analyzer.scoreRangeForLogic, analyzer.globalIndexRange, rangeLogic)
+  timings.append(elapsed)
+  return (timings, (analyzer.solutions, rangeLogic, score))
+
+def benchmarkAnalyze(args):
+  from Tensile import LibraryLogic, YAMLIO
+  from Tensile.Common import defaultAnalysisParameters, globalParameters
+  initGlobalParameters()
+  globalParameters["ExpandRanges"] = False
+  analysisParameters = dict(defaultAnalysisParameters)
+  analysisParameters["SolutionImportanceMin"] = args.importance
+
+  tmpDir = tempfile.mkdtemp()
+  try:
+    globalParameters["WorkingPath"] = tmpDir
+    (solutionsFileName, dataFileName) = syntheticBenchmarkData(tmpDir, args.sizes, args.solutions)
+    numProblems = args.sizes[0] * args.sizes[1] * args.sizes[2] * args.sizes[3]
+    YAMLIO.readSolutions(solutionsFileName) # warm up, so reading isn't charged to the first analyzer
+
+    analyzers = [("NumPy", LibraryLogic.NumPyLogicAnalyzer)]
+    if not args.skip_reference:
+      analyzers.append(("reference", LibraryLogic.LogicAnalyzer))
+    results = []
+    print(HR)
+    print("# Analyzing %u range problems (%s) x %u solutions" \
+        % (numProblems, "x".join([str(n) for n in args.sizes]), args.solutions))
+    print("%10s %8s %10s %12s %10s %10s %10s" % ("", "read", "invalid", "importance", "enRule", "score", "total"))
+    for (name, analyzerClass) in analyzers:
+      sys.stdout = open(os.devnull, "w")
+      try:
+        (timings, result) = analyzeBenchmarkData(analyzerClass, solutionsFileName, dataFileName, analysisParameters)
+      finally:
+        sys.stdout.close()
+        sys.stdout = sys.__stdout__
+      results.append(result)
+      print("%10s %8.2f %10.2f %12.2f %10.2f %10.2f %10.2f" % tuple([name] + timings + [sum(timings)]))
+    if len(results) > 1:
+      print("# identical results: %s" % (results[0] == results[1]))
+  finally:
+    shutil.rmtree(tmpDir)
+
+def benchmarkEnRule(args):
+  from Tensile import LibraryLogic, YAMLIO
+  from Tensile.Common import CPUThreadCount, defaultAnalysisParameters, globalParameters
+  initGlobalParameters()
+  globalParameters["ExpandRanges"] = False
+  globalParameters["ShowProgressBar"] = False
+  analyzerClass = LibraryLogic.LogicAnalyzer if args.reference else LibraryLogic.NumPyLogicAnalyzer
+
+  tmpDir = tempfile.mkdtemp()
+  try:
+    globalParameters["WorkingPath"] = tmpDir
+    (solutionsFileName, dataFileName) = syntheticBenchmarkData(tmpDir, args.sizes, args.solutions)
+    (problemSizes, solutions) = YAMLIO.readSolutions(solutionsFileName)
+    sys.stdout = open(os.devnull, "w")
+    try:
+      analyzer = analyzerClass(solutions[0]["ProblemType"], [problemSizes], [solutions], [dataFileName], \
+          dict(defaultAnalysisParameters))
+      analyzer.removeInvalidSolutions()
+    finally:
+      sys.stdout.close()
+      sys.stdout = sys.__stdout__
+
+    print(HR)
+    print("# enRule over %s problems x %u solutions (%s, %u cpus)" % ("x".join([str(n) for n in args.sizes]), \
+        analyzer.numSolutions, analyzerClass.__name__, multiprocessing.cpu_count()))
+    # CpuThreads caps the processes at the cpu count
+    print("%10s %10s %10s %10s" % ("processes", "seconds", "speedup", "identical"))
+    (serialTime, serialLogic) = timeIt(analyzer.enRule, 0, analyzer.globalIndexRange)
+    print("%10s %10.2f %10.2f %10s" % ("serial", serialTime, 1.0, True))
+    for threads in args.threads:
+      globalParameters["CpuThreads"] = threads
+      sys.stdout = open(os.devnull, "w")
+      try:
+        (elapsed, rangeLogic) = timeIt(analyzer.parallelEnRule, analyzer.globalIndexRange)
+      finally:
+        sys.stdout.close()
+        sys.stdout = sys.__stdout__
+      print("%10u %10.2f %10.2f %10s" % (CPUThreadCount(), elapsed, serialTime / elapsed, rangeLogic == serialLogic))
+  finally:
+    shutil.rmtree(tmpDir)
+
+def benchmarkCSV(args):
+  import tracemalloc
+  from Tensile import BenchmarkCSV, BenchmarkProblems, LibraryLogic, YAMLIO
+  from Tensile.Common import defaultAnalysisParameters, globalParameters
+  initGlobalParameters()
+  globalParameters["ExpandRanges"] = False
+
+  tmpDir = tempfile.mkdtemp()
+  try:
+    globalParameters["WorkingPath"] = tmpDir
+    (solutionsFileName, dataFileName) = syntheticBenchmarkData(tmpDir, args.sizes, args.solutions)
+    (problemSizes, solutions) = YAMLIO.readSolutions(solutionsFileName)
+    numpy = BenchmarkCSV.numpy
+
+    def readAnalyzer(analyzerClass):
+      return lambda: analyzerClass(solutions[0]["ProblemType"], [problemSizes], [solutions], [dataFileName], \
+          dict(defaultAnalysisParameters)).data
+    def readResults(columns):
+      def read():
+        BenchmarkCSV.numpy = numpy if columns else None
+        try:
+          return BenchmarkProblems.getResults(dataFileName, [solutions], False)
+        finally:
+          BenchmarkCSV.numpy = numpy
+      return read
+
+    print(HR)
+    print("# Reading %u problems x %u solutions (%.1f MB of CSV)" % (len(problemSizes.sizes), \
+        len(solutions), os.path.getsize(dataFileName) / 1e6))
+    print("%-36s %10s %16s" % ("", "seconds", "peak memory (MB)"))
+    for (name, function) in [("LogicAnalyzer.addFromCSV", readAnalyzer(LibraryLogic.LogicAnalyzer)), \
+                             ("NumPyLogicAnalyzer.addFromCSV", readAnalyzer(LibraryLogic.NumPyLogicAnalyzer)), \
+                             ("getResults, rows", readResults(False)), \
+                             ("getResults, columns", readResults(True))]:
+      sys.stdout = open(os.devnull, "w")
+      try:
+        (elapsed, _) = timeIt(function)
+        gc.collect()
+        # measure memory separately, tracemalloc slows allocations down
+        tracemalloc.start()
+        function()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+      finally:
+        sys.stdout.close()
+        sys.stdout = sys.__stdout__
+      print("%-36s %10.2f %16.1f" % (name, elapsed, peak / 1e6))
+  finally:
+    shutil.rmtree(tmpDir)
+
+def benchmarkStore(args):
+  from Tensile import BenchmarkStore, LibraryLogic, YAMLIO
+  from Tensile.Common import defaultAnalysisParameters, globalParameters
+  initGlobalParameters()
+  globalParameters["ExpandRanges"] = False
+
+  tmpDir = tempfile.mkdtemp()
+  try:
+    globalParameters["WorkingPath"] = tmpDir
+    (solutionsFileName, dataFileName) = syntheticBenchmarkData(tmpDir, args.sizes, args.solutions)
+    (problemSizes, solutions) = YAMLIO.readSolutions(solutionsFileName)
+    storeFileName = BenchmarkStore.storeFileName(tmpDir, solutions[0]["ProblemType"])
+
+    print(HR)
+    print("# Reading %u problems x %u solutions (%.1f MB of CSV)" % (len(problemSizes.sizes), \
+        len(solutions), os.path.getsize(dataFileName) / 1e6))
+    print("%-20s %16s %16s %16s" % ("", "CSV", "CSV + store", "store"))
+    for analyzerClass in [LibraryLogic.NumPyLogicAnalyzer, LibraryLogic.LogicAnalyzer]:
+      if os.path.exists(storeFileName):
+        os.remove(storeFileName)
+      timings = []
+      sys.stdout = open(os.devnull, "w")
+      try:
+        for fileName in [None, storeFileName, storeFileName]:
+          (elapsed, _) = timeIt(analyzerClass, solutions[0]["ProblemType"], [problemSizes], [solutions], \
+              [dataFileName], dict(defaultAnalysisParameters), fileName)
+          timings.append(elapsed)
+      finally:
+        sys.stdout.close()
+        sys.stdout = sys.__stdout__
+      print("%-20s %16.2f %16.2f %16.2f" % tuple([analyzerClass.__name__] + timings))
+  finally:
+    shutil.rmtree(tmpDir)
+
+def benchmarkSelect(args):
+  from copy import deepcopy
+  from Tensile import LibraryLogic, SolutionSelection, YAMLIO
+  from Tensile.Common import defaultAnalysisParameters, globalParameters
+  initGlobalParameters()
+  globalParameters["ExpandRanges"] = False
+  analysisParameters = dict(defaultAnalysisParameters)
+  analysisParameters["SolutionImportanceMin"] = args.importance
+  analysisParameters["MaxSolutions"] = args.max_solutions
+
+  tmpDir = tempfile.mkdtemp()
+  try:
+    globalParameters["WorkingPath"] = tmpDir
+    (solutionsFileName, dataFileName) = syntheticBenchmarkData(tmpDir, args.sizes, args.solutions)
+    (problemSizes, solutions) = YAMLIO.readSolutions(solutionsFileName)
+    sys.stdout = open(os.devnull, "w")
+    try:
+      analyzer = LibraryLogic.NumPyLogicAnalyzer(solutions[0]["ProblemType"], [problemSizes], [solutions], \
+          [dataFileName], analysisParameters)
+      analyzer.removeInvalidSolutions()
+    finally:
+      sys.stdout.close()
+      sys.stdout = sys.__stdout__
+    problem = SolutionSelection.SelectionProblem(analyzer)
+    (fastestMs, _) = problem.predictedTime(set(range(0, analyzer.numSolutions)))
+    solutionIndices = dict([(s, i) for (i, s) in enumerate(analyzer.solutions)])
+
+    print(HR)
+    print("# Selecting from %u solutions for %u range problems, MaxSolutions %u" \
+        % (analyzer.numSolutions, analyzer.totalProblems, args.max_solutions))
+    print("%-30s %8s %10s %18s %10s" % ("", "kernels", "ms", "vs all kernels", "secs"))
+    for (alg, selectorClass) in sorted(SolutionSelection.Selectors.items()):
+      pruned = deepcopy(analyzer)
+      sys.stdout = open(os.devnull, "w")
+      try:
+        (elapsed, _) = timeIt(selectorClass(pruned).apply)
+      finally:
+        sys.stdout.close()
+        sys.stdout = sys.__stdout__
+      kept = set([solutionIndices[s] for s in pruned.solutions])
+      (predictedMs, _) = problem.predictedTime(kept)
+      print("%-30s %8u %10.3f %17.2f%% %10.2f" % (selectorClass.Name, len(kept), predictedMs, \
+          100.0 * (predictedMs / fastestMs - 1), elapsed))
+  finally:
+    shutil.rmtree(tmpDir)
+
+def benchmarkRangeLogic(args):
+  import random
+  from Tensile import RangeLogic, YAMLIO
+
+  print(HR)
+  print("%-40s %6s %6s %12s %12s %8s" % ("# logic file", "rules", "nodes", "walk us", "compiled us", "same"))
+  for logicFile in args.logic:
+    data = YAMLIO.parseLibraryLogic(logicFile)
+    (indexOrder, exactLogic, rangeLogic) = data[6:9]
+    if rangeLogic is None:
+      print("%-40s has no range logic" % os.path.basename(logicFile))
+      continue
+    compiled = RangeLogic.CompiledLogic(indexOrder, exactLogic, rangeLogic)
+
+    # sizes at, just above and between the thresholds of each index
+    thresholds = [set([1]) for i in indexOrder]
+    rules = [0]
+    def collect(logic, level):
+      if isinstance(logic, list):
+        for (threshold, nextLogic) in logic:
+          rules[0] += 1
+          if threshold >= 0:
+            thresholds[indexOrder[level]].update([threshold, threshold + 1])
+          collect(nextLogic, level + 1)
+    collect(rangeLogic, len(indexOrder) - RangeLogic.logicDepth(rangeLogic))
+    rand = random.Random(0)
+    choices = [sorted(t) for t in thresholds]
+    sizes = [tuple([rand.choice(c) for c in choices]) for i in range(0, args.lookups)]
+
+    (walkTime, walked) = timeIt(lambda: [RangeLogic.walkRangeLogic(indexOrder, rangeLogic, size) for size in sizes])
+    (compiledTime, looked) = timeIt(lambda: [compiled.rangeSolution(size) for size in sizes])
+    print("%-40s %6u %6u %12.3f %12.3f %8s" % (os.path.basename(logicFile), rules[0], compiled.numNodes, \
+        1e6 * walkTime / len(sizes), 1e6 * compiledTime / len(sizes), walked == looked))
+
+def benchmarkExactIndex(args):
+  import random
+  from Tensile.SolutionLibrary import MatchingLibrary
+
+  print(HR)
+  print("%8s %10s %14s %14s %14s %8s" % ("# sizes", "build ms", "distance us", "index us", "index miss us", "same"))
+  for numSizes in args.sizes:
+    rand = random.Random(numSizes)
+    keys = set()
+    while len(keys) < numSizes:
+      keys.add((rand.randrange(1, 8192), rand.randrange(1, 8192), rand.randrange(1, 64), rand.randrange(1, 8192)))
+    table = [{"key": list(key), "value": row, "speed": 1.0} for (row, key) in enumerate(sorted(keys))]
+    library = MatchingLibrary(None, table, {"type": "Euclidean"})
+    lookups = [table[rand.randrange(numSizes)]["key"] for i in range(0, args.lookups)]
+    misses = [[k + 1 for k in key] for key in lookups if tuple([k + 1 for k in key]) not in keys]
+
+    (distanceTime, distanceRows) = timeIt(lambda: [library.bestMatchRow(key) for key in lookups])
+    (buildTime, _) = timeIt(library.buildExactIndex)
+    (indexTime, indexRows) = timeIt(lambda: [library.bestMatchRow(key) for key in lookups])
+    (missTime, _) = timeIt(lambda: [library.exactIndex.row(key) for key in misses])
+    print("%8u %10.2f %14.1f %14.3f %14.3f %8s" % (numSizes, 1e3 * buildTime, 1e6 * distanceTime / len(lookups), \
+        1e6 * indexTime / len(lookups), 1e6 * missTime / max(len(misses), 1), distanceRows == indexRows))
+
+def benchmarkNearestIndex(args):
+  import random
+  from Tensile.SolutionLibrary import MatchingLibrary
+
+  print(HR)
+  print("%8s %10s %14s %14s %8s" % ("# sizes", "build ms", "distance us", "kd-tree us", "same"))
+  for numSizes in args.sizes:
+    rand = random.Random(numSizes)
+    # benchmarked sizes are clustered on a few values of each index
+    values = [sorted(rand.sample(range(1, 8192), 64)), sorted(rand.sample(range(1, 8192), 64)), \
+        list(range(1, 17)), sorted(rand.sample(range(1, 8192), 64))]
+    keys = set()
+    while len(keys) < numSizes:
+      keys.add(tuple([rand.choice(v) for v in values]))
+    table = [{"key": list(key), "value": row, "speed": 1.0} for (row, key) in enumerate(sorted(keys))]
+    library = MatchingLibrary(None, table, {"type": "Euclidean"})
+    lookups = [[rand.randrange(1, 8192), rand.randrange(1, 8192), rand.randrange(1, 17), rand.randrange(1, 8192)] \
+        for i in range(0, args.lookups)]
+
+    (distanceTime, distanceRows) = timeIt(lambda: [library.bestMatchRow(key) for key in lookups])
+    (buildTime, _) = timeIt(library.buildNearestIndex)
+    (treeTime, treeRows) = timeIt(lambda: [library.bestMatchRow(key) for key in lookups])
+    print("%8u %10.2f %14.1f %14.3f %8s" % (numSizes, 1e3 * buildTime, 1e6 * distanceTime / len(lookups), \
+        1e6 * treeTime / len(lookups), distanceRows == treeRows))
+
+def benchmarkWinners(args):
+  import random
+  from copy import deepcopy
+  from Tensile.BenchmarkProblems import WinningParameterDict, HardcodedParameterIndex
+  from Tensile.Common import assignGlobalParameters
+  assignGlobalParameters({"PrintLevel": 0})
+
+  forks = [("WorkGroup", [[16, 16, 1], [8, 8, 1], [16, 8, 1], [8, 16, 1], [32, 4, 1], [4, 32, 1]]), \
+      ("ThreadTile", [[4, 4], [2, 4], [4, 2], [8, 4], [4, 8], [8, 8]]), ("GlobalSplitU", [1, 2, 4, 8]), \
+      ("PrefetchGlobalRead", [True, False]), ("VectorWidth", [1, 2, 4]), ("LdsPad", [0, 1])]
+  forks = forks[:args.forks]
+  hardcodedParameters = [dict(zip([name for (name, values) in forks], values)) \
+      for values in itertools.product(*[values for (name, values) in forks])]
+  forkedParameters = [dict(h, PrefetchLocalRead=plr) for h in hardcodedParameters for plr in [True, False]]
+  rand = random.Random(0)
+  lookups = rand.sample(forkedParameters, min(args.lookups, len(forkedParameters)))
+
+  def makeWinners():
+    winners = WinningParameterDict()
+    for h in hardcodedParameters:
+      winners.addHardcoded(h)
+    for frozen in winners.winners:
+      winners.winners[frozen] = [{"DepthU": rand.choice([8, 16, 32])}, rand.random()]
+    return winners
+
+  print(HR)
+  print("%10s %10s %14s %14s %14s %14s" % ("# winners", "# forked", "linear us", "build ms", "index us", "wpdUpdate s"))
+  winners = makeWinners()
+  (linearTime, linearRows) = timeIt(lambda: [WinningParameterDict.get(h, winners.winners) for h in lookups])
+  (buildTime, winners.index) = timeIt(HardcodedParameterIndex, winners.winners)
+  (indexTime, indexRows) = timeIt(lambda: [winners.matches(h) for h in lookups])
+  (updateTime, _) = timeIt(lambda: winners.wpdUpdate(deepcopy(forkedParameters)))
+  print("%10u %10u %14.1f %14.1f %14.1f %14.3f" % (len(hardcodedParameters), len(forkedParameters), \
+      1e6 * linearTime / len(lookups), 1e3 * buildTime, 1e6 * indexTime / len(lookups), updateTime))
+  print("# linear wpdUpdate estimate: %.1f s, same matches: %s" % (linearTime / len(lookups) * len(forkedParameters), \
+      [[m[0] for m in r] for r in linearRows] == [[m[0] for m in r] for r in indexRows]))
+
+def benchmarkEnumerate(args):
+  from Tensile.BenchmarkProblems import enumerateSolutions
+  from Tensile.Common import assignGlobalParameters, globalParameters
+  from Tensile.SolutionStructs import ProblemType
+  assignGlobalParameters({"PrintLevel": 0, "ShowProgressBar": False})
+
+  problemType = ProblemType({"OperationType": "GEMM", "DataType": "s", "TransposeA": False, \
+      "TransposeB": True, "UseBeta": True, "Batched": True})
+  tiles = [[16, 16, 1], [8, 8, 1], [16, 8, 1], [8, 16, 1], [32, 4, 1], [4, 32, 1]]
+  hardcoded = [{"WorkGroup": workGroup, "ThreadTile": threadTile, "GlobalSplitU": gsu} \
+      for workGroup in tiles for threadTile in [[2, 2], [4, 4], [8, 8], [4, 8], [8, 4]] for gsu in [1, 2, 4]]
+  permutations = [{"DepthU": depthU, "WorkGroupMapping": wgm, "PrefetchGlobalRead": pgr} \
+      for depthU in [8, 16, 32] for wgm in range(1, 1 + args.permutations // 6) for pgr in [False, True]]
+  winning = [[{}, {}]] * len(hardcoded)
+  initial = {"KernelLanguage": "Source"}
+
+  print(HR)
+  print("%12s %10s %10s %10s %10s" % ("# candidates", "# valid", "threads", "seconds", "speedup"))
+  serialTime = None
+  for cpuThreads in args.threads:
+    globalParameters["CpuThreads"] = cpuThreads
+    (elapsed, solutions) = timeIt(enumerateSolutions, problemType.state, hardcoded, winning, permutations, initial)
+    if serialTime is None:
+      serialTime = elapsed
+    print("%12u %10u %10d %10.2f %10.2f" % (len(hardcoded) * len(permutations), sum([len(row) for row in solutions]), \
+        cpuThreads, elapsed, serialTime / elapsed))
+
+def benchmarkSolutionCache(args):
+  from Tensile import SolutionCache
+  from Tensile.Common import assignGlobalParameters, globalParameters
+  from Tensile.SolutionStructs import Solution
+  assignGlobalParameters({"PrintLevel": 0})
+
+  problemType = {"OperationType": "GEMM", "DataType": "s", "TransposeA": False, \
+      "TransposeB": True, "UseBeta": True, "Batched": True}
+  configs = [{"ProblemType": problemType, "KernelLanguage": "Assembly", "ISA": [9,0,6], "WorkGroup": workGroup, \
+      "ThreadTile": threadTile, "DepthU": depthU, "WorkGroupMapping": wgm, "BufferLoad": True} \
+      for (workGroup, threadTile) in [([16,16,1], [4,4]), ([16,16,1], [8,8]), ([8,8,1], [4,4]), ([16,8,1], [4,8])] \
+      for depthU in [8, 16, 32] for wgm in range(1, 1 + args.solutions // 12)]
+
+  def build():
+    return [str(Solution(config)) for config in configs]
+
+  print(HR)
+  print("%-28s %10s %12s %10s" % ("pass", "# built", "us/solution", "hit rate"))
+  tmpDir = tempfile.mkdtemp()
+  try:
+    for (name, cache, path) in [("no cache", False, None), ("1st build", True, None), ("2nd build", True, None), \
+        ("3rd build", True, None), ("on disk, 1st run", True, tmpDir), ("on disk, next run", True, tmpDir)]:
+      globalParameters["SolutionCache"] = cache
+      globalParameters["SolutionCachePath"] = path
+      if name.startswith("on disk"):
+        SolutionCache._cache = None
+      current = SolutionCache.current()
+      (before, lookups) = (current.hits, current.hits + current.misses) if current else (0, 0)
+      (elapsed, names) = timeIt(build)
+      if name == "no cache":
+        expected = names
+      hitRate = 100.0 * (current.hits - before) / (current.hits + current.misses - lookups) if current else 0.0
+      print("%-28s %10u %12.1f %9.1f%% %s" % (name, len(names), 1e6 * elapsed / len(names), hitRate, \
+          "" if names == expected else "DIFFERENT"))
+      if current is not None:
+        current.save()
+  finally:
+    shutil.rmtree(tmpDir)
+
+def benchmarkPrecheck(args):
+  from Tensile.BenchmarkProblems import enumerateSolutions
+  from Tensile.Common import assignGlobalParameters, globalParameters
+  from Tensile.SolutionPrecheck import SolutionPrecheck
+  from Tensile.SolutionStructs import ProblemType
+  assignGlobalParameters({"PrintLevel": 0, "ShowProgressBar": False, "CpuThreads": 0, "SolutionCache": False})
+
+  problemType = ProblemType({"OperationType": "GEMM", "DataType": args.data_type, "TransposeA": False, \
+      "TransposeB": True, "UseBeta": True, "Batched": True})
+  hardcoded = [{"WorkGroup": [wg0, wg1, lsu], "ThreadTile": [tt0, tt1]} \
+      for wg0 in [4, 8, 16, 32] for wg1 in [4, 8, 16, 32] for lsu in [1, 2, 4] \
+      for tt0 in [1, 2, 4, 6, 8] for tt1 in [1, 2, 4, 6, 8]]
+  permutations = [{"DepthU": depthU, "VectorWidth": vw, "PrefetchLocalRead": plr, "PrefetchGlobalRead": pgr} \
+      for depthU in [8, 16, 32, 64] for vw in [-1, 1, 2, 4] for plr in [False, True] for pgr in [False, True]]
+  permutations = permutations[:args.permutations]
+  winning = [[{}, {}]] * len(hardcoded)
+  initial = {"KernelLanguage": "Source", "MacroTileShapeMax": 4}
+
+  print(HR)
+  print("%-12s %12s %10s %10s" % ("pre-check", "# candidates", "# valid", "seconds"))
+  names = {}
+  for precheck in [False, True]:
+    globalParameters["SolutionPrecheck"] = precheck
+    (elapsed, solutions) = timeIt(enumerateSolutions, problemType.state, hardcoded, winning, permutations, initial)
+    names[precheck] = [[str(s) for s in row] for row in solutions]
+    print("%-12s %12u %10u %10.2f" % (precheck, len(hardcoded) * len(permutations), \
+        sum([len(row) for row in solutions]), elapsed))
+  print("# same solutions: %s" % (names[False] == names[True]))
+
+  checker = SolutionPrecheck(problemType)
+  for h in hardcoded:
+    for p in permutations:
+      config = dict(initial)
+      config.update(p)
+      config.update(h)
+      checker.check(config)
+  print("%-28s %10s" % ("rule", "# pruned"))
+  for rule in SolutionPrecheck.Rules:
+    print("%-28s %10u" % (rule, checker.pruned[rule]))
+  print("%-28s %10u / %u" % ("total", sum(checker.pruned.values()), checker.checked))
+
+################################################################################
+# Main
+################################################################################
+def main():
+  argParser = argparse.ArgumentParser()
+  subparsers = argParser.add_subparsers(dest="benchmark")
+
+  dedupParser = subparsers.add_parser("dedup", help="Solution and kernel dedup vs library size.")
+  dedupParser.add_argument("--sizes", type=int, nargs="+", default=[250, 500, 1000, 2000])
+  dedupParser.set_defaults(function=benchmarkDedup)
+
+  logicParser = subparsers.add_parser("logic", help="Logic file reading with and without the logic file cache.")
+  logicParser.add_argument("--path", default=os.path.join(configsPath(), "miopen", "Logic", "deepbench_gemm"), \
+      help="Directory of logic files.")
+  logicParser.set_defaults(function=benchmarkLogic)
+
+  yamlParser = subparsers.add_parser("yaml", help="YAMLIO backend load/dump throughput.")
+  yamlParser.add_argument("--path", default=configsPath(), help="Directory searched recursively for YAML files.")
+  yamlParser.add_argument("--solutions", type=int, default=10000, help="Solutions in the synthetic library.")
+  yamlParser.set_defaults(function=benchmarkYAML)
+
+  streamParser = subparsers.add_parser("stream", help="Peak memory of writing TensileLibrary.yaml.")
+  streamParser.add_argument("--copies", type=int, default=24, help="Logic files merged into the library.")
+  streamParser.set_defaults(function=benchmarkStream)
+
+  parseParser = subparsers.add_parser("parse", help="Parallel logic file reading: full objects vs parsed data.")
+  parseParser.add_argument("--files", type=int, default=120, help="Logic files to read.")
+  parseParser.add_argument("--threads", type=int, default=8, help="Worker processes.")
+  parseParser.set_defaults(function=benchmarkParse)
+
+  kernelsParser = subparsers.add_parser("kernels", help="Kernel source generation throughput.")
+  kernelsParser.add_argument("--logic", nargs="+", help="deepbench_gemm logic files whose kernels are generated.", \
+      default=["vega10_Cijk_Ailk_Bjlk_HB.yaml", "vega10_Cijk_Ailk_Bjlk_SB.yaml", "vega10_Cijk_Alik_Bljk_SB.yaml"])
+  kernelsParser.add_argument("--source", type=int, default=20, help="Synthetic source kernels.")
+  kernelsParser.add_argument("--runs", type=int, default=5, help="Runs, of which the fastest is reported.")
+  kernelsParser.set_defaults(function=benchmarkKernels)
+
+  assembleParser = subparsers.add_parser("assemble", help="Assembler invocations: one per kernel vs batched.")
+  assembleParser.add_argument("--kernels", type=int, default=400, help="Assembly kernels.")
+  assembleParser.add_argument("--batch-sizes", type=int, nargs="+", default=[8, 32, 128])
+  assembleParser.add_argument("--threads", type=int, default=-1, help="CpuThreads.")
+  assembleParser.add_argument("--assembler", default=None, help="Assembler to run; defaults to a stub script.")
+  assembleParser.set_defaults(function=benchmarkAssemble)
+
+  asmCapsParser = subparsers.add_parser("asmcaps", help="Assembler capability probing: sequential, parallel and cached.")
+  asmCapsParser.add_argument("--assembler", default=None, help="Assembler to probe; defaults to a stub script.")
+  asmCapsParser.add_argument("--startup", type=float, default=0.1, help="Start-up time of the stub assembler in seconds.")
+  asmCapsParser.set_defaults(function=benchmarkAsmCaps)
+
+  analyzeParser = subparsers.add_parser("analyze", help="LibraryLogic range analysis: NumPy vs reference LogicAnalyzer.")
+  analyzeParser.add_argument("--sizes", type=int, nargs=4, default=[8, 8, 4, 8], help="Sizes benchmarked for each of the 4 indices.")
+  analyzeParser.add_argument("--solutions", type=int, default=64)
+  analyzeParser.add_argument("--importance", type=float, default=0.05, help="SolutionImportanceMin.")
+  analyzeParser.add_argument("--skip-reference", action="store_true", help="Only time the NumPy analyzer.")
+  analyzeParser.set_defaults(function=benchmarkAnalyze)
+
+  enRuleParser = subparsers.add_parser("enrule", help="Range logic construction: serial vs parallel enRule.")
+  enRuleParser.add_argument("--sizes", type=int, nargs=4, default=[16, 16, 4, 16], help="Sizes benchmarked for each of the 4 indices.")
+  enRuleParser.add_argument("--solutions", type=int, default=32)
+  enRuleParser.add_argument("--threads", type=int, nargs="+", default=[2, 4, 8], help="CpuThreads values to time.")
+  enRuleParser.add_argument("--reference", action="store_true", help="Use the pure-Python LogicAnalyzer.")
+  enRuleParser.set_defaults(function=benchmarkEnRule)
+
+  csvParser = subparsers.add_parser("csv", help="Benchmark result CSV reading: row by row vs blocks of typed columns.")
+  csvParser.add_argument("--sizes", type=int, nargs=4, default=[16, 16, 4, 16], help="Sizes benchmarked for each of the 4 indices.")
+  csvParser.add_argument("--solutions", type=int, default=256)
+  csvParser.set_defaults(function=benchmarkCSV)
+
+  storeParser = subparsers.add_parser("store", help="LogicAnalyzer set-up from CSV vs from the benchmark result store.")
+  storeParser.add_argument("--sizes", type=int, nargs=4, default=[16, 16, 4, 16], help="Sizes benchmarked for each of the 4 indices.")
+  storeParser.add_argument("--solutions", type=int, default=256)
+  storeParser.set_defaults(function=benchmarkStore)
+
+  selectParser = subparsers.add_parser("select", help="Solution selection: kernels kept and predicted time of each algorithm.")
+  selectParser.add_argument("--sizes", type=int, nargs=4, default=[8, 8, 4, 8], help="Sizes benchmarked for each of the 4 indices.")
+  selectParser.add_argument("--solutions", type=int, default=64)
+  selectParser.add_argument("--importance", type=float, default=0.05, help="SolutionImportanceMin.")
+  selectParser.add_argument("--max-solutions", type=int, default=0, help="MaxSolutions.")
+  selectParser.set_defaults(function=benchmarkSelect)
+
+  rangeLogicParser = subparsers.add_parser("rangelogic", help="Range logic lookup: nested-list walk vs compiled interval arrays.")
+  rangeLogicParser.add_argument("--logic", nargs="+", help="Logic files with range logic.", \
+      default=sorted(glob.glob(os.path.join(configsPath(), "miopen", "archives", "resnet50", "2018-10-09", "logic", "merged", "*.yaml")))[:4])
+  rangeLogicParser.add_argument("--lookups", type=int, default=100000)
+  rangeLogicParser.set_defaults(function=benchmarkRangeLogic)
+
+  exactIndexParser = subparsers.add_parser("exactindex", help="Exact size lookup in a matching table: distance search vs exact index.")
+  exactIndexParser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 40000], help="Exact sizes in the table.")
+  exactIndexParser.add_argument("--lookups", type=int, default=200, help="Lookups of sizes in the table.")
+  exactIndexParser.set_defaults(function=benchmarkExactIndex)
+
+  nearestIndexParser = subparsers.add_parser("nearestindex", help="Nearest size lookup in a matching table: distance search vs KD-tree.")
+  nearestIndexParser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 40000], help="Sizes in the table.")
+  nearestIndexParser.add_argument("--lookups", type=int, default=200, help="Lookups of sizes not in the table.")
+  nearestIndexParser.set_defaults(function=benchmarkNearestIndex)
+
+  winnersParser = subparsers.add_parser("winners", help="WinningParameterDict lookup: linear scan vs parameter index.")
+  winnersParser.add_argument("--forks", type=int, default=6, help="Forked parameters, of up to 6.")
+  winnersParser.add_argument("--lookups", type=int, default=200, help="Lookups timed for the linear scan.")
+  winnersParser.set_defaults(function=benchmarkWinners)
+
+  enumerateParser = subparsers.add_parser("enumerate", help="Benchmark step solution enumeration vs CpuThreads.")
+  enumerateParser.add_argument("--permutations", type=int, default=60, help="Benchmark permutations per hardcoded parameter set.")
+  enumerateParser.add_argument("--threads", type=int, nargs="+", default=[0, 2, 4, 8], help="CpuThreads values, the first of which is the baseline.")
+  enumerateParser.set_defaults(function=benchmarkEnumerate)
+
+  solutionCacheParser = subparsers.add_parser("solutioncache", help="Solution construction with and without the derived parameter cache.")
+  solutionCacheParser.add_argument("--solutions", type=int, default=2400, help="Distinct solution configs.")
+  solutionCacheParser.set_defaults(function=benchmarkSolutionCache)
+
+  precheckParser = subparsers.add_parser("precheck", help="Benchmark step solution enumeration with and without the constraint pre-check.")
+  precheckParser.add_argument("--permutations", type=int, default=64, help="Benchmark permutations per hardcoded parameter set, at most 64.")
+  precheckParser.add_argument("--data-type", default="s", help="Data type of the problem type.")
+  precheckParser.set_defaults(function=benchmarkPrecheck)
+
+  args = argParser.parse_args()
+  if args.benchmark is None:
+    argParser.print_help()
+    sys.exit(1)
+  args.function(args)
+
+if __name__ == "__main__":
+  main()
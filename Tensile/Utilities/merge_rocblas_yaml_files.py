@@ -23,6 +23,10 @@ try:
 except ImportError:
   printExit("You must install PyYAML to use Tensile (to parse config files). See http://pyyaml.org/wiki/PyYAML for installation instructions.")
 
+# prefer the libyaml based loader and dumper when available
+YAMLLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+YAMLDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
 def ensurePath( path ):
   if not os.path.exists(path):
     os.makedirs(path)
@@ -41,7 +45,7 @@ class LibraryLogic:
         stream = open(filename, "r")
       except IOError:
         printExit("Cannot open file: %s" % filename )
-      data = yaml.load(stream, yaml.SafeLoader)
+      data = yaml.load(stream, YAMLLoader)
 
       if isinstance(data, list):
 
@@ -219,7 +223,7 @@ class LibraryLogic:
     else:
       try:
         stream = open(filename, "w")
-        yaml.safe_dump(data, stream)
+        yaml.dump(data, stream, Dumper=YAMLDumper)
         stream.close()
       except IOError:
         printExit("Cannot open file: %s" % filename)
@@ -20,6 +20,7 @@
 ################################################################################
 
 from .Common import ProgressBar
+import hashlib
 import sys
 
 class SpinnyThing:
@@ -78,6 +79,40 @@ def state(obj):
 
     return obj
 
+def lazy_state(obj):
+    """
+    One level of state(obj), leaving the children unconverted.  Returns
+    ('map', pairs), ('seq', items) or ('leaf', value), where pairs and items
+    may be iterators whose values must in turn go through lazy_state().
+    Objects can provide stateItems() to expose their state lazily.  Used to
+    serialize large objects without building their whole state in memory.
+    """
+    if hasattr(obj, 'stateItems'):
+        return ('map', obj.stateItems())
+
+    if hasattr(obj, 'state'):
+        return ('leaf', obj.state())
+
+    if hasattr(obj.__class__, 'StateKeys'):
+        def items():
+            for key in obj.__class__.StateKeys:
+                attr = key
+                if isinstance(key, tuple):
+                    (key, attr) = key
+                yield (key, getattr(obj, attr))
+        return ('map', items())
+
+    if isinstance(obj, dict):
+        return ('map', iter(obj.items()))
+
+    if obj is None or any([isinstance(obj, cls) for cls in [str, int, float]]):
+        return ('leaf', obj)
+
+    try:
+        return ('seq', iter(obj))
+    except TypeError:
+        return ('leaf', obj)
+
 def hash_combine(*objs, **kwargs):
     shift = 1
     if 'shift' in kwargs:
@@ -101,6 +136,40 @@ def hash_combine(*objs, **kwargs):
 def hash_objs(*objs, **kwargs):
     return hash(tuple(objs))
 
+_plain_types = (type(None), bool, int, float, str)
+
+def canonical_state(obj):
+    """
+    Reduces obj to nested tuples of plain values whose repr() does not depend on
+    dictionary insertion order.  Objects providing getAttributes() (ProblemType,
+    DataType, Solution) are reduced through it.
+    """
+    if isinstance(obj, _plain_types):
+        return obj
+
+    if isinstance(obj, dict):
+        return ('dict',) + tuple(sorted([(k if isinstance(k, str) else str(k),
+                                          v if isinstance(v, _plain_types) else canonical_state(v))
+                                         for (k, v) in obj.items()]))
+
+    if isinstance(obj, (list, tuple)):
+        return tuple([v if isinstance(v, _plain_types) else canonical_state(v) for v in obj])
+
+    if isinstance(obj, (set, frozenset)):
+        return ('set',) + tuple(sorted([repr(canonical_state(v)) for v in obj]))
+
+    if hasattr(obj, 'getAttributes'):
+        return (obj.__class__.__name__, canonical_state(obj.getAttributes()))
+
+    return repr(obj)
+
+def fingerprint(*objs):
+    """
+    Returns a hex digest which is stable across processes and runs for the
+    canonical state of objs.
+    """
+    return hashlib.sha1(repr(canonical_state(objs)).encode()).hexdigest()
+
 def ceil_divide(numerator, denominator):
     # import pdb
     # pdb.set_trace()
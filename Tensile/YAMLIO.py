@@ -19,10 +19,14 @@
 # CTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 ################################################################################
 
-from .Common import print2, printExit, printWarning, versionIsCompatible
+from .Common import globalParameters, defaultCachePath, ensurePath, print2, printExit, printWarning, versionIsCompatible
 from .SolutionStructs import Solution, ProblemSizes, ProblemType
 from . import __version__
 from . import SolutionLibrary
+from .Utils import lazy_state
+import hashlib
+import itertools
+import json
 import os
 
 try:
@@ -30,6 +34,263 @@ try:
 except ImportError:
   printExit("You must install PyYAML to use Tensile (to parse config files). See http://pyyaml.org/wiki/PyYAML for installation instructions.")
 
+################################################################################
+# Serialization Backends
+# Every YAML file Tensile reads or writes goes through one of these.
+################################################################################
+class YAMLBackend:
+  """
+  PyYAML, using the libyaml based CSafeLoader/CSafeDumper when PyYAML was
+  built with libyaml and the pure python SafeLoader/SafeDumper otherwise.
+  """
+  name = "yaml"
+
+  def __init__(self, useLibYAML=True):
+    if useLibYAML and getattr(yaml, "__with_libyaml__", False):
+      self.loader = yaml.CSafeLoader
+      self.dumper = yaml.CSafeDumper
+    else:
+      self.loader = yaml.SafeLoader
+      self.dumper = yaml.SafeDumper
+
+  def load(self, stream):
+    return yaml.load(stream, self.loader)
+
+  def dump(self, data, stream, **kwargs):
+    yaml.dump(data, stream, Dumper=self.dumper, **kwargs)
+
+  def dumpState(self, obj, stream, explicit_start=False, explicit_end=False):
+    """
+    Writes the same document as dump(Utils.state(obj), stream), but emits it
+    incrementally while walking obj, so only one leaf of the state exists at
+    a time.
+    """
+    representer = yaml.representer.SafeRepresenter(default_flow_style=False)
+    resolver = yaml.resolver.Resolver()
+    events = itertools.chain(
+        [yaml.StreamStartEvent(), yaml.DocumentStartEvent(explicit=explicit_start)],
+        self.stateEvents(obj, representer, resolver),
+        [yaml.DocumentEndEvent(explicit=explicit_end), yaml.StreamEndEvent()])
+    yaml.emit(events, stream, Dumper=self.dumper)
+
+  def stateEvents(self, obj, representer, resolver):
+    (kind, value) = lazy_state(obj)
+    if kind == "map":
+      yield yaml.MappingStartEvent(None, None, True, flow_style=False)
+      # yaml.dump sorts mapping keys
+      for (key, child) in sorted(value, key=lambda pair: pair[0]):
+        for event in self.nodeEvents(self.represent(key, representer), resolver):
+          yield event
+        for event in self.stateEvents(child, representer, resolver):
+          yield event
+      yield yaml.MappingEndEvent()
+    elif kind == "seq":
+      yield yaml.SequenceStartEvent(None, None, True, flow_style=False)
+      for child in value:
+        for event in self.stateEvents(child, representer, resolver):
+          yield event
+      yield yaml.SequenceEndEvent()
+    else:
+      for event in self.nodeEvents(self.represent(value, representer), resolver):
+        yield event
+
+  @staticmethod
+  def represent(data, representer):
+    # forget previous leaves, the representer would otherwise keep them all for aliasing
+    representer.represented_objects = {}
+    representer.object_keeper = []
+    return representer.represent_data(data)
+
+  def nodeEvents(self, node, resolver):
+    """ Same events as yaml.serializer.Serializer, without anchors. """
+    if isinstance(node, yaml.ScalarNode):
+      detectedTag = resolver.resolve(yaml.ScalarNode, node.value, (True, False))
+      defaultTag = resolver.resolve(yaml.ScalarNode, node.value, (False, True))
+      implicit = (node.tag == detectedTag, node.tag == defaultTag)
+      yield yaml.ScalarEvent(None, node.tag, implicit, node.value, style=node.style)
+    elif isinstance(node, yaml.SequenceNode):
+      implicit = node.tag == resolver.resolve(yaml.SequenceNode, node.value, True)
+      yield yaml.SequenceStartEvent(None, node.tag, implicit, flow_style=node.flow_style)
+      for item in node.value:
+        for event in self.nodeEvents(item, resolver):
+          yield event
+      yield yaml.SequenceEndEvent()
+    else:
+      implicit = node.tag == resolver.resolve(yaml.MappingNode, node.value, True)
+      yield yaml.MappingStartEvent(None, node.tag, implicit, flow_style=node.flow_style)
+      for (key, value) in node.value:
+        for event in self.nodeEvents(key, resolver):
+          yield event
+        for event in self.nodeEvents(value, resolver):
+          yield event
+      yield yaml.MappingEndEvent()
+
+class JSONBackend:
+  """
+  Writes JSON, which is also valid (flow style) YAML, so files written this
+  way can still be read by any YAML parser, including the one in the
+  Tensile host library.  Much faster than YAML for large documents such as
+  TensileLibrary.yaml.  Reading falls back to YAML for files which are not
+  JSON.
+  """
+  name = "json"
+
+  def __init__(self, fallback):
+    self.fallback = fallback
+    self.encoder = json.JSONEncoder(separators=(",", ":"))
+
+  def load(self, stream):
+    text = stream.read()
+    body = text.strip()
+    if body.startswith("---"):
+      body = body[3:]
+    if body.endswith("..."):
+      body = body[:-3]
+    try:
+      return json.loads(body)
+    except ValueError:
+      return self.fallback.load(text)
+
+  def dump(self, data, stream, explicit_start=False, explicit_end=False, **kwargs):
+    if explicit_start:
+      stream.write("---\n")
+    json.dump(data, stream, separators=(",", ":"))
+    stream.write("\n")
+    if explicit_end:
+      stream.write("...\n")
+
+  def dumpState(self, obj, stream, explicit_start=False, explicit_end=False):
+    """
+    Writes the same data as dump(Utils.state(obj), stream), incrementally.
+    """
+    if explicit_start:
+      stream.write("---\n")
+    self.writeState(obj, stream)
+    stream.write("\n")
+    if explicit_end:
+      stream.write("...\n")
+
+  def writeState(self, obj, stream):
+    (kind, value) = lazy_state(obj)
+    if kind == "map":
+      stream.write("{")
+      for (idx, (key, child)) in enumerate(value):
+        if idx > 0:
+          stream.write(",")
+        stream.write(self.encoder.encode(key if isinstance(key, str) else str(key)))
+        stream.write(":")
+        self.writeState(child, stream)
+      stream.write("}")
+    elif kind == "seq":
+      stream.write("[")
+      for (idx, child) in enumerate(value):
+        if idx > 0:
+          stream.write(",")
+        self.writeState(child, stream)
+      stream.write("]")
+    else:
+      stream.write(self.encoder.encode(value))
+
+Backends = {"yaml": YAMLBackend()}
+Backends["json"] = JSONBackend(Backends["yaml"])
+
+def getBackend(name=None):
+  """
+  Returns the named backend, or the YAML backend if name is None.
+  """
+  if name is None:
+    name = "yaml"
+  if name not in Backends:
+    printExit("Unknown serialization format %s, expected one of %s" % (name, sorted(Backends.keys())))
+  return Backends[name]
+
+def load(stream, format=None):
+  return getBackend(format).load(stream)
+
+def dump(data, stream, format=None, **kwargs):
+  getBackend(format).dump(data, stream, **kwargs)
+
+################################################################################
+# Logic File Cache
+# Parsed logic and solution files are kept as JSON in the cache directory,
+# keyed on the source's absolute path and stamped with its size, mtime and
+# hash.
+################################################################################
+LogicCacheVersion = 1
+
+def logicCacheFileName( filename ):
+  cachePath = globalParameters["LogicFileCachePath"]
+  if cachePath is None:
+    cachePath = os.path.join(defaultCachePath(), "logic")
+  key = hashlib.sha1(os.path.abspath(filename).encode()).hexdigest()
+  return os.path.join(cachePath, "%s.json" % key)
+
+def fileStamp( filename ):
+  st = os.stat(filename)
+  return {"Size": st.st_size, "MTime": st.st_mtime_ns}
+
+def fileHash( filename ):
+  with open(filename, "rb") as f:
+    return hashlib.sha1(f.read()).hexdigest()
+
+def readCachedYAML( filename ):
+  """
+  Returns the parsed contents of a YAML logic or solution file, from the
+  logic file cache if its entry is still valid for the file, writing the
+  entry on a miss.  Disabled with globalParameters["LogicFileCache"].
+  """
+  if not globalParameters["LogicFileCache"]:
+    return readConfig(filename)
+
+  try:
+    stamp = fileStamp(filename)
+  except OSError:
+    printExit("Cannot open file: %s" % filename )
+
+  cacheFileName = logicCacheFileName(filename)
+  sourceHash = None
+  try:
+    with open(cacheFileName, "r") as f:
+      cache = json.load(f)
+    if cache["Version"] == LogicCacheVersion:
+      if cache["Stamp"] == stamp:
+        return cache["Data"]
+      # touched but possibly unchanged
+      sourceHash = fileHash(filename)
+      if cache["Hash"] == sourceHash:
+        writeLogicCache(cacheFileName, stamp, sourceHash, cache["Data"])
+        return cache["Data"]
+  except (IOError, OSError, ValueError, KeyError, TypeError):
+    pass
+
+  data = readConfig(filename)
+  if sourceHash is None:
+    sourceHash = fileHash(filename)
+
+  # only cache documents which survive the trip through JSON unchanged
+  # (e.g. no non-string dictionary keys)
+  try:
+    if json.loads(json.dumps(data)) == data:
+      writeLogicCache(cacheFileName, stamp, sourceHash, data)
+  except (TypeError, ValueError):
+    pass
+
+  return data
+
+def writeLogicCache( cacheFileName, stamp, sourceHash, data ):
+  cache = {"Version": LogicCacheVersion, "Stamp": stamp, "Hash": sourceHash, "Data": data}
+  tmpFileName = "%s.%u.tmp" % (cacheFileName, os.getpid())
+  try:
+    ensurePath(os.path.dirname(cacheFileName))
+    with open(tmpFileName, "w") as f:
+      json.dump(cache, f, separators=(",", ":"))
+    os.replace(tmpFileName, cacheFileName)
+  except (IOError, OSError) as e:
+    # e.g. read-only cache directory; the cache is only an optimization
+    print2("# Could not write logic cache %s: %s" % (cacheFileName, e))
+    if os.path.exists(tmpFileName):
+      os.remove(tmpFileName)
+
 ################################################################################
 # Read Benchmark Config from YAML Files
 ################################################################################
@@ -38,15 +299,24 @@ def readConfig( filename ):
     stream = open(filename, "r")
   except IOError:
     printExit("Cannot open file: %s" % filename )
-  config = yaml.load(stream, yaml.SafeLoader)
+  config = load(stream)
   stream.close()
   return config
 
-def write(filename, data):
-    """ Write data to a given file. """
+def write(filename, data, format=None):
+    """ Write data to a given file, as YAML or, with format="json", as JSON. """
 
     with open(filename, 'w') as f:
-        yaml.dump(data, f, explicit_start=True, explicit_end=True)
+        dump(data, f, format, explicit_start=True, explicit_end=True)
+
+def writeState(filename, obj, format=None):
+    """
+    Equivalent to write(filename, Utils.state(obj), format), but streams obj
+    to the file instead of building its whole state first.
+    """
+
+    with open(filename, 'w') as f:
+        getBackend(format).dumpState(obj, f, explicit_start=True, explicit_end=True)
 
 ################################################################################
 # Write List of Solutions to YAML File
@@ -76,7 +346,7 @@ def writeSolutions( filename, problemSizes, solutions ):
     stream.write("  - Range: %s\n" % sizeRange)
   for sizeExact in problemSizes.exacts:
     stream.write("  - Exact: %s\n" % list(sizeExact))
-  yaml.dump(solutionStates, stream, default_flow_style=False)
+  dump(solutionStates, stream, default_flow_style=False)
   stream.close()
 
 
@@ -84,12 +354,7 @@ def writeSolutions( filename, problemSizes, solutions ):
 # Read List of Solutions from YAML File
 ################################################################################
 def readSolutions( filename ):
-  try:
-    stream = open(filename, "r")
-  except IOError:
-    printExit("Cannot open file: %s" % filename )
-  solutionStates = yaml.load(stream, yaml.SafeLoader)
-  stream.close()
+  solutionStates = readCachedYAML(filename)
 
   # verify
   if len(solutionStates) < 2:
@@ -200,7 +465,7 @@ def writeLibraryLogicForSchedule( filePath, schedulePrefix, architectureName, de
   # open & write file
   try:
     stream = open(filename, "w")
-    yaml.dump(data, stream)
+    dump(data, stream)
     stream.close()
   except IOError:
     printExit("Cannot open file: %s" % filename)
@@ -210,19 +475,48 @@ def writeLibraryLogicForSchedule( filePath, schedulePrefix, architectureName, de
 ################################################################################
 def readLibraryLogicForSchedule( filename ):
   #print1("# Reading Library Logic: %s" % ( filename ))
-  try:
-    stream = open(filename, "r")
-  except IOError:
-    printExit("Cannot open file: %s" % filename )
-  data = yaml.load(stream, yaml.SafeLoader)
-  stream.close()
+  return libraryLogicFromData(filename, parseLibraryLogic(filename))
+
+def parseLibraryLogic( filename ):
+  """
+  Reads and verifies a logic file, returning the plain data from which
+  libraryLogicFromData builds its objects.  This is the expensive part of
+  reading a logic file, and its result is about half the size of the objects
+  built from it, so it is what worker processes should return.
+  """
+  data = readCachedYAML(filename)
 
   # verify
   if len(data) < 6:
     printExit("len(%s) %u < 7" % (filename, len(data)))
 
+  # does version match
+  versionString = data[0]["MinimumRequiredVersion"]
+  if not versionIsCompatible(versionString):
+    printWarning("File \"%s\" version=%s does not match Tensile version=%s" \
+        % (filename, versionString, __version__) )
+
+  return data
+
+def parseLibraryLogicFile( filename ):
+  """
+  parseLibraryLogic for worker processes.  Returns (filename, data, error);
+  if the file can't be read data is None and error describes why, so that
+  one bad logic file doesn't take down the pool reading the others.
+  """
+  try:
+    return (filename, parseLibraryLogic(filename), None)
+  except SystemExit:
+    # printExit has already reported the reason
+    return (filename, None, "invalid logic file")
+  except Exception as e:
+    return (filename, None, "%s: %s" % (type(e).__name__, e))
+
+def libraryLogicFromData( filename, data ):
+  """
+  Builds the objects of a logic file from the result of parseLibraryLogic.
+  """
   # parse out objects
-  versionString     = data[0]["MinimumRequiredVersion"]
   scheduleName      = data[1]
   architectureName  = data[2]
   deviceNames       = data[3]
@@ -232,16 +526,15 @@ def readLibraryLogicForSchedule( filename ):
   exactLogic        = data[7]
   rangeLogic        = data[8]
 
-  newLibrary = SolutionLibrary.MasterSolutionLibrary.FromOriginalState(data)
-
-  # does version match
-  if not versionIsCompatible(versionString):
-    printWarning("File \"%s\" version=%s does not match Tensile version=%s" \
-        % (filename, versionString, __version__) )
+  libraryOrder = None
+  if globalParameters["LibraryRangeLogic"] and rangeLogic is not None \
+      and not (len(data) > 9 and data[9]):
+    libraryOrder = ['Hardware', 'OperationIdentifier', 'Predicates', 'RangeLogic']
+  newLibrary = SolutionLibrary.MasterSolutionLibrary.FromOriginalState(data, libraryOrder=libraryOrder)
 
   # unpack problemType
   problemType = ProblemType(problemTypeState)
-  # unpack solutions
+  # unpack solutions; these are independent of the Solutions of newLibrary
   solutions = []
   for i in range(0, len(solutionStates)):
     solutionState = solutionStates[i]
@@ -254,8 +547,8 @@ def readLibraryLogicForSchedule( filename ):
       solutionState["ISA"] = [0, 0, 0]
     solutionObject = Solution(solutionState)
     if solutionObject["ProblemType"] != problemType:
-      printExit("ProblemType of file doesn't match solution: %s != %s" \
-          % (problemType, solutionObject["ProblemType"]))
+      printExit("ProblemType of file %s doesn't match solution: %s != %s" \
+          % (filename, problemType, solutionObject["ProblemType"]))
     solutions.append(solutionObject)
 
   return (scheduleName, deviceNames, problemType, solutions, indexOrder, \